@@ -0,0 +1,50 @@
+""" Benchmark of the import time of the package modules
+
+Every module is imported in a fresh interpreter, so that the measured time includes all of its dependencies.
+
+Usage: python benchmarks/bench_import_time.py [repetitions]
+"""
+import os
+import statistics
+import subprocess
+import sys
+
+MODULES = [
+    'conceptdrift',
+    'conceptdrift.source.process_tree_controller',
+    'conceptdrift.source.event_log_controller',
+    'conceptdrift.source.evolution',
+    'conceptdrift.source.noise',
+    'conceptdrift.drifts.sudden',
+    'conceptdrift.drifts.gradual',
+    'conceptdrift.drifts.recurring',
+    'conceptdrift.drifts.incremental',
+    'conceptdrift.generate_collection_of_logs',
+]
+
+SNIPPET = "import time; t = time.perf_counter(); import {}; print(time.perf_counter() - t)"
+
+
+def measure_import_time(module, repetitions):
+    """ Measuring the import time of a module in fresh interpreters
+
+    :param module: name of the module
+    :param repetitions: number of measurements
+    :return: list of import times in seconds
+    """
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    times = []
+    for _ in range(repetitions):
+        output = subprocess.run([sys.executable, '-c', SNIPPET.format(module)], env=env, check=True,
+                                capture_output=True, text=True).stdout
+        times.append(float(output.strip().splitlines()[-1]))
+    return times
+
+
+if __name__ == '__main__':
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print("{:<45} {:>10} {:>10}".format('module', 'median [s]', 'min [s]'))
+    for module in MODULES:
+        times = measure_import_time(module, repetitions)
+        print("{:<45} {:>10.3f} {:>10.3f}".format(module, statistics.median(times), min(times)))
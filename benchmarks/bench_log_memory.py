@@ -0,0 +1,59 @@
+""" Benchmark of the peak memory of event logs and columnar logs
+
+A log with the requested number of events is played out from a process tree with a sequence of ten activities, gets
+durations and timestamps and is then iterated once event by event (for the columnar log through the compact traces and
+events). The peak memory is measured with tracemalloc. Event logs of pm4py need several hundred bytes per event, so
+they are only built up to a limited size.
+
+Usage: python benchmarks/bench_log_memory.py [number of events ...]
+"""
+import datetime
+import sys
+import time
+import tracemalloc
+
+from pm4py.objects.process_tree.utils.generic import parse
+
+from conceptdrift.source.event_log_controller import add_duration_to_log
+from conceptdrift.source.playout import generate_log, generate_columnar_log
+
+SIZES = [1000000, 10000000]
+EVENT_LOG_MAX_EVENTS = 1000000
+TREE = "->( " + ", ".join("'Random activity " + str(i) + "'" for i in range(10)) + " )"
+
+
+def measure(generate, nu_events):
+    """ Measuring the runtime and the peak memory of the generation and the iteration of a log
+
+    :param generate: generation function (generate_log or generate_columnar_log)
+    :param nu_events: number of events
+    :return: runtime in seconds and peak memory in bytes
+    """
+    tree = parse(TREE)
+    tracemalloc.start()
+    start = time.perf_counter()
+    log = generate(tree, nu_events // 10)
+    add_duration_to_log(log, datetime.datetime(2020, 1, 1), 10, 100)
+    count = 0
+    for trace in log:
+        for event in trace:
+            count = count + (event['concept:name'] is not None)
+    runtime = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return runtime, peak
+
+
+if __name__ == '__main__':
+    sizes = [int(x) for x in sys.argv[1:]] or SIZES
+    print("{:>10} {:>12} {:>14} {:>12} {:>14} {:>12}".format('events', 'log [s]', 'log [MB]', 'columnar [s]',
+                                                               'columnar [MB]', 'bytes/event'))
+    for size in sizes:
+        columnar_time, columnar_peak = measure(generate_columnar_log, size)
+        if size <= EVENT_LOG_MAX_EVENTS:
+            log_time, log_peak = measure(generate_log, size)
+            print("{:>10} {:>12.1f} {:>14.1f} {:>12.1f} {:>14.1f} {:>12.1f}".format(
+                size, log_time, log_peak / 2 ** 20, columnar_time, columnar_peak / 2 ** 20, columnar_peak / size))
+        else:
+            print("{:>10} {:>12} {:>14} {:>12.1f} {:>14.1f} {:>12.1f}".format(
+                size, 'skipped', '-', columnar_time, columnar_peak / 2 ** 20, columnar_peak / size))
@@ -0,0 +1,176 @@
+""" Benchmark of the noise interleaving against the previous implementation
+
+The previous version of include_noise_in_log is kept below as include_noise_in_log_legacy. It rescans the event log
+for every noise trace, so it is only measured up to a limited log size.
+
+Usage: python benchmarks/bench_noise_interleaving.py
+"""
+import itertools
+import sys
+import time
+from random import randint
+
+from pm4py.objects.log.obj import EventLog, Trace, Event
+
+from conceptdrift.source.event_log_controller import include_noise_in_log, length_of_log
+
+SIZES = [1000, 5000, 20000, 200000]
+LEGACY_MAX_SIZE = 20000
+PRO_NOISE = 0.1
+
+
+def create_log(nu_traces, name):
+    """ Creation of an event log with one event per trace
+
+    :param nu_traces: number of traces
+    :param name: activity name of the events
+    :return: event log
+    """
+    return EventLog([Trace([Event({'concept:name': name})]) for _ in range(nu_traces)])
+
+
+def include_noise_in_log_legacy(log_total, log_noise, start_noise, end_noise):
+    """ Introduction of noise in an event log
+
+    :param log_total: event log
+    :param log_noise: event log containing all noise traces
+    :param start_noise: Starting point of noise
+    :param end_noise: Ending point of noise
+    :return: event log with noise
+    """
+    log_result_with_noise = EventLog()
+    start = int(round((length_of_log(log_total) * start_noise) + 0.0001))
+    stop = int(round((length_of_log(log_total) * end_noise) + 0.0001))
+    amount_noise = length_of_log(log_noise)
+    amount_not_noise = int(round(
+        ((length_of_log(log_total) * end_noise) - (length_of_log(log_total) * start_noise) - amount_noise) + 0.0001))
+    i = 0
+    a = 0
+    log_result_with_noise = EventLog(itertools.chain(log_result_with_noise, log_total[:start]))
+    j = start
+    norm = int(round((amount_not_noise / amount_noise) + 0.0001))
+    rest = norm - (amount_not_noise / amount_noise)
+    if rest <= 0:
+        rest_adding = int(round((rest * amount_noise*(-1))+0.0001))
+        while j < stop:
+            norm_start = randint(0, norm)
+            norm_end = norm - norm_start
+            add = randint(0, 1)
+            if a < rest_adding and add == 1:
+                log_result_with_noise = EventLog(itertools.chain(log_result_with_noise, log_total[j:j+norm_start+1]))
+                j = j + norm_start + 1
+                a = a + 1
+            else:
+                log_result_with_noise = EventLog(itertools.chain(log_result_with_noise, log_total[j:j+norm_start]))
+                j = j + norm_start
+            k = 0
+            for trace in log_noise:
+                if k == i:
+                    log_result_with_noise.append(trace)
+                    j = j + 1
+                    i = i + 1
+                    break
+                else:
+                    k = k + 1
+            m = 0
+            n = 0
+            for trace in log_total:
+                if m < norm_end and n == j and j < stop:
+                    log_result_with_noise.append(trace)
+                    j = j + 1
+                    n = n + 1
+                    m = m + 1
+                elif n == j and j < stop and a < rest_adding and add == 0:
+                    log_result_with_noise.append(trace)
+                    a = a + 1
+                    j = j + 1
+                    n = n + 1
+                elif n > j:
+                    break
+                else:
+                    n = n + 1
+    else:
+        rest_adding = int(round(amount_noise - (amount_not_noise/norm)+0.0001))
+        while j < stop:
+            norm_start = randint(0, norm)
+            norm_end = norm - norm_start
+            m = 0
+            n = 0
+            for trace in log_total:
+                if m < norm_start and n == j and j < (stop - 1):
+                    log_result_with_noise.append(trace)
+                    j = j + 1
+                    n = n + 1
+                    m = m + 1
+                elif n > j:
+                    break
+                else:
+                    n = n + 1
+            k = 0
+            for trace in log_noise:
+                if k == i:
+                    log_result_with_noise.append(trace)
+                    j = j + 1
+                    i = i + 1
+                    break
+                else:
+                    k = k + 1
+            m = 0
+            n = 0
+            for trace in log_total:
+                if m < norm_end and n == j and j < stop:
+                    log_result_with_noise.append(trace)
+                    j = j + 1
+                    n = n + 1
+                    m = m + 1
+                elif n > j:
+                    break
+                else:
+                    n = n + 1
+            k = 0
+            for trace in log_noise:
+                if k == i and a < rest_adding:
+                    log_result_with_noise.append(trace)
+                    j = j + 1
+                    i = i + 1
+                    a = a + 1
+                    break
+                else:
+                    k = k + 1
+    count = 0
+    log_result_with_noise = EventLog(itertools.chain(log_result_with_noise, log_total[stop:]))
+    for trace in log_result_with_noise:
+        trace._set_attributes({'concept:name': str(count)})
+        count = 1 + count
+    return log_result_with_noise
+
+
+
+def measure(function, log_total, log_noise):
+    """ Measuring the runtime of a noise interleaving function
+
+    :param function: noise interleaving function
+    :param log_total: event log
+    :param log_noise: event log containing all noise traces
+    :return: runtime in seconds and share of noise traces in the result
+    """
+    start = time.perf_counter()
+    result = function(log_total, log_noise, 0, 1)
+    runtime = time.perf_counter() - start
+    noise = sum(1 for trace in result if trace[0]['concept:name'] == 'noise')
+    return runtime, noise / len(result)
+
+
+if __name__ == '__main__':
+    sizes = [int(x) for x in sys.argv[1:]] or SIZES
+    print("{:>10} {:>14} {:>14} {:>14} {:>14}".format('traces', 'legacy [s]', 'new [s]', 'legacy noise', 'new noise'))
+    for size in sizes:
+        log_total = create_log(size, 'regular')
+        log_noise = create_log(int(round(size * PRO_NOISE)), 'noise')
+        new_time, new_share = measure(include_noise_in_log, log_total, log_noise)
+        if size <= LEGACY_MAX_SIZE:
+            legacy_time, legacy_share = measure(include_noise_in_log_legacy, log_total, log_noise)
+            print("{:>10} {:>14.3f} {:>14.3f} {:>14.3f} {:>14.3f}".format(size, legacy_time, new_time, legacy_share,
+                                                                          new_share))
+        else:
+            print("{:>10} {:>14} {:>14.3f} {:>14} {:>14.3f}".format(size, 'skipped', new_time, '-', new_share))
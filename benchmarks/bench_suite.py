@@ -0,0 +1,231 @@
+""" Benchmark suite of the public entry points of the package
+
+Every entry point is timed for every reference tree and every scale (number of traces):
+
+- generate_log_with_sudden_drift, generate_log_with_gradual_drift, generate_log_with_recurring_drift and
+  generate_log_with_incremental_drift (columnar output, the random evolution is included)
+- add_noise and add_duration_to_log on a played out columnar log
+- generate_logs with two event logs
+- evolve_tree_randomly (independent of the scale, the mean of several evolutions is reported)
+
+The reference trees are stored in benchmarks/reference_trees as PTML files, so all runs use the same trees, and every
+case starts from the same seed. The results are written as JSON. They are compared with the regression thresholds in
+benchmarks/thresholds.json (maximum seconds per case) and, if given, with the results of a previous run: a case
+regresses if it takes more than (1 + tolerance) times as long as in the baseline and at least min_difference seconds
+longer. Every case is run several times and the fastest run counts. The script exits with status 1 if any case
+regresses.
+
+Usage: python benchmarks/bench_suite.py [--scales 1000 10000] [--trees simple middle] [--output results.json]
+                                        [--baseline results.json] [--write-trees]
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+
+import numpy
+
+import conceptdrift
+from conceptdrift.drifts.gradual import generate_log_with_gradual_drift
+from conceptdrift.drifts.incremental import generate_log_with_incremental_drift
+from conceptdrift.drifts.recurring import generate_log_with_recurring_drift
+from conceptdrift.drifts.sudden import generate_log_with_sudden_drift
+from conceptdrift.generate_collection_of_logs import generate_logs
+from conceptdrift.source.event_log_controller import add_duration_to_log
+from conceptdrift.source.evolution import evolve_tree_randomly
+from conceptdrift.source.frozen_tree import copy_process_tree
+from conceptdrift.source.noise import add_noise
+from conceptdrift.source.playout import generate_columnar_log
+from conceptdrift.source.process_tree_controller import generate_tree, generate_specific_trees, \
+    import_process_model
+
+BENCHMARK_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+TREE_DIRECTORY = os.path.join(BENCHMARK_DIRECTORY, 'reference_trees')
+THRESHOLDS = os.path.join(BENCHMARK_DIRECTORY, 'thresholds.json')
+SCALES = [1000, 10000, 100000, 1000000]
+TREES = ['simple', 'middle', 'complex', 'large']
+SEED = 2022
+EVOLUTIONS = 100
+REPETITIONS = 3
+LARGE_TREE = {'mode': 100, 'min': 80, 'max': 120, 'sequence': 0.25, 'choice': 0.3, 'parallel': 0.25, 'loop': 0.3,
+              'or': 0, 'silent': 0, 'duplicate': 0, 'lt_dependency': 0, 'infrequent': 0.25, 'no_models': 10,
+              'unfold': 10, 'max_repeat': 10}
+
+
+def write_reference_trees():
+    """ Generation of the reference trees from the seed and export as PTML files """
+    from pm4py.objects.process_tree.exporter import exporter as ptml_exporter
+
+    os.makedirs(TREE_DIRECTORY, exist_ok=True)
+    for complexity in TREES:
+        seed_all(SEED)
+        if complexity == 'large':
+            tree = generate_tree(LARGE_TREE)
+        else:
+            tree = generate_specific_trees(complexity)
+        ptml_exporter.apply(tree, os.path.join(TREE_DIRECTORY, complexity + '.ptml'))
+
+
+def load_reference_tree(complexity):
+    return import_process_model(os.path.join(TREE_DIRECTORY, complexity + '.ptml'))
+
+
+def seed_all(seed):
+    random.seed(seed)
+    numpy.random.seed(seed)
+
+
+def get_cases(tree, num_traces, directory):
+    """ Benchmark cases of one reference tree and one scale
+
+    :param tree: reference tree
+    :param num_traces: number of traces
+    :param directory: directory for the files written by generate_logs
+    :return: list of the names of the entry points and functions running them (returning the number of events)
+    """
+    date = datetime.datetime(2020, 8, 3, 8)
+
+    def sudden():
+        return generate_log_with_sudden_drift(num_traces, 0.5, tree, None, 0.2, output='columnar').num_events()
+
+    def gradual():
+        return generate_log_with_gradual_drift(num_traces, 0.4, 0.6, 'linear', tree, None, 0.2,
+                                               output='columnar').num_events()
+
+    def recurring():
+        return generate_log_with_recurring_drift(num_traces, 0.2, 0.8, 3, 0.5, tree, None, 0.2,
+                                                 output='columnar').num_events()
+
+    def incremental():
+        traces = [num_traces // 4] * 3 + [num_traces - 3 * (num_traces // 4)]
+        return generate_log_with_incremental_drift(4, traces, 0.1, tree, output='columnar').num_events()
+
+    def noise():
+        log = generate_columnar_log(tree, num_traces)
+        return add_noise(log, 0.1, 0, 1, tree).num_events()
+
+    def duration():
+        log = generate_columnar_log(tree, num_traces)
+        add_duration_to_log(log, date, 1, 14000)
+        return log.num_events()
+
+    def collection():
+        generate_logs(2, num_traces, model=tree, filepath=directory, seed=SEED, format='parquet')
+        return None
+
+    return [('generate_log_with_sudden_drift', sudden), ('generate_log_with_gradual_drift', gradual),
+            ('generate_log_with_recurring_drift', recurring), ('generate_log_with_incremental_drift', incremental),
+            ('add_noise', noise), ('add_duration_to_log', duration), ('generate_logs', collection)]
+
+
+def measure(function, repetitions=REPETITIONS):
+    """ Runtime of a benchmark case started from the seed (the fastest of several runs)
+
+    :param function: function running the case
+    :param repetitions: number of runs
+    :return: runtime in seconds and result of the function
+    """
+    runtimes = []
+    for _ in range(repetitions):
+        seed_all(SEED)
+        start = time.perf_counter()
+        result = function()
+        runtimes.append(time.perf_counter() - start)
+    return min(runtimes), result
+
+
+def measure_evolution(tree):
+    """ Mean runtime of evolve_tree_randomly on copies of a tree """
+    seed_all(SEED)
+    copies = [copy_process_tree(tree) for _ in range(EVOLUTIONS)]
+    start = time.perf_counter()
+    for copy in copies:
+        evolve_tree_randomly(copy, 0.2)
+    return (time.perf_counter() - start) / EVOLUTIONS
+
+
+def run_suite(scales, trees):
+    """ Running all benchmark cases
+
+    :param scales: list of numbers of traces
+    :param trees: list of the names of the reference trees
+    :return: list of results (name, entry point, tree, number of traces, seconds and number of events)
+    """
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        # warm-up of the lazy imports (e.g. pyarrow and the exporters of pm4py), which are not measured
+        for function, case in get_cases(load_reference_tree(trees[0]), 100, directory):
+            measure(case, 1)
+        for complexity in trees:
+            tree = load_reference_tree(complexity)
+            seconds = measure_evolution(tree)
+            results.append({'name': 'evolve_tree_randomly/' + complexity, 'function': 'evolve_tree_randomly',
+                            'tree': complexity, 'traces': None, 'seconds': seconds, 'events': None})
+            print_result(results[-1])
+            for num_traces in scales:
+                for function, case in get_cases(tree, num_traces, directory):
+                    seconds, events = measure(case)
+                    results.append({'name': function + '/' + complexity + '/' + str(num_traces), 'function': function,
+                                    'tree': complexity, 'traces': num_traces, 'seconds': seconds, 'events': events})
+                    print_result(results[-1])
+    return results
+
+
+def print_result(result):
+    print("{:<60} {:>12.4f}".format(result['name'], result['seconds']))
+
+
+def find_regressions(results, thresholds, baseline=None):
+    """ Cases exceeding their threshold or slowing down against a baseline
+
+    :param results: list of results
+    :param thresholds: dictionary with the tolerance and the maximum seconds per case name
+    :param baseline: list of results of a previous run or None
+    :return: list of descriptions of the regressions
+    """
+    regressions = []
+    previous = {} if baseline is None else {result['name']: result['seconds'] for result in baseline}
+    for result in results:
+        limit = thresholds.get('max_seconds', {}).get(result['name'])
+        if limit is not None and result['seconds'] > limit:
+            regressions.append(result['name'] + ": " + format(result['seconds'], '.4f') + " s > threshold " +
+                               format(limit, '.4f') + " s")
+        if result['name'] in previous:
+            allowed = max(previous[result['name']] * (1 + thresholds.get('tolerance', 0.5)),
+                          previous[result['name']] + thresholds.get('min_difference', 0))
+            if result['seconds'] > allowed:
+                regressions.append(result['name'] + ": " + format(result['seconds'], '.4f') + " s > baseline " +
+                                   format(previous[result['name']], '.4f') + " s + tolerance")
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Benchmark suite of the public entry points")
+    parser.add_argument('--scales', type=int, nargs='+', default=SCALES, help="numbers of traces")
+    parser.add_argument('--trees', nargs='+', default=TREES, choices=TREES, help="reference trees")
+    parser.add_argument('--output', default='bench_results.json', help="JSON file for the results")
+    parser.add_argument('--baseline', default=None, help="JSON file with the results of a previous run")
+    parser.add_argument('--write-trees', action='store_true', help="generate the reference trees again")
+    arguments = parser.parse_args()
+    if arguments.write_trees:
+        write_reference_trees()
+    results = run_suite(arguments.scales, arguments.trees)
+    with open(arguments.output, 'w') as file:
+        json.dump({'version': conceptdrift.__version__, 'python': platform.python_version(),
+                   'numpy': numpy.__version__, 'machine': platform.machine(), 'seed': SEED, 'results': results},
+                  file, indent=2)
+    with open(THRESHOLDS) as file:
+        thresholds = json.load(file)
+    baseline = None
+    if arguments.baseline is not None:
+        with open(arguments.baseline) as file:
+            baseline = json.load(file)['results']
+    regressions = find_regressions(results, thresholds, baseline)
+    for regression in regressions:
+        print("REGRESSION " + regression)
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,35 @@
+""" CDLG: Concept Drift Log Generator
+
+The main functions of the package are available as attributes of this module. They are imported lazily on first
+access, so that ``import conceptdrift`` does not load pm4py before it is actually needed.
+"""
+import importlib
+
+__version__ = '0.0.2'  # the only place of the version, setup.py reads it from here
+
+_LAZY_ATTRIBUTES = {
+    'generate_log_with_sudden_drift': 'conceptdrift.drifts.sudden',
+    'generate_log_with_gradual_drift': 'conceptdrift.drifts.gradual',
+    'generate_log_with_recurring_drift': 'conceptdrift.drifts.recurring',
+    'generate_log_with_incremental_drift': 'conceptdrift.drifts.incremental',
+    'add_noise': 'conceptdrift.source.noise',
+    'evolve_tree_randomly': 'conceptdrift.source.evolution',
+    'generate_logs': 'conceptdrift.generate_collection_of_logs',
+    'import_process_model': 'conceptdrift.source.process_tree_controller',
+    'generate_specific_trees': 'conceptdrift.source.process_tree_controller',
+    'LogCache': 'conceptdrift.source.log_cache',
+}
+
+__all__ = list(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError("module 'conceptdrift' has no attribute '" + name + "'")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
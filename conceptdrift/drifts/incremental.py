@@ -1,23 +1,35 @@
-import copy
 import datetime
 
-from pm4py.objects.process_tree import semantics
-
-from conceptdrift.source.evolution import evolve_tree_randomly_gs
-from conceptdrift.source.event_log_controller import combine_two_logs, add_duration_to_log, get_timestamp_log
+from conceptdrift.source.event_log_controller import add_duration_to_log, get_timestamp_log
+from conceptdrift.source.columnar_log import convert_columnar_log
+from conceptdrift.drifts.schedule import compile_incremental_schedule, generate_log_from_schedule
 from conceptdrift.source.process_tree_controller import generate_specific_trees
+from conceptdrift.source.log_cache import generate_cached_log
+from conceptdrift.source.random_streams import spawn_generators
+from conceptdrift.source.tree_versions import TreeVersions
 
 
-def generate_log_with_incremental_drift(num_versions=4, traces=None, change_proportion=0.1, model=generate_specific_trees('middle')):
+def generate_log_with_incremental_drift(num_versions=4, traces=None, change_proportion=0.1, model=None, playout_mode='trace', output='event_log', rng=None, cache=None):
     """ Generation of an event log with an incremental drift
     
     :param num_versions: number of occurring process tree versions
     :param traces: number traces for each version in list (e.g. [300,200,200])
     :param change_proportion: proportion of total activities to be affected by the random evolution
-    :param model: initial process tree model version
+    :param model: initial process tree model version (a random 'middle' tree if None)
+    :param playout_mode: playout of the traces ('trace' plays out every trace, 'batch' plays out all traces of a tree in one vectorized walk, 'variants' samples from the variant tables of the trees)
+    :param output: type of the returned log ('event_log', 'columnar' or 'dataframe')
+    :param rng: numpy.random.Generator or seed; the tree, the evolutions, the playout and the durations draw from own child streams of it
+    :param cache: log cache or directory of one (see LogCache); logs of integer seeds are served from it if they were generated before
     :return: event log with incremental drift
     """
-    vers = [model]
+    if cache is not None:
+        parameters = {'num_versions': num_versions, 'traces': traces, 'change_proportion': change_proportion,
+                      'model': model, 'playout_mode': playout_mode}
+        return generate_cached_log(cache, generate_log_with_incremental_drift, parameters, rng, output)
+    tree_rng, evolution_rng, playout_rng, duration_rng = spawn_generators(rng, 4)
+    if model is None:
+        model = generate_specific_trees('middle', tree_rng)
+    vers = TreeVersions(model)
     num_traces = []
     deleted_acs = []
     added_acs = []
@@ -30,19 +42,17 @@ def generate_log_with_incremental_drift(num_versions=4, traces=None, change_prop
     else:
         num_traces = traces
     i = 0
-    event_log = semantics.generate_log(vers[i], num_traces[i])
+    evolution_rngs = spawn_generators(evolution_rng, max(num_versions - 1, 0))
     while i < num_versions-1:
-        ver_copy = copy.deepcopy(vers[i])
-        ver_new, deleted_ac, added_ac, moved_ac = evolve_tree_randomly_gs(ver_copy, change_proportion)
+        ver_new, deleted_ac, added_ac, moved_ac = vers.evolve(change_proportion, i, rng=evolution_rngs[i])
         deleted_acs.extend(deleted_ac)
         added_acs.extend(added_ac)
         moved_acs.extend(moved_ac)
-        vers.append(ver_new)
-        log = semantics.generate_log(vers[i + 1], num_traces[i + 1])
-        event_log = combine_two_logs(event_log, log)
         i = i + 1
+    schedule = compile_incremental_schedule(num_traces[:num_versions])
+    event_log = generate_log_from_schedule(schedule, vers.versions, playout_mode, playout_rng)
     date = datetime.datetime.strptime('20/8/3 8:0:0', '%y/%d/%m %H:%M:%S')
-    add_duration_to_log(event_log, date, 1, 14000)
+    add_duration_to_log(event_log, date, 1, 14000, duration_rng)
     len(event_log)
     start_area = float(num_traces[0]/len(event_log))
     end_area = float((len(event_log) - num_traces[len(num_traces)-1])/len(event_log))
@@ -50,10 +60,10 @@ def generate_log_with_incremental_drift(num_versions=4, traces=None, change_prop
     end_drift = get_timestamp_log(event_log, len(event_log), end_area)
     data = "drift type: incremental; drift perspective: control-flow; drift specific information: " + str(num_versions) + " versions of the process model; drift start timestamp: "+str(start_drift)+" (" + str(round(start_area, 2)) + "); drift end timestamp: "+str(end_drift)+" (" + str(round(end_area, 2)) + "); activities added: "+str(added_acs)+"; activities deleted: "+str(deleted_acs)+"; activities moved: "+str(moved_acs)
     event_log.attributes['drift info'] = data
-    return event_log
+    return convert_columnar_log(event_log, output)
 
 
-def incremental_drift_gs(tree_one, start_point, end_point, nu_traces, nu_models, proportion_random_evolution):
+def incremental_drift_gs(tree_one, start_point, end_point, nu_traces, nu_models, proportion_random_evolution, playout_mode='trace', output='event_log', rng=None):
     """ Generation of an event log with an incremental drift for gold standard
 
     :param proportion_random_evolution: proportion of the process model version to be evolved
@@ -62,35 +72,48 @@ def incremental_drift_gs(tree_one, start_point, end_point, nu_traces, nu_models,
     :param end_point: ending point for the incremental drift
     :param nu_traces: number traces in event log
     :param nu_models: number of intermediate models
+    :param playout_mode: playout of the traces ('trace' plays out every trace, 'batch' plays out all traces of a tree in one vectorized walk, 'variants' samples from the variant tables of the trees)
+    :param output: type of the returned log ('event_log', 'columnar' or 'dataframe')
+    :param rng: numpy.random.Generator or seed; the evolutions and the playout draw from own child streams of it
     :return: event log with incremental drift
     """
+    evolution_rng, playout_rng = spawn_generators(rng, 2)
+    schedule, versions, deleted_acs, added_acs, moved_acs = compile_incremental_drift_gs(
+        tree_one, start_point, end_point, nu_traces, nu_models, proportion_random_evolution, rng=evolution_rng)
+    result = generate_log_from_schedule(schedule, versions, playout_mode, playout_rng)
+    return convert_columnar_log(result, output), deleted_acs, added_acs, moved_acs
+
+
+def compile_incremental_drift_gs(tree_one, start_point, end_point, nu_traces, nu_models, proportion_random_evolution, record=None, rng=None):
+    """ Evolution of the versions and schedule of an incremental drift for gold standard (see incremental_drift_gs)
+
+    :param tree_one: initial model
+    :param start_point: starting point for the incremental drift
+    :param end_point: ending point for the incremental drift
+    :param nu_traces: number traces in event log
+    :param nu_models: number of intermediate models
+    :param proportion_random_evolution: proportion of the process model version to be evolved
+    :param record: stage record (see profiling) to which the retries of the evolutions are added
+    :param rng: numpy.random.Generator or seed; every evolution draws from its own child stream of it
+    :return: schedule, list of the frozen versions, deleted activities, added activities and moved activities
+    """
     deleted_acs = []
     added_acs = []
     moved_acs = []
     start_traces = int(round((nu_traces * start_point) + 0.0001))
     drift_traces = int(round(((nu_traces - start_traces - (nu_traces * (1 - end_point))) / (nu_models - 1)) + 0.0001))
     end_traces = nu_traces - start_traces - (drift_traces * (nu_models - 1))
-    result = semantics.generate_log(tree_one, start_traces)
     i = 0
-    trees = [tree_one]
-    while i < nu_models - 1:
-        drift_tree = copy.deepcopy(trees[i])
-        tree_ev, deleted_ac, added_ac, moved_ac = evolve_tree_randomly_gs(drift_tree, proportion_random_evolution)
+    trees = TreeVersions(tree_one)
+    evolution_rngs = spawn_generators(rng, nu_models)
+    while i < nu_models:
+        tree_ev, deleted_ac, added_ac, moved_ac = trees.evolve(proportion_random_evolution, i, record, evolution_rngs[i])
         deleted_acs.extend(deleted_ac)
         added_acs.extend(added_ac)
         moved_acs.extend(moved_ac)
-        trees.append(tree_ev)
-        log = semantics.generate_log(trees[i + 1], drift_traces)
-        result = combine_two_logs(result, log)
         i = i + 1
-    drift_tree = copy.deepcopy(trees[i])
-    tree_ev, deleted_ac, added_ac, moved_ac = evolve_tree_randomly_gs(drift_tree, proportion_random_evolution)
-    deleted_acs.extend(deleted_ac)
-    added_acs.extend(added_ac)
-    moved_acs.extend(moved_ac)
-    log = semantics.generate_log(tree_ev, end_traces)
-    result = combine_two_logs(result, log)
-    return result, deleted_acs, added_acs, moved_acs
+    schedule = compile_incremental_schedule([start_traces] + [drift_traces] * (nu_models - 1) + [end_traces])
+    return schedule, trees.versions, deleted_acs, added_acs, moved_acs
 
 "---TESTS---"
 # ve_one = generate_specific_trees('complex')
@@ -0,0 +1,183 @@
+import math
+
+import numpy
+
+from conceptdrift.source.columnar_log import combine_columnar_logs, take_traces
+from conceptdrift.source.playout import generate_columnar_log
+from conceptdrift.source.random_streams import get_generator, spawn_generators
+
+""" DRIFT SCHEDULES """
+
+EXPONENTIAL_RATE = 4.0
+SIGMOID_STEEPNESS = 10.0
+
+
+def compile_segments(segments):
+    """ Schedule consisting of consecutive segments of traces of the same version
+
+    :param segments: list of (version, number of traces)
+    :return: array with the version of every trace
+    """
+    versions = numpy.array([version for version, count in segments], dtype=numpy.int64)
+    counts = numpy.array([max(count, 0) for version, count in segments], dtype=numpy.int64)
+    return numpy.repeat(versions, counts)
+
+
+def get_part_sizes(nu_traces, number):
+    """ Number of traces of the parts of a log split into number parts (like generate_several_parts_of_event_log)
+
+    :param nu_traces: number of traces of the log
+    :param number: number of parts
+    :return: list with the number of traces of every part
+    """
+    nu_traces_per_log = int(round(nu_traces / number + 0.0001))
+    sizes = []
+    start = 0
+    for _ in range(number - 1):
+        stop = min(start + nu_traces_per_log, nu_traces)
+        sizes.append(stop - start)
+        start = stop
+    sizes.append(nu_traces - start)
+    return sizes
+
+
+def compile_sudden_schedule(num_traces, change_point):
+    """ Schedule of a sudden drift
+
+    :param num_traces: number of traces in the event log
+    :param change_point: change point of the drift as a proportion of the total number of traces
+    :return: array with the version (0 or 1) of every trace
+    """
+    log_one_traces = int(round(num_traces * change_point))
+    return compile_segments([(0, log_one_traces), (1, num_traces - log_one_traces)])
+
+
+def compile_gradual_schedule(num_traces, start_point, end_point, distribution_type='linear', rng=None):
+    """ Schedule of a gradual drift (the versions of the drift traces are drawn by the mixing schedule)
+
+    :param num_traces: number of traces in the event log
+    :param start_point: start change point of the drift as a proportion of the total number of traces
+    :param end_point: end change point of the drift as a proportion of the total number of traces
+    :param distribution_type: mixing schedule ('linear', 'exponential', 'sigmoid' or a function)
+    :param rng: numpy.random.Generator or seed for the mixing (see random_streams.get_generator)
+    :return: array with the version (0 or 1) of every trace
+    """
+    before_drift_traces = int(round((start_point * num_traces) + 0.0001))
+    after_drift_traces = int(round(((1 - end_point) * num_traces) + 0.0001))
+    return numpy.concatenate([compile_segments([(0, before_drift_traces)]),
+                              compile_mixing_schedule(distribution_type,
+                                                      num_traces - before_drift_traces - after_drift_traces, rng),
+                              compile_segments([(1, after_drift_traces)])])
+
+
+def compile_mixing_schedule(distribution_type, nu_traces, rng=None):
+    """ Versions of the traces during a gradual drift (one Bernoulli draw per trace)
+
+    :param distribution_type: mixing schedule ('linear', 'exponential', 'sigmoid' or a function)
+    :param nu_traces: number of traces during the drift
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: array with the version (0 or 1) of every trace
+    """
+    probabilities = get_mixing_probabilities(distribution_type, nu_traces)
+    return (get_generator(rng).random(nu_traces) < probabilities).astype(numpy.int64)
+
+
+def get_mixing_probabilities(distribution_type, nu_traces):
+    """ Probability of the evolved model for every trace of the gradual drift
+
+    The schedule is evaluated at the relative positions x of the traces in the drift (0 < x < 1) and rises from 0 to 1:
+    'linear' is x and 'sigmoid' changes fastest in the middle of the drift. 'exponential' lets the odds of the evolved
+    model grow exponentially over the drift, like the blocks of the evolved model growing and those of the initial
+    model shrinking exponentially in the original block schedule. Like 'linear' and 'sigmoid' it is symmetric, so half
+    of the traces of the drift are expected to come from each model. A function gets the array of positions and returns
+    the probabilities.
+
+    :param distribution_type: mixing schedule ('linear', 'exponential', 'sigmoid' or a function)
+    :param nu_traces: number of traces during the drift
+    :return: array with the probability of every trace
+    """
+    x = (numpy.arange(nu_traces) + 0.5) / max(nu_traces, 1)
+    if callable(distribution_type):
+        probabilities = numpy.asarray(distribution_type(x), dtype=numpy.float64)
+    elif distribution_type.strip() == 'linear':
+        probabilities = x
+    elif distribution_type.strip() == 'exponential':
+        probabilities = 1 / (1 + numpy.exp(-EXPONENTIAL_RATE * (2 * x - 1)))
+    elif distribution_type.strip() == 'sigmoid':
+        low = 1 / (1 + math.exp(SIGMOID_STEEPNESS / 2))
+        probabilities = (1 / (1 + numpy.exp(-SIGMOID_STEEPNESS * (x - 0.5))) - low) / (1 - 2 * low)
+    else:
+        raise ValueError("unknown distribution type '" + str(distribution_type) + "'")
+    return numpy.clip(numpy.broadcast_to(probabilities, x.shape), 0, 1)
+
+
+def compile_recurring_schedule(num_traces, start_point, end_point, num_of_seasonal_changes, pro_first_version):
+    """ Schedule of a recurring drift
+
+    :param num_traces: number of traces in the event log
+    :param start_point: start change point of the drift as a proportion of the total number of traces
+    :param end_point: end change point of the drift as a proportion of the total number of traces
+    :param num_of_seasonal_changes: the number of changes of the model versions in the event log
+    :param pro_first_version: proportion of the traces generated by the initial model version during the drift
+    :return: array with the version (0 or 1) of every trace
+    """
+    nu_traces_log_one = int(
+        round((num_traces * start_point) + (num_traces * ((end_point - start_point) * pro_first_version)) + 0.0001))
+    nu_traces_log_two = num_traces - nu_traces_log_one
+    if start_point == 0:
+        nu_occur_one = int(round((num_of_seasonal_changes + 1.1) / 2))
+        nu_occur_two = (num_of_seasonal_changes + 1) - nu_occur_one
+    else:
+        nu_occur_two = int(round((num_of_seasonal_changes + 1.1) / 2))
+        nu_occur_one = (num_of_seasonal_changes + 1) - nu_occur_two
+    nu_traces_start = min(int(round(num_traces * start_point + 0.0001)), nu_traces_log_one)
+    nu_traces_sec_drift = min(int(
+        round((((num_traces * end_point) - (num_traces * start_point)) * (1 - pro_first_version)) + 0.0001)),
+        nu_traces_log_two)
+    parts_one = get_part_sizes(nu_traces_log_one - nu_traces_start, nu_occur_one)
+    parts_two = get_part_sizes(nu_traces_sec_drift, nu_occur_two)
+    segments = [(0, nu_traces_start)]
+    if start_point == 0:
+        first, second, parts_first, parts_second = 0, 1, parts_one, parts_two
+    else:
+        first, second, parts_first, parts_second = 1, 0, parts_two, parts_one
+    segments.append((first, parts_first[0]))
+    segments.append((second, parts_second[0]))
+    for i in range(1, len(parts_second)):
+        segments.append((first, parts_first[i]))
+        segments.append((second, parts_second[i]))
+    if len(parts_first) != len(parts_second):
+        segments.append((first, parts_first[-1]))
+    if end_point != 1:
+        segments.append((1, nu_traces_log_two - nu_traces_sec_drift))
+    return compile_segments(segments)
+
+
+def compile_incremental_schedule(trace_counts):
+    """ Schedule of an incremental drift
+
+    :param trace_counts: number of traces of every version in list
+    :return: array with the version of every trace
+    """
+    return compile_segments(list(enumerate(trace_counts)))
+
+
+def generate_log_from_schedule(schedule, trees, playout_mode='trace', rng=None):
+    """ Generation of a columnar log following a schedule of model versions
+
+    Every version is played out once with the number of its traces in the schedule, then the traces are put into
+    place in one pass. Every version is played out from its own child stream of rng.
+
+    :param schedule: array with the version of every trace (index into trees)
+    :param trees: list of the process trees (or compiled or frozen trees) of the versions
+    :param playout_mode: playout of the traces ('trace', 'batch' or 'variants')
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: columnar log
+    """
+    schedule = numpy.asarray(schedule, dtype=numpy.int64)
+    counts = numpy.bincount(schedule, minlength=len(trees))
+    logs = [generate_columnar_log(tree, int(count), playout_mode, stream) for tree, count, stream in
+            zip(trees, counts, spawn_generators(rng, len(trees)))]
+    indices = numpy.empty(len(schedule), dtype=numpy.int64)
+    indices[numpy.argsort(schedule, kind='stable')] = numpy.arange(len(schedule))
+    return take_traces(combine_columnar_logs(logs), indices)
@@ -1,15 +1,16 @@
-import copy
 import datetime
 
-from pm4py.objects.process_tree import semantics
-
 from conceptdrift.source.evolution import evolve_tree_randomly_gs
-from conceptdrift.source.event_log_controller import combine_two_logs, add_duration_to_log, get_timestamp_log
-from conceptdrift.source.process_tree_controller import generate_specific_trees, visualise_tree
-# from pm4py.objects.log.exporter.xes import exporter as xes_exporter
+from conceptdrift.source.event_log_controller import add_duration_to_log, get_timestamp_log
+from conceptdrift.source.columnar_log import convert_columnar_log
+from conceptdrift.drifts.schedule import compile_sudden_schedule, generate_log_from_schedule
+from conceptdrift.source.process_tree_controller import generate_specific_trees
+from conceptdrift.source.frozen_tree import copy_process_tree
+from conceptdrift.source.log_cache import generate_cached_log
+from conceptdrift.source.random_streams import spawn_generators
 
 
-def generate_log_with_sudden_drift(num_traces=1000, change_point=0.5, model_one=None, model_two=None, change_proportion=0.2):
+def generate_log_with_sudden_drift(num_traces=1000, change_point=0.5, model_one=None, model_two=None, change_proportion=0.2, playout_mode='trace', output='event_log', rng=None, cache=None):
     """ Generation of an event log with a sudden drift
 
     :param num_traces: number of traces in the event log
@@ -17,36 +18,44 @@ def generate_log_with_sudden_drift(num_traces=1000, change_point=0.5, model_one=
     :param model_one: initial version of the process tree
     :param model_two: evolved version of the process tree
     :param change_proportion: proportion of total number of activities to be changed by random evolution (model_two must be None if random evolution is targeted)
+    :param playout_mode: playout of the traces ('trace' plays out every trace, 'batch' plays out all traces of a tree in one vectorized walk, 'variants' samples from the variant tables of the trees)
+    :param output: type of the returned log ('event_log', 'columnar' or 'dataframe')
+    :param rng: numpy.random.Generator or seed; the tree, the evolution, the playout and the durations draw from own child streams of it
+    :param cache: log cache or directory of one (see LogCache); logs of integer seeds are served from it if they were generated before
     :return: event log with sudden drift
     """
+    if cache is not None:
+        parameters = {'num_traces': num_traces, 'change_point': change_point, 'model_one': model_one,
+                      'model_two': model_two, 'change_proportion': change_proportion, 'playout_mode': playout_mode}
+        return generate_cached_log(cache, generate_log_with_sudden_drift, parameters, rng, output)
+    tree_rng, evolution_rng, playout_rng, duration_rng = spawn_generators(rng, 4)
     deleted_acs = []
     added_acs = []
     moved_acs = []
     if model_one is None:
-        ver_one = generate_specific_trees('middle')
-        ver_copy = copy.deepcopy(ver_one)
-        ver_two, deleted_acs, added_acs, moved_acs = evolve_tree_randomly_gs(ver_copy, change_proportion)
+        ver_one = generate_specific_trees('middle', tree_rng)
+        ver_copy = copy_process_tree(ver_one)
+        ver_two, deleted_acs, added_acs, moved_acs = evolve_tree_randomly_gs(ver_copy, change_proportion,
+                                                                             rng=evolution_rng)
     elif model_one is not None and model_two is None:
         ver_one = model_one
-        ver_copy = copy.deepcopy(ver_one)
-        ver_two, deleted_acs, added_acs, moved_acs = evolve_tree_randomly_gs(ver_copy, change_proportion)
+        ver_copy = copy_process_tree(ver_one)
+        ver_two, deleted_acs, added_acs, moved_acs = evolve_tree_randomly_gs(ver_copy, change_proportion,
+                                                                             rng=evolution_rng)
     else:
         ver_one = model_one
         ver_two = model_two
-    log_one_traces = int(round(num_traces * change_point))
-    log_two_traces = num_traces - log_one_traces
-    log_one = semantics.generate_log(ver_one, log_one_traces)
-    log_two = semantics.generate_log(ver_two, log_two_traces)
-    event_log = combine_two_logs(log_one, log_two)
+    schedule = compile_sudden_schedule(num_traces, change_point)
+    event_log = generate_log_from_schedule(schedule, [ver_one, ver_two], playout_mode, playout_rng)
     date = datetime.datetime.strptime('20/8/3 8:0:0', '%y/%d/%m %H:%M:%S')
-    add_duration_to_log(event_log, date, 1, 14000)
+    add_duration_to_log(event_log, date, 1, 14000, duration_rng)
     start_drift = get_timestamp_log(event_log, num_traces, change_point)
     if model_two is None:
         data = "drift perspective: control-flow; drift type: sudden; drift start timestamp: "+str(start_drift) + " (" + str(change_point) + "); activities added: "+str(added_acs)+"; activities deleted: "+str(deleted_acs)+"; activities moved: "+str(moved_acs)
     else:
         data = "drift perspective: control-flow; drift type: sudden; drift start timestamp: "+str(start_drift)+ " (" + str(change_point) + ")"
     event_log.attributes['drift info'] = data
-    return event_log
+    return convert_columnar_log(event_log, output)
 
 
 "---TESTS---"
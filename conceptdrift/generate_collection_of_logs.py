@@ -1,24 +1,34 @@
-import copy
 import csv
+import json
 import os
 import datetime
-from random import randint, uniform
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 import pathlib
+import shutil
 
-from pm4py.objects.log.exporter.xes import exporter as xes_exporter
-from pm4py.objects.process_tree.exporter import exporter as ptml_exporter
+import numpy
 
-from conceptdrift.drifts.gradual import generate_log_with_gradual_drift
-from conceptdrift.drifts.incremental import incremental_drift_gs
-from conceptdrift.drifts.recurring import generate_log_with_recurring_drift
-from conceptdrift.drifts.sudden import generate_log_with_sudden_drift
+import conceptdrift
+from conceptdrift.drifts.incremental import compile_incremental_drift_gs
+from conceptdrift.drifts.schedule import compile_sudden_schedule, compile_gradual_schedule, \
+    compile_recurring_schedule, generate_log_from_schedule
+from conceptdrift.source.columnar_log import get_noise_positions
 from conceptdrift.source.evolution import evolve_tree_randomly_gs
 from conceptdrift.source.event_log_controller import add_duration_to_log, get_timestamp_log
-from conceptdrift.source.noise import add_noise_gs
+from conceptdrift.source.log_export import FILE_EXTENSIONS, export_columnar_log, export_spilled_log
+from conceptdrift.source.noise import add_noise_gs, get_number_of_noise_traces, get_noise_tree
+from conceptdrift.source.spilled_log import generate_spilled_log
 from conceptdrift.source.process_tree_controller import generate_specific_trees
+from conceptdrift.source.frozen_tree import freeze_tree, copy_process_tree
+from conceptdrift.source.profiling import STAGES, LogProfile, profile_stage
+from conceptdrift.source.checkpoint import MANIFEST_NAME, new_manifest, load_manifest, save_manifest, check_manifest, \
+    record_log, get_finished_logs
+from conceptdrift.source.random_streams import spawn_generators, draw_integer
+from conceptdrift.source.log_cache import get_log_cache, get_cache_key, restore_files, store_files
 
 
-def generate_logs(num_logs=50, num_traces=1000, drifts=['sudden', 'gradual', 'recurring', 'incremental'], drift_area=[0.2, 0.8], pro_random_evolution=[0.2, 0.6], noise=[0, 0.1], model=generate_specific_trees('middle'), filepath=str(pathlib.Path().resolve())):
+def generate_logs(num_logs=50, num_traces=1000, drifts=['sudden', 'gradual', 'recurring', 'incremental'], drift_area=[0.2, 0.8], pro_random_evolution=[0.2, 0.6], noise=[0, 0.1], model=None, filepath=None, workers=1, seed=None, format='xes', chunk_size=None, profile=None, resume=False, cache=None):
     """Generation of a set of event logs with different drifts, a corresponding CSV file and respective text files
 
     :param num_logs: number of event logs
@@ -27,86 +37,281 @@ def generate_logs(num_logs=50, num_traces=1000, drifts=['sudden', 'gradual', 're
     :param drift_area: drift area (i.e. start and end point of random drift range) as a range in list
     :param noise: possible proportion of noise in the event log as a range in list
     :param pro_random_evolution: possible proportion of activities to be affected by the random change as a range in list
-    :param model: process model as process tree
-    :param filepath: file path where the event logs are to be saved
+    :param model: process model as process tree (a random 'middle' tree if None)
+    :param filepath: file path where the event logs are to be saved (current working directory if None)
+    :param workers: number of worker processes generating the event logs (None uses all available cores)
+    :param seed: seed from which the seeds of the single event logs (and of the random model) are derived, the output does
+    not depend on workers
+    :param format: file format of the event logs ('xes', 'parquet', 'arrow' or 'feather')
+    :param chunk_size: number of traces per chunk for the out-of-core generation (None keeps the event logs in memory)
+    :param profile: profiling of the stages of every event log (see profiling.STAGES): 'csv' adds the wall times and
+    the retries of the evolution as columns to the gold standard CSV file, 'json' writes all stage records into
+    profile.json, a function is called with the index of the event log and every stage record, None disables profiling
+    :param resume: continue the collection of the manifest in the folder: the event logs it records with unchanged files
+    are kept and only the missing ones are generated (seed None takes the seed of the manifest)
+    :param cache: log cache or directory of one (see LogCache): with an integer seed and without profiling, the files of
+    a collection generated before with the same parameters are copied from it instead of generating them again
     """
+    from pm4py.objects.process_tree.exporter import exporter as ptml_exporter
 
-    if not os.path.exists(filepath+'/gold_standard'):
-        os.makedirs(filepath+'/gold_standard')
-    with open(filepath+'/gold_standard/gold_standard.csv', 'w', newline='') as log_file:
+    if format not in FILE_EXTENSIONS:
+        raise ValueError("unknown file format '" + str(format) + "'")
+    if filepath is None:
+        filepath = str(pathlib.Path().resolve())
+    directory = filepath + '/gold_standard'
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+    manifest = load_manifest(manifest_path) if resume else None
+    if manifest is not None and seed is None:
+        seed = manifest['seed']
+    seed_sequence = numpy.random.SeedSequence(seed)
+    # the model and the event logs draw from separate children, so the model does not depend on num_logs
+    model_sequence, log_sequence = seed_sequence.spawn(2)
+    log_seeds = get_log_seeds(num_logs, log_sequence)
+    if model is None:
+        model = generate_specific_trees('middle', model_sequence)
+    configuration = {'num_traces': num_traces, 'drifts': list(drifts), 'drift_area': list(drift_area),
+                     'pro_random_evolution': list(pro_random_evolution), 'noise': noise if noise == 0 else list(noise),
+                     'model': str(model), 'format': format, 'chunk_size': chunk_size}
+    key = None
+    if cache is not None and profile is None:
+        cache = get_log_cache(cache)
+        key = get_cache_key('generate_logs', dict(configuration, num_logs=num_logs), seed)
+        if key is not None and restore_files(cache, key, directory):
+            return
+    if manifest is None:
+        manifest = new_manifest(conceptdrift.__version__, seed_sequence.entropy, configuration)
+        save_manifest(manifest, manifest_path)
+    else:
+        check_manifest(manifest, conceptdrift.__version__, seed, configuration)
+    finished = get_finished_logs(manifest, directory, num_logs)
+    missing = [i for i in range(num_logs) if i not in finished]
+    generate = partial(generate_single_log if profile is None else generate_profiled_log, num_traces=num_traces, drifts=drifts, drift_area=drift_area,
+                       pro_random_evolution=pro_random_evolution, noise=noise, model=freeze_tree(model), filepath=filepath, format=format,
+                       chunk_size=chunk_size)
+    if workers == 1:
+        record_results(manifest, manifest_path, map(generate, missing, [log_seeds[i] for i in missing]), missing,
+                       log_seeds, format, profile)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            record_results(manifest, manifest_path, executor.map(generate, missing, [log_seeds[i] for i in missing]),
+                           missing, log_seeds, format, profile)
+    with open(directory + '/gold_standard.csv', 'w', newline='') as log_file:
         writer = csv.writer(log_file)
-        writer.writerow(["Event Log", "Drift Perspective", "Drift Type", "Drift Specific Information", "Drift Start Timestamp", "Drift End Timestamp", "Noise Proportion", "Activities Added", "Activities Deleted", "Activities Moved"])
+        header = ["Event Log", "Drift Perspective", "Drift Type", "Drift Specific Information", "Drift Start Timestamp", "Drift End Timestamp", "Noise Proportion", "Activities Added", "Activities Deleted", "Activities Moved"]
+        if profile == 'csv':
+            header = header + ["Time " + stage.capitalize() + " [s]" for stage in STAGES] + ["Evolution Retries"]
+        writer.writerow(header)
         for i in range(num_logs):
-            parameters = "number of traces: "+str(num_traces)
-            drift = drifts[randint(0, len(drifts)-1)].strip()
-            drift_area_one = round(uniform(drift_area[0], (drift_area[0]+0.8*drift_area[1]-drift_area[0])), 2)
-            drift_area_two = round(uniform(drift_area_one + (drift_area[1]-drift_area[0]) * 0.2, drift_area[1]), 2)
-            if len(pro_random_evolution) == 1:
-                ran_evolve = round(pro_random_evolution[0], 2)
-            else:
-                ran_evolve = round(uniform(pro_random_evolution[0], pro_random_evolution[1]), 2)
-            drift_tree = copy.deepcopy(model)
-            if drift != 'incremental':
-                tree_two, deleted_acs, added_acs, moved_acs = evolve_tree_randomly_gs(drift_tree, ran_evolve)
-            if drift == 'sudden':
-                event_log = generate_log_with_sudden_drift(num_traces, drift_area_one, model, tree_two)
-                parameters += "; drift: sudden; change point: "+str(drift_area_one) + "; random evolution: "+str(ran_evolve)
-                dr_s = "N/A"
-            elif drift == 'gradual':
-                ra = randint(0, 1)
-                if ra == 0:
-                    gr_type = 'linear'
-                    dr_s = 'linear distribution'
-                else:
-                    gr_type = 'exponential'
-                    dr_s = 'exponential distribution'
-                event_log = generate_log_with_gradual_drift(num_traces, drift_area_one, drift_area_two, gr_type, model, tree_two)
-                parameters += "; drift: gradual; start point: "+str(drift_area_one)+"; end point: "+str(drift_area_two)+"; distribution: "+gr_type + "; random evolution: "+str(ran_evolve)
-            elif drift == 'recurring':
-                ran_odd = [3, 5]
-                pro_first = round(uniform(0.3, 0.7), 2)
-                if drift_area_one > 0 and drift_area_two != 1:
-                    ra = randint(0, 1)
-                    sea_cha = ran_odd[ra]
-                    dr_s = str(sea_cha)+" seasonal changes"
-                else:
-                    sea_cha = randint(1, 6)
-                    dr_s = str(sea_cha)+" seasonal changes"
-                event_log = generate_log_with_recurring_drift(num_traces, drift_area_one, drift_area_two, sea_cha, pro_first, model, tree_two)
-                parameters += "; drift: recurring; start point: "+str(drift_area_one)+"; end point: "+str(drift_area_two)+"; seasonal changes: "+str(sea_cha)+"; proportion initial version: "+str(pro_first) + "; random evolution: "+str(ran_evolve)
-            elif drift == 'incremental':
-                num_models = randint(2, 5)
-                ran_in_evolve = round(ran_evolve/num_models, 2)
-                event_log, deleted_acs, added_acs, moved_acs = incremental_drift_gs(model, drift_area_one, drift_area_two, num_traces, num_models, ran_in_evolve)
-                dr_s = str(num_models) + " evolving versions"
-                parameters += "; drift: incremental; start point: "+str(drift_area_one)+"; end point: "+str(drift_area_two) + "; number evolving versions: " + str(num_models) + "; random evolution per model: "+str(ran_in_evolve)
-            noise_prop = 0
-            noise_ha = True
-            if noise != 0:
-                noise_prop = round(uniform(noise[0], noise[1]), 4)
-                if noise_prop != 0:
-                    ran_no = randint(0, 1)
-                    if ran_no == 0:
-                        event_log, noise_ha = add_noise_gs(event_log, model, noise_prop, 'changed_model', 0, 1)
-                    else:
-                        event_log, noise_ha = add_noise_gs(event_log, model, noise_prop, 'random_model', 0, 1)
-            if not noise_ha:
-                noise_prop = 0.0
-            date = datetime.datetime.strptime('20/8/3 8:0:0', '%y/%d/%m %H:%M:%S')
-            add_duration_to_log(event_log, date, 1, 14000)
-            start_drift = get_timestamp_log(event_log, num_traces, drift_area_one)
-            if drift == 'sudden':
-                end_drift = "N/A"
+            entry = manifest['logs'][str(i)]
+            row = entry['row']
+            if profile == 'csv':
+                row = row + get_profile_columns(entry['profile'])
+            writer.writerow(row)
+    if profile == 'json':
+        profiles = {"event_log_" + str(i): manifest['logs'][str(i)]['profile'] for i in range(num_logs)
+                    if manifest['logs'][str(i)]['profile'] is not None}
+        with open(directory + '/profile.json', 'w') as profile_file:
+            json.dump(profiles, profile_file, indent=2)
+    ptml_exporter.apply(model, directory + "/initial_version.ptml")
+    if key is not None:
+        files = [name for i in range(num_logs) for name in manifest['logs'][str(i)]['files']]
+        store_files(cache, key, directory, files + ['gold_standard.csv', 'initial_version.ptml', MANIFEST_NAME])
+
+
+def record_results(manifest, manifest_path, results, indices, log_seeds, format, profile):
+    """ Recording of every generated event log in the manifest as soon as it is finished
+
+    :param manifest: manifest of the collection
+    :param manifest_path: path of the manifest (rewritten after every event log)
+    :param results: iterable of the rows (or of the rows and log profiles if profiled) in the order of indices
+    :param indices: indices of the generated event logs
+    :param log_seeds: seeds of all event logs
+    :param format: file format of the event logs
+    :param profile: profiling of generate_logs
+    """
+    directory = os.path.dirname(manifest_path)
+    for i, result in zip(indices, results):
+        log_profile = None
+        if profile is not None:
+            result, log_profile = result
+            if callable(profile):
+                for record in log_profile.stages:
+                    profile(i, record)
+        files = ["event_log_" + str(i) + FILE_EXTENSIONS[format], "event_log_" + str(i) + ".txt"]
+        record_log(manifest, i, log_seeds[i], result, files, directory,
+                   None if log_profile is None else log_profile.to_list())
+        save_manifest(manifest, manifest_path)
+
+
+def get_profile_columns(records):
+    """ Wall time of every stage and retries of the evolution of an event log for the gold standard CSV file
+
+    :param records: list of the stage records of the event log (see LogProfile.to_list) or None if it was not profiled
+    :return: list of the values of the profile columns
+    """
+    if records is None:
+        return [""] * (len(STAGES) + 1)
+    seconds = [sum(record['seconds'] for record in records if record['stage'] == stage)
+               if any(record['stage'] == stage for record in records) else None for stage in STAGES]
+    return ["" if value is None else round(value, 4) for value in seconds] + \
+        [sum(record['retries'] for record in records if record['stage'] == 'evolution')]
+
+
+def generate_profiled_log(i, log_seed, **parameters):
+    """ Generation of one event log of the collection with profiling of its stages (see generate_single_log)
+
+    :return: row of the event log for the gold standard CSV file and log profile
+    """
+    log_profile = LogProfile()
+    return generate_single_log(i, log_seed, profile=log_profile, **parameters), log_profile
+
+
+def get_log_seeds(num_logs, seed=None):
+    """ Derivation of one independent seed per event log
+
+    :param num_logs: number of event logs
+    :param seed: seed or numpy.random.SeedSequence of the whole collection
+    :return: list with one seed for each event log
+    """
+    if not isinstance(seed, numpy.random.SeedSequence):
+        seed = numpy.random.SeedSequence(seed)
+    return [int(child.generate_state(1)[0]) for child in seed.spawn(num_logs)]
+
+
+def generate_single_log(i, log_seed, num_traces, drifts, drift_area, pro_random_evolution, noise, model, filepath, format='xes', chunk_size=None, profile=None):
+    """ Generation of one event log of the collection including its XES and text file
+
+    :param i: index of the event log in the collection
+    :param log_seed: seed of this event log; the parameters, the evolution, the mixing, the noise, the playout and the
+    durations draw from own child streams of it
+    :param num_traces: number of traces in the event log
+    :param drifts: drift types in list as strings
+    :param drift_area: drift area (i.e. start and end point of random drift range) as a range in list
+    :param pro_random_evolution: possible proportion of activities to be affected by the random change as a range in list
+    :param noise: possible proportion of noise in the event log as a range in list
+    :param model: process model as process tree or frozen tree (shared by all event logs of the collection)
+    :param filepath: file path where the event logs are to be saved
+    :param format: file format of the event log ('xes', 'parquet', 'arrow' or 'feather')
+    :param chunk_size: number of traces per chunk for the out-of-core generation (None keeps the event log in memory);
+    the chunks are spilled into a directory next to the event log file that is removed after the export
+    :param profile: log profile into which the stages of the generation are recorded (None disables profiling)
+    :return: row of the event log for the gold standard CSV file
+    """
+    parameter_rng, evolution_rng, mixing_rng, noise_rng, playout_rng, duration_rng = spawn_generators(log_seed, 6)
+    parameters = "number of traces: "+str(num_traces)
+    drift = drifts[draw_integer(parameter_rng, 0, len(drifts)-1)].strip()
+    drift_area_one = round(parameter_rng.uniform(drift_area[0], (drift_area[0]+0.8*drift_area[1]-drift_area[0])), 2)
+    drift_area_two = round(parameter_rng.uniform(drift_area_one + (drift_area[1]-drift_area[0]) * 0.2, drift_area[1]), 2)
+    if len(pro_random_evolution) == 1:
+        ran_evolve = round(pro_random_evolution[0], 2)
+    else:
+        ran_evolve = round(parameter_rng.uniform(pro_random_evolution[0], pro_random_evolution[1]), 2)
+    drift_tree = copy_process_tree(model)
+    if drift != 'incremental':
+        with profile_stage(profile, 'evolution') as stage:
+            tree_two, deleted_acs, added_acs, moved_acs = evolve_tree_randomly_gs(drift_tree, ran_evolve, record=stage,
+                                                                                  rng=evolution_rng)
+        versions = [model, tree_two]
+    if drift == 'sudden':
+        schedule = compile_sudden_schedule(num_traces, drift_area_one)
+        parameters += "; drift: sudden; change point: "+str(drift_area_one) + "; random evolution: "+str(ran_evolve)
+        dr_s = "N/A"
+    elif drift == 'gradual':
+        ra = draw_integer(parameter_rng, 0, 1)
+        if ra == 0:
+            gr_type = 'linear'
+            dr_s = 'linear distribution'
+        else:
+            gr_type = 'exponential'
+            dr_s = 'exponential distribution'
+        schedule = compile_gradual_schedule(num_traces, drift_area_one, drift_area_two, gr_type, mixing_rng)
+        parameters += "; drift: gradual; start point: "+str(drift_area_one)+"; end point: "+str(drift_area_two)+"; distribution: "+gr_type + "; random evolution: "+str(ran_evolve)
+    elif drift == 'recurring':
+        ran_odd = [3, 5]
+        pro_first = round(parameter_rng.uniform(0.3, 0.7), 2)
+        if drift_area_one > 0 and drift_area_two != 1:
+            ra = draw_integer(parameter_rng, 0, 1)
+            sea_cha = ran_odd[ra]
+            dr_s = str(sea_cha)+" seasonal changes"
+        else:
+            sea_cha = draw_integer(parameter_rng, 1, 6)
+            dr_s = str(sea_cha)+" seasonal changes"
+        schedule = compile_recurring_schedule(num_traces, drift_area_one, drift_area_two, sea_cha, pro_first)
+        parameters += "; drift: recurring; start point: "+str(drift_area_one)+"; end point: "+str(drift_area_two)+"; seasonal changes: "+str(sea_cha)+"; proportion initial version: "+str(pro_first) + "; random evolution: "+str(ran_evolve)
+    elif drift == 'incremental':
+        num_models = draw_integer(parameter_rng, 2, 5)
+        ran_in_evolve = round(ran_evolve/num_models, 2)
+        with profile_stage(profile, 'evolution') as stage:
+            schedule, versions, deleted_acs, added_acs, moved_acs = compile_incremental_drift_gs(model, drift_area_one, drift_area_two, num_traces, num_models, ran_in_evolve, record=stage, rng=evolution_rng)
+        dr_s = str(num_models) + " evolving versions"
+        parameters += "; drift: incremental; start point: "+str(drift_area_one)+"; end point: "+str(drift_area_two) + "; number evolving versions: " + str(num_models) + "; random evolution per model: "+str(ran_in_evolve)
+    noise_prop = 0
+    noise_ha = True
+    noise_type = None
+    if noise != 0:
+        noise_prop = round(parameter_rng.uniform(noise[0], noise[1]), 4)
+        if noise_prop != 0:
+            ran_no = draw_integer(parameter_rng, 0, 1)
+            if ran_no == 0:
+                noise_type = 'changed_model'
             else:
-                end_drift = str(get_timestamp_log(event_log, num_traces, drift_area_two)) + " (" + str(drift_area_two) + ")"
-            data = "event log: "+"event_log_"+str(i)+"; drift perspective: control-flow; drift type: "+drift+"; drift specific information: "+dr_s+"; drift start timestamp: "+str(start_drift)+" (" + str(drift_area_one) + "); drift end timestamp: "+end_drift+"; noise proportion: "+str(noise_prop)+"; activities added: "+str(added_acs)+"; activities deleted: "+str(deleted_acs)+"; activities moved: "+str(moved_acs)
-            event_log.attributes['drift info'] = data
-            xes_exporter.apply(event_log, filepath+"/gold_standard/event_log_"+str(i)+".xes")
-            writer.writerow(["event_log_"+str(i), "control-flow", drift, dr_s, start_drift, end_drift, noise_prop, added_acs, deleted_acs, moved_acs])
-            file_object = open(filepath+"/gold_standard/event_log_"+str(i)+".txt", 'w')
-            file_object.write("--- USED PARAMETERS ---\n")
-            file_object.write(parameters+"\n\n")
-            file_object.write("--- DRIFT INFORMATION ---\n")
-            file_object.write(data)
-            file_object.close()
-    ptml_exporter.apply(model, filepath + "/gold_standard/initial_version.ptml")
+                noise_type = 'random_model'
+    date = datetime.datetime.strptime('20/8/3 8:0:0', '%y/%d/%m %H:%M:%S')
+    spill_directory = filepath+"/gold_standard/event_log_"+str(i)+"_chunks"
+    if chunk_size is None:
+        with profile_stage(profile, 'playout') as stage:
+            event_log = generate_log_from_schedule(schedule, versions, rng=playout_rng)
+            stage.set_log(event_log)
+        if noise_type is not None:
+            with profile_stage(profile, 'noise') as stage:
+                event_log, noise_ha = add_noise_gs(event_log, model, noise_prop, noise_type, 0, 1, record=stage,
+                                                   rng=noise_rng)
+                stage.set_log(event_log)
+        with profile_stage(profile, 'durations') as stage:
+            add_duration_to_log(event_log, date, 1, 14000, duration_rng)
+            stage.set_log(event_log)
+        spilled_log = None
+    else:
+        noise_tree = None
+        noise_positions = None
+        if noise_type is not None:
+            with profile_stage(profile, 'noise') as stage:
+                nu_noise = get_number_of_noise_traces(len(schedule), noise_prop, 0, 1)
+                noise_ha = nu_noise != 0
+                if noise_ha:
+                    tree_rng, position_rng = spawn_generators(noise_rng, 2)
+                    noise_tree = get_noise_tree(model, noise_type, record=stage, rng=tree_rng)
+                    noise_positions = get_noise_positions(len(schedule), nu_noise, position_rng)
+        # the chunks are played out with their noise traces and durations in one pass
+        with profile_stage(profile, 'playout') as stage:
+            spilled_log = generate_spilled_log(schedule, versions, spill_directory, chunk_size, noise_tree=noise_tree,
+                                               noise_positions=noise_positions, datestamp=date, min_duration=1,
+                                               max_duration=14000, rng=playout_rng)
+            event_log = spilled_log.get_columnar()
+            stage.set_log(event_log)
+    if not noise_ha:
+        noise_prop = 0.0
+    start_drift = get_timestamp_log(event_log, num_traces, drift_area_one)
+    if drift == 'sudden':
+        end_drift = "N/A"
+    else:
+        end_drift = str(get_timestamp_log(event_log, num_traces, drift_area_two)) + " (" + str(drift_area_two) + ")"
+    data = "event log: "+"event_log_"+str(i)+"; drift perspective: control-flow; drift type: "+drift+"; drift specific information: "+dr_s+"; drift start timestamp: "+str(start_drift)+" (" + str(drift_area_one) + "); drift end timestamp: "+end_drift+"; noise proportion: "+str(noise_prop)+"; activities added: "+str(added_acs)+"; activities deleted: "+str(deleted_acs)+"; activities moved: "+str(moved_acs)
+    event_log.attributes['drift info'] = data
+    with profile_stage(profile, 'export') as stage:
+        stage.set_log(event_log)
+        if spilled_log is None:
+            export_columnar_log(event_log, filepath+"/gold_standard/event_log_"+str(i)+FILE_EXTENSIONS[format], format)
+        else:
+            export_spilled_log(spilled_log, filepath+"/gold_standard/event_log_"+str(i)+FILE_EXTENSIONS[format], format)
+            del event_log
+            shutil.rmtree(spill_directory)
+    file_object = open(filepath+"/gold_standard/event_log_"+str(i)+".txt", 'w')
+    file_object.write("--- USED PARAMETERS ---\n")
+    file_object.write(parameters+"\n\n")
+    file_object.write("--- DRIFT INFORMATION ---\n")
+    file_object.write(data)
+    file_object.close()
+    return ["event_log_"+str(i), "control-flow", drift, dr_s, start_drift, end_drift, noise_prop, added_acs, deleted_acs, moved_acs]
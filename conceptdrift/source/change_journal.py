@@ -0,0 +1,80 @@
+from pm4py.objects.process_tree.obj import ProcessTree
+
+""" JOURNAL OF THE CHANGES OF A RANDOM EVOLUTION """
+
+
+class ChangeRecord:
+    """ One change of a random evolution
+
+    Nodes are identified by their path, i.e. the positions in the child lists from the root to the node in the tree
+    before the change, so a record can be applied to any copy of that tree. before and after hold the labels of the
+    changed leaves or the operators of the changed nodes:
+
+    - 'activity deleted', 'activity replaced', 'activities swapped': labels of the leaves in nodes
+    - 'activity added': nodes is the parent of the new leaf, after its label
+    - 'operator replaced', 'operators swapped': operators of the nodes
+    - 'activity and operator added': after is the operator of the new node and the label of its new leaf
+    - 'tree fragment deleted', 'tree fragment moved' (to the second node), 'activity with tree fragment swapped',
+      'tree fragments swapped': nodes only
+
+    added, deleted and moved are the activities (leaves) counted as added, deleted and moved by the change.
+
+    :param operation: name of the change (as in the description of the evolution)
+    :param nodes: tuple of the paths of the affected nodes
+    :param before: labels or operators before the change
+    :param after: labels or operators after the change
+    """
+    __slots__ = ('operation', 'nodes', 'before', 'after', 'added', 'deleted', 'moved')
+
+    def __init__(self, operation, nodes, before=(), after=(), added=(), deleted=(), moved=()):
+        self.operation = operation
+        self.nodes = nodes
+        self.before = before
+        self.after = after
+        self.added = list(added)
+        self.deleted = list(deleted)
+        self.moved = list(moved)
+
+    def __repr__(self):
+        return "ChangeRecord(" + repr(self.operation) + ", " + repr(self.nodes) + ", " + repr(self.before) + ", " + \
+               repr(self.after) + ")"
+
+
+def record_change(journal, record):
+    """ Adding of a record to a journal (nothing is recorded without journal) """
+    if journal is not None:
+        journal.append(record)
+
+
+def apply_change(index, record):
+    """ Application of a recorded change to a tree
+
+    :param index: index of the tree (the tree has to be equal to the tree the change was recorded on)
+    :param record: change record
+    """
+    nodes = [index.get_node(path) for path in record.nodes]
+    operation = record.operation
+    if operation in ('activity deleted', 'activity replaced', 'activities swapped'):
+        for node, label in zip(nodes, record.after):
+            index.set_label(node, label)
+    elif operation == 'activity added':
+        index.append_child(nodes[0], ProcessTree(None, None, None, record.after[0]))
+    elif operation in ('operator replaced', 'operators swapped'):
+        for node, operator in zip(nodes, record.after):
+            index.set_operator(node, operator)
+    elif operation == 'tree fragment deleted':
+        index.replace(nodes[0], ProcessTree(None, None, None, None))
+    elif operation == 'tree fragment moved':
+        index.replace(nodes[0], ProcessTree(None, None, None, None))
+        index.append_child(nodes[1], nodes[0])
+    elif operation == 'activity and operator added':
+        tree_ac = ProcessTree(None, None, None, record.after[1])
+        tree_op = ProcessTree(record.after[0], None, None, None)
+        tree_op._set_children([tree_ac])
+        tree_ac._set_parent(tree_op)
+        index.replace(nodes[0], tree_op)
+        index.append_child(tree_op, nodes[0])
+    elif operation in ('activity with tree fragment swapped', 'tree fragments swapped'):
+        index.swap(nodes[0], nodes[1])
+    else:
+        raise ValueError("unknown change '" + str(operation) + "'")
@@ -0,0 +1,119 @@
+import hashlib
+import json
+import os
+
+""" CHECKPOINTS OF COLLECTIONS OF EVENT LOGS """
+
+MANIFEST_NAME = 'manifest.json'
+
+
+def hash_file(path, block_size=2 ** 20):
+    """ SHA-256 hash of a file read block by block
+
+    :param path: path of the file
+    :param block_size: number of bytes read at once
+    :return: hexadecimal digest
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        block = file.read(block_size)
+        while block:
+            digest.update(block)
+            block = file.read(block_size)
+    return digest.hexdigest()
+
+
+def new_manifest(version, seed, configuration):
+    """ Manifest of a collection without finished event logs
+
+    :param version: version of the package
+    :param seed: entropy of the seed sequence of the collection
+    :param configuration: dictionary of the parameters the event logs depend on (JSON serializable)
+    :return: manifest
+    """
+    return {'version': version, 'seed': seed, 'configuration': configuration, 'logs': {}}
+
+
+def load_manifest(path):
+    """ Manifest written before, None if there is none
+
+    :param path: path of the manifest
+    :return: manifest or None
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_manifest(manifest, path):
+    """ Atomic writing of a manifest
+
+    The manifest is written into a temporary file next to it, flushed to disk and then renamed, so a crash leaves
+    either the previous or the new manifest, never a partly written one.
+
+    :param manifest: manifest
+    :param path: path of the manifest
+    """
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as file:
+        json.dump(manifest, file, separators=(',', ':'))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temporary, path)
+
+
+def check_manifest(manifest, version, seed, configuration):
+    """ Check that a manifest belongs to the same collection
+
+    :param manifest: manifest
+    :param version: version of the package
+    :param seed: seed of the collection (None accepts the seed of the manifest)
+    :param configuration: dictionary of the parameters the event logs depend on
+    """
+    if manifest['version'] != version:
+        raise ValueError("the manifest was written by version " + str(manifest['version']) + " of the package")
+    if seed is not None and manifest['seed'] != seed:
+        raise ValueError("the manifest was written with the seed " + str(manifest['seed']))
+    changed = sorted(key for key in set(configuration) | set(manifest['configuration'])
+                     if configuration.get(key) != manifest['configuration'].get(key))
+    if changed:
+        raise ValueError("the manifest was written with other parameters: " + ", ".join(changed))
+
+
+def record_log(manifest, i, log_seed, row, files, directory, profile=None):
+    """ Recording of a finished event log in the manifest
+
+    :param manifest: manifest
+    :param i: index of the event log
+    :param log_seed: seed of the event log
+    :param row: row of the event log for the gold standard CSV file
+    :param files: names of the output files of the event log
+    :param directory: directory of the output files
+    :param profile: list of the stage records of the event log (see LogProfile.to_list) or None
+    """
+    manifest['logs'][str(i)] = {'seed': log_seed, 'row': ["" if value is None else str(value) for value in row],
+                                'files': {name: hash_file(os.path.join(directory, name)) for name in files},
+                                'profile': profile}
+
+
+def get_finished_logs(manifest, directory, num_logs):
+    """ Indices of the event logs of a manifest whose output files exist unchanged
+
+    Event logs with a missing or changed file are removed from the manifest.
+
+    :param manifest: manifest
+    :param directory: directory of the output files
+    :param num_logs: number of event logs of the collection
+    :return: set of indices
+    """
+    finished = set()
+    for key, entry in list(manifest['logs'].items()):
+        if int(key) >= num_logs:
+            continue
+        if all(os.path.exists(os.path.join(directory, name)) and hash_file(os.path.join(directory, name)) == digest
+               for name, digest in entry['files'].items()):
+            finished.add(int(key))
+        else:
+            del manifest['logs'][key]
+    return finished
@@ -0,0 +1,470 @@
+import datetime
+
+import numpy
+from pm4py.objects.log.obj import EventLog, Trace, Event
+
+from conceptdrift.source.random_streams import get_generator
+
+""" COLUMNAR EVENT LOGS """
+
+
+class ColumnarLog:
+    """ Event log stored column by column
+
+    The events of trace i are the events offsets[i] to offsets[i + 1] - 1. Every event has an activity code that
+    indexes labels, and after adding durations a timestamp (datetime64[s]) and a duration in seconds. Logs coming
+    directly from the playout have no timestamps and durations yet (None). The traces are named by their position.
+
+    :param offsets: array with the offsets of the traces (length number of traces + 1)
+    :param activities: array with the activity code of every event
+    :param labels: list of activity labels indexed by the activity codes
+    :param timestamps: array with the timestamp of every event or None
+    :param durations: array with the duration of every event in seconds or None
+    :param attributes: log attributes (e.g. drift info)
+    """
+    __slots__ = ('offsets', 'activities', 'labels', 'timestamps', 'durations', 'attributes')
+
+    def __init__(self, offsets, activities, labels, timestamps=None, durations=None, attributes=None):
+        self.offsets = offsets
+        self.activities = activities
+        self.labels = labels
+        self.timestamps = timestamps
+        self.durations = durations
+        self.attributes = {} if attributes is None else attributes
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield CompactTrace(self, i)
+
+    def __getitem__(self, i):
+        if i < 0:
+            i = i + len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError("trace index out of range")
+        return CompactTrace(self, i)
+
+    def num_events(self):
+        return int(self.offsets[-1])
+
+    def trace_lengths(self):
+        return numpy.diff(self.offsets)
+
+
+class CompactTrace:
+    """ Trace of a columnar log, read like a pm4py trace without creating pm4py objects
+
+    A compact trace only holds the log and its position, its events are compact events (see CompactEvent) that read
+    their attributes from the columns of the log. Iterating a columnar log yields compact traces, so code written for
+    event logs can read a columnar log without converting it.
+
+    :param log: columnar log
+    :param index: index of the trace
+    """
+    __slots__ = ('log', 'index')
+
+    def __init__(self, log, index):
+        self.log = log
+        self.index = index
+
+    @property
+    def attributes(self):
+        return {'concept:name': str(self.index)}
+
+    def __len__(self):
+        return int(self.log.offsets[self.index + 1] - self.log.offsets[self.index])
+
+    def __iter__(self):
+        for position in range(int(self.log.offsets[self.index]), int(self.log.offsets[self.index + 1])):
+            yield CompactEvent(self.log, position)
+
+    def __getitem__(self, k):
+        if k < 0:
+            k = k + len(self)
+        if k < 0 or k >= len(self):
+            raise IndexError("event index out of range")
+        return CompactEvent(self.log, int(self.log.offsets[self.index]) + k)
+
+
+class CompactEvent:
+    """ Event of a columnar log, read like a pm4py event (concept:name, time:timestamp and duration:seconds)
+
+    :param log: columnar log
+    :param position: position of the event in the columns of the log
+    """
+    __slots__ = ('log', 'position')
+
+    def __init__(self, log, position):
+        self.log = log
+        self.position = position
+
+    def keys(self):
+        keys = ['concept:name', 'time:timestamp']
+        if self.log.durations is not None:
+            keys.append('duration:seconds')
+        return keys
+
+    def __contains__(self, key):
+        return key in self.keys()
+
+    def __getitem__(self, key):
+        if key == 'concept:name':
+            return self.log.labels[self.log.activities[self.position]]
+        elif key == 'time:timestamp':
+            return get_event_timestamps(self.log, self.position, self.position + 1)[0]
+        elif key == 'duration:seconds' and self.log.durations is not None:
+            return int(self.log.durations[self.position])
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+
+def get_offsets(trace_lengths):
+    """ Offsets of traces with the given lengths
+
+    :param trace_lengths: array with the number of events of every trace
+    :return: array with the offsets of the traces
+    """
+    offsets = numpy.zeros(len(trace_lengths) + 1, dtype=numpy.int64)
+    numpy.cumsum(trace_lengths, out=offsets[1:])
+    return offsets
+
+
+def gather_segments(offsets, indices):
+    """ Gathering of the segments (e.g. traces) with the given indices from segments stored one after another
+
+    :param offsets: array with the offsets of the segments
+    :param indices: array with the indices of the segments to be gathered
+    :return: offsets of the gathered segments and array with the positions of their elements in the original storage
+    """
+    indices = numpy.asarray(indices, dtype=numpy.int64)
+    lengths = offsets[indices + 1] - offsets[indices]
+    new_offsets = get_offsets(lengths)
+    positions = numpy.arange(new_offsets[-1], dtype=numpy.int64) + numpy.repeat(offsets[indices] - new_offsets[:-1],
+                                                                                lengths)
+    return new_offsets, positions
+
+
+def take_traces(log, indices):
+    """ Columnar log consisting of the traces with the given indices
+
+    :param log: columnar log
+    :param indices: array with the indices of the traces
+    :return: columnar log
+    """
+    offsets, positions = gather_segments(log.offsets, indices)
+    return ColumnarLog(offsets, log.activities[positions], log.labels,
+                       None if log.timestamps is None else log.timestamps[positions],
+                       None if log.durations is None else log.durations[positions])
+
+
+def get_traces(log, start, stop):
+    """ Columnar log consisting of the traces start to stop - 1
+
+    The events of consecutive traces are stored one after another, so the columns of the result are views on the
+    columns of the log (only the offsets are computed).
+
+    :param log: columnar log
+    :param start: index of the first trace
+    :param stop: index after the last trace
+    :return: columnar log
+    """
+    start = min(max(start, 0), len(log))
+    stop = min(max(stop, start), len(log))
+    first = int(log.offsets[start])
+    last = int(log.offsets[stop])
+    return ColumnarLog(log.offsets[start:stop + 1] - first, log.activities[first:last], log.labels,
+                       None if log.timestamps is None else log.timestamps[first:last],
+                       None if log.durations is None else log.durations[first:last])
+
+
+def combine_columnar_logs(logs):
+    """ Merging of columnar logs
+
+    The activity codes are mapped onto a common label dictionary. Timestamps and durations are only kept if all logs
+    have them.
+
+    :param logs: list of columnar logs
+    :return: combined columnar log
+    """
+    labels = list(logs[0].labels)
+    label_index = {label: i for i, label in enumerate(labels)}
+    activities = []
+    for log in logs:
+        if log.labels is logs[0].labels:
+            activities.append(log.activities)
+        else:
+            mapping = numpy.array([label_index.setdefault(label, len(label_index)) for label in log.labels],
+                                  dtype=numpy.int32)
+            activities.append(mapping[log.activities] if len(mapping) > 0 else log.activities)
+    labels = list(label_index)
+    lengths = numpy.concatenate([log.trace_lengths() for log in logs])
+    timestamps = None
+    durations = None
+    if all(log.timestamps is not None for log in logs):
+        timestamps = numpy.concatenate([log.timestamps for log in logs])
+    if all(log.durations is not None for log in logs):
+        durations = numpy.concatenate([log.durations for log in logs])
+    return ColumnarLog(get_offsets(lengths), numpy.concatenate(activities).astype(numpy.int32), labels, timestamps,
+                       durations)
+
+
+def generate_several_parts_of_columnar_log(log, number):
+    """ Generating several columnar logs from one (like generate_several_parts_of_event_log)
+
+    :param log: columnar log
+    :param number: number of generated logs
+    :return: list of columnar logs
+    """
+    nu_traces_per_log = int(round(len(log) / number + 0.0001))
+    logs = []
+    start = 0
+    for _ in range(number - 1):
+        logs.append(get_traces(log, start, start + nu_traces_per_log))
+        start = min(start + nu_traces_per_log, len(log))
+    logs.append(get_traces(log, start, len(log)))
+    return logs
+
+
+def replace_traces_of_columnar_log(main_log, log_two, start_point):
+    """ Replacing traces with new traces (like replace_traces_of_log)
+
+    :param main_log: columnar log
+    :param log_two: columnar log with new traces
+    :param start_point: starting point of traces replacement
+    :return: columnar log
+    """
+    start = min(int(round(len(main_log) * start_point + 0.0001)), len(main_log))
+    indices = numpy.concatenate((numpy.arange(start), len(main_log) + numpy.arange(len(log_two)),
+                                 numpy.arange(start + len(log_two), len(main_log))))
+    return take_traces(combine_columnar_logs([main_log, log_two]), indices)
+
+
+def include_noise_in_columnar_log(log_total, log_noise, start_noise, end_noise, rng=None):
+    """ Introduction of noise in a columnar log (like include_noise_in_log)
+
+    :param log_total: columnar log
+    :param log_noise: columnar log containing all noise traces
+    :param start_noise: Starting point of noise
+    :param end_noise: Ending point of noise
+    :param rng: numpy.random.Generator or seed for the positions of the noise traces
+    :return: columnar log with noise
+    """
+    start = int(round((len(log_total) * start_noise) + 0.0001))
+    stop = int(round((len(log_total) * end_noise) + 0.0001))
+    positions = start + get_noise_positions(stop - start, len(log_noise), rng)
+    return replace_traces_at_positions(log_total, log_noise, positions)
+
+
+def replace_traces_at_positions(log, log_new, positions):
+    """ Replacing the traces at the given positions by the first traces of another log
+
+    :param log: columnar log
+    :param log_new: columnar log with at least as many traces as positions
+    :param positions: array with the positions of the replaced traces
+    :return: columnar log
+    """
+    indices = numpy.arange(len(log))
+    indices[positions] = len(log) + numpy.arange(len(positions))
+    return take_traces(combine_columnar_logs([log, log_new]), indices)
+
+
+def get_noise_positions(nu_slots, nu_noise, rng=None):
+    """ Position plan for the noise traces in the noise sector of an event log
+
+    The sector is divided into nu_noise blocks of (almost) equal size and every block receives one noise trace at a
+    random position, so that the noise traces are spread evenly over the sector.
+
+    :param nu_slots: number of traces in the noise sector
+    :param nu_noise: number of noise traces
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: sorted array with the positions of the noise traces relative to the start of the sector
+    """
+    nu_noise = min(nu_noise, max(nu_slots, 0))
+    if nu_noise == 0:
+        return numpy.zeros(0, dtype=numpy.int64)
+    bounds = numpy.linspace(0, nu_slots, nu_noise + 1).astype(numpy.int64)
+    sizes = numpy.diff(bounds)
+    return bounds[:-1] + (get_generator(rng).random(nu_noise) * sizes).astype(numpy.int64)
+
+
+def add_duration_to_columnar_log(log, datestamp, min_duration, max_duration, rng=None):
+    """ Adding duration to the activities in the columnar log (like add_duration_to_log)
+
+    :param log: columnar log
+    :param datestamp: starting time of the first trace
+    :param min_duration: minimum for the duration of one activity in seconds
+    :param max_duration: maximum for the duration of one activity in seconds
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    """
+    durations, seconds = draw_durations_and_times(log.activities, log.trace_lengths(), len(log.labels),
+                                                  min_duration, max_duration, rng)
+    log.durations = durations
+    log.timestamps = numpy.datetime64(datestamp.replace(tzinfo=None), 's') + seconds.astype('timedelta64[s]')
+
+
+def draw_durations_and_times(activities, trace_lengths, nu_activities, min_duration, max_duration, rng=None):
+    """ Drawing of the durations and start times of all events of an event log at once
+
+    Every activity gets a mean duration between min_duration and max_duration at its first occurrence, which is also
+    the duration of this first event; all later events of the activity get an exponentially distributed duration with
+    this mean. Within a trace, the events start one after another with the mean durations of the previous events. A
+    trace starts a random time between min_duration and the duration of the previous non-empty trace after the start
+    of that trace.
+
+    :param activities: array with the activity code (0 to nu_activities - 1) of every event in log order
+    :param trace_lengths: array with the number of events of every trace
+    :param nu_activities: number of different activities
+    :param min_duration: minimum for the duration of one activity in seconds
+    :param max_duration: maximum for the duration of one activity in seconds
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: array with the duration of every event and array with its start in seconds after the start of the log
+    """
+    rng = get_generator(rng)
+    nu_events = len(activities)
+    first_occurrence = numpy.full(nu_activities, nu_events, dtype=numpy.int64)
+    numpy.minimum.at(first_occurrence, activities, numpy.arange(nu_events))
+    means = numpy.zeros(nu_activities, dtype=numpy.int64)
+    means[numpy.argsort(first_occurrence, kind='stable')] = rng.integers(min_duration, max_duration + 1,
+                                                                        size=nu_activities)
+    event_means = means[activities]
+    durations = rng.exponential(event_means).astype(numpy.int64)
+    durations[first_occurrence[first_occurrence < nu_events]] = means[first_occurrence < nu_events]
+    # start of every event within its trace: sum of the mean durations of the previous events of the trace
+    ends = numpy.cumsum(trace_lengths)
+    starts = ends - trace_lengths
+    total_means = numpy.concatenate(([0], numpy.cumsum(event_means)))
+    trace_of_event = numpy.repeat(numpy.arange(len(trace_lengths)), trace_lengths)
+    offsets = total_means[:-1] - total_means[starts][trace_of_event]
+    # start of every non-empty trace, chained over the durations of the previous non-empty traces
+    full = numpy.flatnonzero(trace_lengths > 0)
+    last = ends[full] - 1
+    trace_durations = offsets[last] + durations[last]
+    previous = trace_durations[:-1]
+    gaps = rng.integers(numpy.minimum(previous, min_duration), numpy.maximum(previous, min_duration) + 1)
+    trace_starts = numpy.zeros(len(trace_lengths), dtype=numpy.int64)
+    trace_starts[full[1:]] = numpy.cumsum(gaps)
+    return durations, trace_starts[trace_of_event] + offsets
+
+
+def get_timestamp_columnar_log(log, nu_traces, part):
+    """ Getting the timestamp of a specific trace (like get_timestamp_log)
+
+    :param log: columnar log
+    :param nu_traces: Amount of traces in the log
+    :param part: place of trace as a proportion of the total traces
+    :return: timestamp of specific trace
+    """
+    if part == 0:
+        nu_trace = 0
+    elif part == 1:
+        nu_trace = nu_traces - 1
+    else:
+        nu_trace = int(round(nu_traces * part + 0.0001))
+    first = int(log.offsets[nu_trace])
+    if first == log.offsets[nu_trace + 1]:
+        return "empty trace"
+    return get_event_timestamps(log, first, first + 1)[0]
+
+
+def get_event_timestamps(log, start, stop):
+    """ Timestamps of the events start to stop - 1 as datetime objects
+
+    Logs without timestamps get the consecutive timestamps of the playout of pm4py.
+
+    :param log: columnar log
+    :param start: index of the first event
+    :param stop: index after the last event
+    :return: list of datetime objects
+    """
+    if log.timestamps is None:
+        return [datetime.datetime.fromtimestamp(10000000 + k) for k in range(start, stop)]
+    return log.timestamps[start:stop].astype('datetime64[s]').tolist()
+
+
+def convert_event_log_to_columnar(log):
+    """ Conversion of an event log into a columnar log
+
+    :param log: event log
+    :return: columnar log
+    """
+    events = [event for trace in log for event in trace]
+    label_index = {}
+    activities = numpy.array([label_index.setdefault(event['concept:name'], len(label_index)) for event in events],
+                             dtype=numpy.int32)
+    offsets = get_offsets(numpy.array([len(trace) for trace in log], dtype=numpy.int64))
+    timestamps = None
+    durations = None
+    if all('time:timestamp' in event for event in events):
+        timestamps = numpy.array([event['time:timestamp'].replace(tzinfo=None) for event in events],
+                                 dtype='datetime64[s]')
+    if all('duration:seconds' in event for event in events):
+        durations = numpy.array([event['duration:seconds'] for event in events], dtype=numpy.int64)
+    return ColumnarLog(offsets, activities, list(label_index), timestamps, durations, dict(log.attributes))
+
+
+def convert_columnar_to_event_log(log):
+    """ Conversion of a columnar log into an event log
+
+    :param log: columnar log
+    :return: event log
+    """
+    event_log = EventLog(attributes=dict(log.attributes))
+    labels = log.labels
+    names = [labels[code] for code in log.activities.tolist()]
+    timestamps = get_event_timestamps(log, 0, log.num_events())
+    durations = None if log.durations is None else log.durations.tolist()
+    offsets = log.offsets.tolist()
+    for i in range(len(log)):
+        trace = Trace()
+        trace.attributes['concept:name'] = str(i)
+        for k in range(offsets[i], offsets[i + 1]):
+            event = Event({'concept:name': names[k], 'time:timestamp': timestamps[k]})
+            if durations is not None:
+                event['duration:seconds'] = durations[k]
+            trace.append(event)
+        event_log.append(trace)
+    return event_log
+
+
+def convert_columnar_to_dataframe(log):
+    """ Conversion of a columnar log into a pandas DataFrame with one row per event
+
+    The log attributes are kept in the attrs of the DataFrame.
+
+    :param log: columnar log
+    :return: DataFrame with the columns case:concept:name, concept:name, time:timestamp (and duration:seconds)
+    """
+    import pandas
+
+    columns = {'case:concept:name': numpy.repeat(numpy.arange(len(log)).astype(str), log.trace_lengths()),
+               'concept:name': pandas.Categorical.from_codes(log.activities, log.labels)}
+    if log.timestamps is None:
+        columns['time:timestamp'] = get_event_timestamps(log, 0, log.num_events())
+    else:
+        columns['time:timestamp'] = log.timestamps
+    if log.durations is not None:
+        columns['duration:seconds'] = log.durations
+    dataframe = pandas.DataFrame(columns)
+    dataframe.attrs.update(log.attributes)
+    return dataframe
+
+
+def convert_columnar_log(log, output='event_log'):
+    """ Conversion of a columnar log into the requested type of log
+
+    :param log: columnar log
+    :param output: type of the log ('event_log', 'columnar' or 'dataframe')
+    :return: log of the requested type
+    """
+    if output == 'event_log':
+        return convert_columnar_to_event_log(log)
+    elif output == 'columnar':
+        return log
+    elif output == 'dataframe':
+        return convert_columnar_to_dataframe(log)
+    else:
+        raise ValueError("unknown output type '" + str(output) + "'")
@@ -1,138 +1,114 @@
-import datetime
-import itertools
-from random import randint
 import numpy
 
 from pm4py.objects.log.obj import EventLog
 
+from conceptdrift.source.columnar_log import ColumnarLog, get_traces, \
+    generate_several_parts_of_columnar_log, add_duration_to_columnar_log, draw_durations_and_times, \
+    get_timestamp_columnar_log, replace_traces_of_columnar_log, include_noise_in_columnar_log, get_noise_positions
+from conceptdrift.source.log_views import ChainedLog, LogView, materialize_columnar
+
 
 def combine_two_logs(log_one, log_two):
     """ Merging of two event logs
 
-    :param log_one: first event log
-    :param log_two: second event log
-    :return: combined event log
+    To combine many logs without copying their traces every time, chain them by reference with ChainedLog instead.
+
+    :param log_one: first event log (or columnar log or view)
+    :param log_two: second event log (or columnar log or view)
+    :return: combined event log (columnar log if both logs are columnar)
     """
-    log_combined = EventLog()
-    for line in log_one:
-        log_combined.append(line)
-    for line in log_two:
-        log_combined.append(line)
-    return log_combined
+    return ChainedLog([log_one, log_two]).materialize()
 
 
 def generate_two_parts_of_event_log(log, nu_trace):
     """ Generating two event logs from one
 
-    :param log: event log
+    :param log: event log (or columnar log or view)
     :param nu_trace: number of trace, by which the event log should be divided
-    :return: the two separate event logs
+    :return: the two separate event logs (columnar logs sharing the columns for a columnar log)
     """
-    i = 0
-    log_one = EventLog()
-    log_two = EventLog()
-    for trace in log:
-        if i < nu_trace:
-            i = i + 1
-            log_one.append(trace)
-        else:
-            log_two.append(trace)
-    return log_one, log_two
+    log = materialize_columnar(log)
+    if isinstance(log, ColumnarLog):
+        return get_traces(log, 0, nu_trace), get_traces(log, nu_trace, len(log))
+    return LogView(log, 0, nu_trace).materialize(), LogView(log, nu_trace, len(log)).materialize()
 
 
 def generate_several_parts_of_event_log(log, number):
     """ Generating several event logs from one
 
-    :param log: event log
+    :param log: event log (or columnar log or view)
     :param number: number of generated event logs
-    :return: list of event logs
+    :return: list of event logs (columnar logs sharing the columns for a columnar log)
     """
-    nu_traces_first_log = length_of_log(log)
-    nu_traces_per_log = int(round(nu_traces_first_log / number + 0.0001))
+    log = materialize_columnar(log)
+    if isinstance(log, ColumnarLog):
+        return generate_several_parts_of_columnar_log(log, number)
+    nu_traces_per_log = int(round(length_of_log(log) / number + 0.0001))
     logs = []
-    count = 1
-    log_two = log
-    while count < number:
-        log_one, log_two = generate_two_parts_of_event_log(log_two, nu_traces_per_log)
-        logs.append(log_one)
-        count = count + 1
-    logs.append(log_two)
+    start = 0
+    for _ in range(number - 1):
+        logs.append(LogView(log, start, start + nu_traces_per_log).materialize())
+        start = min(start + nu_traces_per_log, length_of_log(log))
+    logs.append(LogView(log, start, length_of_log(log)).materialize())
     return logs
 
 
-def add_duration_to_log(log, datestamp, min_duration, max_duration):
+def add_duration_to_log(log, datestamp, min_duration, max_duration, rng=None):
     """ Adding duration to the activities in the event log
 
     :param max_duration: minimum for the duration of one activity in seconds
     :param min_duration: maximum for the duration of one activity in seconds
     :param datestamp: starting time of the first trace
-    :param log: event log
+    :param log: event log (or columnar log)
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
     :return: realistic event log
     """
-    duration = {}
-    time_first = datestamp
-    for trace in log:
-        if trace.__len__() != 0:
-            z = trace.__getitem__(0)
-            z['time:timestamp'] = time_first
-            break
-    first_of_first = True
-    duration_last_trace = 0
-    for trace in log:
-        j = 1
-        time = 0
-        if trace.__len__() != 0:
-            if first_of_first:
-                first_of_first = False
-                first = trace.__getitem__(0)
-            else:
-                first = trace.__getitem__(0)
-                if duration_last_trace > min_duration:
-                    time_one = randint(min_duration, duration_last_trace)
-                else:
-                    time_one = randint(duration_last_trace, min_duration)
-                first['time:timestamp'] = time_first + datetime.timedelta(0, time_one)
-                time_first = first['time:timestamp']
-            if first['concept:name'] in duration.keys():
-                first['duration:seconds'] = int(numpy.random.exponential(duration[first['concept:name']]))
-                time = duration[first['concept:name']]
-            else:
-                i = randint(min_duration, max_duration)
-                duration[first['concept:name']] = i
-                first['duration:seconds'] = i
-                time = i
-        while j < trace.__len__():
-            a = trace.__getitem__(j)
-            if a['concept:name'] in duration.keys():
-                a['duration:seconds'] = int(numpy.random.exponential(duration[a['concept:name']]))
-                a['time:timestamp'] = time_first + datetime.timedelta(0, time)
-                time = time + duration[a['concept:name']]
-            else:
-                i = randint(min_duration, max_duration)
-                duration[a['concept:name']] = i
-                a['duration:seconds'] = i
-                a['time:timestamp'] = time_first + datetime.timedelta(0, time)
-                time = time + i
-            j = j + 1
-        if trace.__len__() != 0:
-            tr_first = trace.__getitem__(0)
-            tr_last = trace.__getitem__(trace.__len__()-1)
-            dur = tr_last['time:timestamp'] - tr_first['time:timestamp']
-            duration_last_trace = int(dur.total_seconds() + tr_last['duration:seconds'])
+    log = materialize_columnar(log)
+    if isinstance(log, ColumnarLog):
+        add_duration_to_columnar_log(log, datestamp, min_duration, max_duration, rng)
+        return
+    events = [event for trace in log for event in trace]
+    trace_lengths = numpy.array([len(trace) for trace in log], dtype=numpy.int64)
+    activity_index = {}
+    activities = numpy.array([activity_index.setdefault(event['concept:name'], len(activity_index))
+                              for event in events], dtype=numpy.int64)
+    durations, seconds = draw_durations_and_times(activities, trace_lengths, len(activity_index), min_duration,
+                                                  max_duration, rng)
+    timestamps = get_datetimes(datestamp, seconds)
+    for event, timestamp, duration in zip(events, timestamps, durations.tolist()):
+        event['time:timestamp'] = timestamp
+        event['duration:seconds'] = duration
     count = 0
     for trace in log:
         trace._set_attributes({'concept:name': str(count)})
         count = 1 + count
 
 
+def get_datetimes(datestamp, seconds):
+    """ Conversion of seconds after a datestamp into datetime objects
+
+    :param datestamp: starting time
+    :param seconds: array of seconds after the starting time
+    :return: list of datetime objects
+    """
+    start = numpy.datetime64(datestamp.replace(tzinfo=None), 'us')
+    datetimes = (start + seconds.astype('timedelta64[s]')).tolist()
+    if datestamp.tzinfo is not None:
+        datetimes = [timestamp.replace(tzinfo=datestamp.tzinfo) for timestamp in datetimes]
+    return datetimes
+
+
 def get_timestamp_log(log, nu_traces, part):
     """ Getting the timestamp of a specific trace
 
-    :param log: event log
+    :param log: event log (or columnar log)
     :param nu_traces: Amount of traces in the event log
     :param part: place of trace as a proportion of the total traces
     :return: timestamp of specific trace
     """
+    log = materialize_columnar(log)
+    if isinstance(log, ColumnarLog):
+        return get_timestamp_columnar_log(log, nu_traces, part)
     if part == 0:
         nu_trace = 0
     elif part == 1:
@@ -149,163 +125,56 @@ def get_timestamp_log(log, nu_traces, part):
 def replace_traces_of_log(main_log, log_two, start_point):
     """ Replacing traces with new traces
 
-    :param main_log: resulting event log
+    :param main_log: resulting event log (or columnar log or view)
     :param log_two: event log with new traces
     :param start_point: starting point of traces replacement
-    :return: event log
+    :return: event log (columnar log if both logs are columnar)
     """
-    result_log = EventLog()
+    main_log = materialize_columnar(main_log)
+    log_two = materialize_columnar(log_two)
+    if isinstance(main_log, ColumnarLog):
+        return replace_traces_of_columnar_log(main_log, log_two, start_point)
     start = int(round(length_of_log(main_log) * start_point + 0.0001))
-    j = 0
-    for trace in main_log:
-        if j < start:
-            result_log.append(trace)
-            j = j + 1
-        else:
-            break
-    for trace in log_two:
-        result_log.append(trace)
-        j = j + 1
-    i = 0
-    for trace in main_log:
-        if i == j:
-            result_log.append(trace)
-            i = i + 1
-            j = j + 1
-        else:
-            i = i + 1
-    return result_log
+    return ChainedLog([LogView(main_log, 0, start), log_two,
+                       LogView(main_log, start + length_of_log(log_two), length_of_log(main_log))]).materialize()
 
 
 def get_part_of_log(log, proportion):
     """ Getting part of a event log
 
-    :param log: event log
+    :param log: event log (or columnar log or view)
     :param proportion: proportion of total traces where the part starts
-    :return: event log
+    :return: event log (columnar log sharing the columns for a columnar log)
     """
-    result = EventLog()
-    end = int(round(length_of_log(log) * proportion + 0.0001))
-    i = 0
-    for trace in log:
-        if i < end:
-            result.append(trace)
-            i = i + 1
-        else:
-            break
-    return result
+    log = materialize_columnar(log)
+    if isinstance(log, ColumnarLog):
+        return get_traces(log, 0, int(round(len(log) * proportion + 0.0001)))
+    return LogView(log, 0, int(round(length_of_log(log) * proportion + 0.0001))).materialize()
 
 
-def include_noise_in_log(log_total, log_noise, start_noise, end_noise):
+def include_noise_in_log(log_total, log_noise, start_noise, end_noise, rng=None):
     """ Introduction of noise in an event log
 
-    :param log_total: event log
+    :param log_total: event log (or columnar log)
     :param log_noise: event log containing all noise traces
     :param start_noise: Starting point of noise
     :param end_noise: Ending point of noise
+    :param rng: numpy.random.Generator or seed for the positions of the noise traces
     :return: event log with noise
     """
-    log_result_with_noise = EventLog()
+    log_total = materialize_columnar(log_total)
+    log_noise = materialize_columnar(log_noise)
+    if isinstance(log_total, ColumnarLog):
+        return include_noise_in_columnar_log(log_total, log_noise, start_noise, end_noise, rng)
     start = int(round((length_of_log(log_total) * start_noise) + 0.0001))
     stop = int(round((length_of_log(log_total) * end_noise) + 0.0001))
-    amount_noise = length_of_log(log_noise)
-    amount_not_noise = int(round(
-        ((length_of_log(log_total) * end_noise) - (length_of_log(log_total) * start_noise) - amount_noise) + 0.0001))
-    i = 0
-    a = 0
-    log_result_with_noise = EventLog(itertools.chain(log_result_with_noise, log_total[:start]))
-    j = start
-    norm = int(round((amount_not_noise / amount_noise) + 0.0001))
-    rest = norm - (amount_not_noise / amount_noise)
-    if rest <= 0:
-        rest_adding = int(round((rest * amount_noise*(-1))+0.0001))
-        while j < stop:
-            norm_start = randint(0, norm)
-            norm_end = norm - norm_start
-            add = randint(0, 1)
-            if a < rest_adding and add == 1:
-                log_result_with_noise = EventLog(itertools.chain(log_result_with_noise, log_total[j:j+norm_start+1]))
-                j = j + norm_start + 1
-                a = a + 1
-            else:
-                log_result_with_noise = EventLog(itertools.chain(log_result_with_noise, log_total[j:j+norm_start]))
-                j = j + norm_start
-            k = 0
-            for trace in log_noise:
-                if k == i:
-                    log_result_with_noise.append(trace)
-                    j = j + 1
-                    i = i + 1
-                    break
-                else:
-                    k = k + 1
-            m = 0
-            n = 0
-            for trace in log_total:
-                if m < norm_end and n == j and j < stop:
-                    log_result_with_noise.append(trace)
-                    j = j + 1
-                    n = n + 1
-                    m = m + 1
-                elif n == j and j < stop and a < rest_adding and add == 0:
-                    log_result_with_noise.append(trace)
-                    a = a + 1
-                    j = j + 1
-                    n = n + 1
-                elif n > j:
-                    break
-                else:
-                    n = n + 1
-    else:
-        rest_adding = int(round(amount_noise - (amount_not_noise/norm)+0.0001))
-        while j < stop:
-            norm_start = randint(0, norm)
-            norm_end = norm - norm_start
-            m = 0
-            n = 0
-            for trace in log_total:
-                if m < norm_start and n == j and j < (stop - 1):
-                    log_result_with_noise.append(trace)
-                    j = j + 1
-                    n = n + 1
-                    m = m + 1
-                elif n > j:
-                    break
-                else:
-                    n = n + 1
-            k = 0
-            for trace in log_noise:
-                if k == i:
-                    log_result_with_noise.append(trace)
-                    j = j + 1
-                    i = i + 1
-                    break
-                else:
-                    k = k + 1
-            m = 0
-            n = 0
-            for trace in log_total:
-                if m < norm_end and n == j and j < stop:
-                    log_result_with_noise.append(trace)
-                    j = j + 1
-                    n = n + 1
-                    m = m + 1
-                elif n > j:
-                    break
-                else:
-                    n = n + 1
-            k = 0
-            for trace in log_noise:
-                if k == i and a < rest_adding:
-                    log_result_with_noise.append(trace)
-                    j = j + 1
-                    i = i + 1
-                    a = a + 1
-                    break
-                else:
-                    k = k + 1
+    is_noise = numpy.zeros(length_of_log(log_total), dtype=bool)
+    is_noise[start + get_noise_positions(stop - start, length_of_log(log_noise), rng)] = True
+    log_result_with_noise = EventLog()
+    noise_traces = iter(log_noise)
+    for trace, noise in zip(log_total, is_noise.tolist()):
+        log_result_with_noise.append(next(noise_traces) if noise else trace)
     count = 0
-    log_result_with_noise = EventLog(itertools.chain(log_result_with_noise, log_total[stop:]))
     for trace in log_result_with_noise:
         trace._set_attributes({'concept:name': str(count)})
         count = 1 + count
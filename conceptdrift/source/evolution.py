@@ -1,146 +1,187 @@
-from random import randint
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 import numpy as nmp
 
-from conceptdrift.source.process_tree_controller import count_real_acs, randomize_tree_one, randomize_tree_two, \
-    randomize_tree_three, randomize_tree_more
+from conceptdrift.source.frozen_tree import freeze_tree, thaw_tree, copy_process_tree
+from conceptdrift.source.process_tree_controller import randomize_tree_one, randomize_tree_two, \
+    randomize_tree_three, randomize_tree_more, copy_leaf, choose_candidate
+from conceptdrift.source.random_streams import get_generator, spawn_generators, draw_integer
+from conceptdrift.source.tree_index import ProcessTreeIndex, get_tree_index
 
+MAX_ATTEMPTS = 20
 
-def evolve_tree_randomly(tree, change_proportion=0.2):
+
+def evolve_tree_randomly(tree, change_proportion=0.2, index=None, journal=None, record=None, rng=None):
     """ Random change of the process tree
 
     :param tree: process tree version to be changed
     :param change_proportion: proportion of total number of activities to be affected by the changes
+    :param index: index of the tree (built if None)
+    :param journal: list to which a change record is appended for every change (see replay_journal)
+    :param record: stage record (see profiling) to which the number of failed change attempts is added
+    :param rng: numpy.random.Generator or seed for all random decisions (see random_streams.get_generator)
     :return: randomly evolved process tree version
     """
-    acs = count_real_acs(tree._get_leaves())
-    changed_acs = []
+    index = get_tree_index(tree, index)
+    rng = get_generator(rng)
+    if journal is None:
+        journal = []
+    acs = index.get_real_acs(tree)
     rounds = int(round(acs * change_proportion + 0.001))
     if rounds == 0:
         rounds = int(nmp.ceil(acs * change_proportion))
-    i = 0
-    count = 1
-    happen = "Control-flow changes: "
-    while i < rounds:
-        happen_be = ""
-        ran = randint(1, rounds - i)
-        if i == 1:
-            ran = randint(1, rounds - i)
-        if ran == 1:
-            happen_be, worked, count = randomize_tree_one(tree, happen_be, changed_acs, count)
-            while not worked:
-                happen_be, worked, count = randomize_tree_one(tree, happen_be, changed_acs, count)
-        elif ran == 2:
-            happen_be, worked, count = randomize_tree_two(tree, happen_be, changed_acs, count)
-            while not worked:
-                happen_be, worked, count = randomize_tree_two(tree, happen_be, changed_acs, count)
-        elif ran == 3:
-            happen_be, worked, count = randomize_tree_three(tree, happen_be, ran, changed_acs, count)
-            while not worked:
-                ran = randint(1, rounds - i)
-                if ran == 1:
-                    ran = randint(1, rounds - i)
-                if ran == 1:
-                    happen_be, worked, count = randomize_tree_one(tree, happen_be, changed_acs, count)
-                elif ran == 2:
-                    happen_be, worked, count = randomize_tree_two(tree, happen_be, changed_acs, count)
-                else:
-                    happen_be, worked, count = randomize_tree_three(tree, happen_be, ran, changed_acs, count)
-        else:
-            happen_be, worked, count = randomize_tree_more(tree, happen_be, ran, changed_acs, count)
-            while not worked:
-                ran = randint(1, rounds - i)
-                if ran == 1:
-                    ran = randint(1, rounds - i)
-                if ran == 1:
-                    happen_be, worked, count = randomize_tree_one(tree, happen_be, changed_acs, count)
-                elif ran == 2:
-                    happen_be, worked, count = randomize_tree_two(tree, happen_be, changed_acs, count)
-                elif ran == 3:
-                    happen_be, worked, count = randomize_tree_three(tree, happen_be, ran, changed_acs, count)
-                else:
-                    happen_be, worked, count = randomize_tree_more(tree, happen_be, ran, changed_acs, count)
-        happen_spl = happen_be.split(";")
-        last = len(happen_spl)
-        happen = happen + happen_spl[last - 2] + "; "
-        i = i + ran
+    retries = change_tree_randomly(tree, rounds, index, journal, rng)
+    if record is not None:
+        record.add_retries(retries)
     return tree
 
 
-def evolve_tree_randomly_gs(drift_tree, evolution_stage):
+def evolve_tree_randomly_gs(drift_tree, evolution_stage, index=None, journal=None, record=None, rng=None):
     """ Random change of the process tree for gold standard
 
     :param drift_tree: tree to be changed
     :param evolution_stage: proportion of total activities to be affected by the change
-    :return: randomly evolved process tree version
+    :param index: index of the tree (built if None)
+    :param journal: list to which a change record is appended for every change (see replay_journal)
+    :param record: stage record (see profiling) to which the number of failed change attempts is added
+    :param rng: numpy.random.Generator or seed for all random decisions (see random_streams.get_generator)
+    :return: randomly evolved process tree version, deleted activities, added activities and moved activities
     """
-    acs = count_real_acs(drift_tree._get_leaves())
-    changed_acs = []
+    index = get_tree_index(drift_tree, index)
+    rng = get_generator(rng)
+    if journal is None:
+        journal = []
+    acs = index.get_real_acs(drift_tree)
     added_acs = []
     deleted_acs = []
     moved_acs = []
+    recorded = len(journal)
     rounds = int(round(acs * evolution_stage + 0.001))
     if rounds == 0:
         rounds = int(nmp.ceil(acs * evolution_stage))
+    retries = change_tree_randomly(drift_tree, rounds, index, journal, rng)
+    for change in journal[recorded:]:
+        deleted_acs.extend(change.deleted)
+        added_acs.extend(change.added)
+        moved_acs.extend(change.moved)
+    if record is not None:
+        record.add_retries(retries)
+    return drift_tree, deleted_acs, added_acs, moved_acs
+
+
+def apply_random_change(tree, ran, changed_acs, count, index, journal, rng):
+    """ One random change of the process tree affecting ran activities
+
+    :return: whether the change worked and the next number of the random activities
+    """
+    if ran == 1:
+        return randomize_tree_one(tree, changed_acs, count, index, journal, rng)
+    elif ran == 2:
+        return randomize_tree_two(tree, changed_acs, count, index, journal, rng)
+    elif ran == 3:
+        return randomize_tree_three(tree, ran, changed_acs, count, index, journal, rng)
+    return randomize_tree_more(tree, ran, changed_acs, count, index, journal, rng)
+
+
+def redraw_change_size(rng, ran, remaining, failures):
+    """ Number of activities of the next attempt after a failed change
+
+    Changes of one or two activities are attempted again, larger ones are drawn again. A size that failed MAX_ATTEMPTS
+    times in the round counts as infeasible, and the size is drawn from the feasible ones instead.
+
+    :param rng: numpy.random.Generator
+    :param ran: number of activities of the failed change
+    :param remaining: number of activities still to be changed
+    :param failures: dictionary of the number of failed attempts per size in the round
+    :return: number of activities or None if no size is feasible
+    """
+    if ran > 2:
+        ran = draw_integer(rng, 1, remaining)
+        if ran == 1:
+            ran = draw_integer(rng, 1, remaining)
+    if failures.get(ran, 0) < MAX_ATTEMPTS:
+        return ran
+    return choose_candidate([size for size in range(1, remaining + 1) if failures.get(size, 0) < MAX_ATTEMPTS], rng)
+
+
+def change_tree_randomly(tree, rounds, index, journal, rng):
+    """ Random changes of the process tree until rounds activities are affected
+
+    If no change is feasible any more (e.g. all activities of a small tree are changed), the evolution stops early with
+    a warning.
+
+    :param tree: process tree to be changed
+    :param rounds: number of activities to be affected
+    :param index: index of the tree
+    :param journal: list to which a change record is appended for every change
+    :param rng: numpy.random.Generator
+    :return: number of failed change attempts
+    """
+    changed_acs = []
     i = 0
     count = 1
-    happen = ""
+    retries = 0
     while i < rounds:
-        happen_be = ""
-        ran = randint(1, rounds - i)
+        ran = draw_integer(rng, 1, rounds - i)
         if i == 1:
-            ran = randint(1, rounds - i)
-        if ran == 1:
-            happen_be, worked, count = randomize_tree_one(drift_tree, happen_be, changed_acs, count)
-            while not worked:
-                happen_be, worked, count = randomize_tree_one(drift_tree, happen_be, changed_acs, count)
-        elif ran == 2:
-            happen_be, worked, count = randomize_tree_two(drift_tree, happen_be, changed_acs, count)
-            while not worked:
-                happen_be, worked, count = randomize_tree_two(drift_tree, happen_be, changed_acs, count)
-        elif ran == 3:
-            happen_be, worked, count = randomize_tree_three(drift_tree, happen_be, ran, changed_acs, count)
-            while not worked:
-                ran = randint(1, rounds - i)
-                if ran == 1:
-                    ran = randint(1, rounds - i)
-                if ran == 1:
-                    happen_be, worked, count = randomize_tree_one(drift_tree, happen_be, changed_acs, count)
-                elif ran == 2:
-                    happen_be, worked, count = randomize_tree_two(drift_tree, happen_be, changed_acs, count)
-                else:
-                    happen_be, worked, count = randomize_tree_three(drift_tree, happen_be, ran, changed_acs, count)
-        else:
-            happen_be, worked, count = randomize_tree_more(drift_tree, happen_be, ran, changed_acs, count)
-            while not worked:
-                ran = randint(1, rounds - i)
-                if ran == 1:
-                    ran = randint(1, rounds - i)
-                if ran == 1:
-                    happen_be, worked, count = randomize_tree_one(drift_tree, happen_be, changed_acs, count)
-                elif ran == 2:
-                    happen_be, worked, count = randomize_tree_two(drift_tree, happen_be, changed_acs, count)
-                elif ran == 3:
-                    happen_be, worked, count = randomize_tree_three(drift_tree, happen_be, ran, changed_acs, count)
-                else:
-                    happen_be, worked, count = randomize_tree_more(drift_tree, happen_be, ran, changed_acs, count)
-        happen_spl = happen_be.split(";")
-        last = len(happen_spl)
-        happen = happen + happen_spl[last - 2] + "; "
+            ran = draw_integer(rng, 1, rounds - i)
+        failures = {}
+        worked, count = apply_random_change(tree, ran, changed_acs, count, index, journal, rng)
+        while not worked:
+            retries = retries + 1
+            failures[ran] = failures.get(ran, 0) + 1
+            ran = redraw_change_size(rng, ran, rounds - i, failures)
+            if ran is None:
+                warnings.warn("random evolution stopped after " + str(i) + " of " + str(rounds) +
+                              " activities, no further change is feasible")
+                return retries
+            worked, count = apply_random_change(tree, ran, changed_acs, count, index, journal, rng)
         i = i + ran
-        happen_ac = happen.split(';')
-        if happen_ac[len(happen_ac)-2].strip() == "activity replaced":
-            deleted_acs.append(changed_acs[len(changed_acs)-2])
-            added_acs.append(changed_acs[len(changed_acs)-1])
-        elif happen_ac[len(happen_ac)-2].strip() == "activity deleted":
-            deleted_acs.append(changed_acs[len(changed_acs)-1])
-        elif happen_ac[len(happen_ac)-2].strip() == "tree fragment deleted":
-            deleted_acs.extend(changed_acs[len(changed_acs)-ran:len(changed_acs)])
-        elif happen_ac[len(happen_ac)-2].strip() == "activity added":
-            added_acs.append(changed_acs[len(changed_acs)-1])
-        elif happen_ac[len(happen_ac)-2].strip() == "activity and operator added":
-            added_acs.append(changed_acs[len(changed_acs)-1])
-            moved_acs.extend(changed_acs[len(changed_acs)-ran:len(changed_acs)-1])
-        else:
-            moved_acs.extend(changed_acs[len(changed_acs)-ran:len(changed_acs)])
-    return drift_tree, deleted_acs, added_acs, moved_acs
+    return retries
+
+
+def evolve_tree_versions(tree, change_proportions, workers=1, seed=None):
+    """ Random evolution of many versions of one base tree
+
+    The base tree is copied and indexed once, together with its candidate catalog, and every version is evolved on a
+    copy of this index (see ProcessTreeIndex.copy), so the tree is not indexed again per version. Worker processes
+    index the base tree once per chunk of versions. Every version gets its own child stream of seed, so the versions
+    do not depend on workers.
+
+    :param tree: base process tree (not changed)
+    :param change_proportions: change proportion of every version in list (e.g. [0.1] * 100 + [0.3] * 100)
+    :param workers: number of worker processes (None uses all available cores)
+    :param seed: seed or numpy.random.Generator from which the streams of the single versions are spawned
+    :return: list with the evolved process tree, deleted activities, added activities and moved activities of every
+    version
+    """
+    base = ProcessTreeIndex(copy_process_tree(tree))
+    base.get_catalog(set())
+    streams = spawn_generators(seed, len(change_proportions))
+    evolve = partial(evolve_tree_version, base)
+    if workers == 1:
+        results = list(map(evolve, change_proportions, streams))
+    else:
+        chunksize = max(1, len(change_proportions) // (4 * (workers or os.cpu_count() or 1)))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(evolve, change_proportions, streams, chunksize=chunksize))
+    return [(thaw_tree(version), deleted_acs, added_acs, moved_acs)
+            for version, deleted_acs, added_acs, moved_acs in results]
+
+
+def evolve_tree_version(base, change_proportion, rng):
+    """ Random evolution of one version of an indexed base tree
+
+    :param base: index of the base tree (not changed)
+    :param change_proportion: proportion of total activities to be affected by the change
+    :param rng: numpy.random.Generator or seed used for all random decisions of this version
+    :return: frozen evolved tree, deleted activities, added activities and moved activities
+    """
+    index = base.copy()
+    tree, deleted_acs, added_acs, moved_acs = evolve_tree_randomly_gs(index.tree, change_proportion, index=index,
+                                                                      rng=rng)
+    return freeze_tree(tree), [copy_leaf(leaf) for leaf in deleted_acs], [copy_leaf(leaf) for leaf in added_acs], \
+        [copy_leaf(leaf) for leaf in moved_acs]
@@ -0,0 +1,87 @@
+from pm4py.objects.process_tree.obj import ProcessTree
+
+""" FROZEN PROCESS TREES """
+
+
+class TreeNode:
+    """ Immutable node of a frozen process tree
+
+    Frozen nodes have no parent, so a subtree can be part of several versions of a tree at the same time. The
+    attributes have the names of the properties of pm4py process trees, so frozen trees can be played out directly.
+    """
+    __slots__ = ('operator', 'label', 'children')
+
+    def __init__(self, operator, label, children):
+        self.operator = operator
+        self.label = label
+        self.children = children
+
+    def __repr__(self):
+        return repr(thaw_tree(self))
+
+
+def freeze_tree(tree, nodes=None, origins=None, dirty=None):
+    """ Conversion of a process tree into a frozen tree
+
+    Equal subtrees are represented by the same frozen node (nodes is the table of all frozen nodes of a version
+    store). If origins maps the nodes of the tree to the frozen nodes they were thawed from, every subtree without a
+    node in dirty is taken over without walking it, so only the paths to the changed nodes are copied.
+
+    :param tree: process tree (frozen trees are returned unchanged)
+    :param nodes: dictionary of the frozen nodes by operator, label and children (a new one if None)
+    :param origins: dictionary from id() of a node of the tree to the node and its frozen node or None
+    :param dirty: set of id() of the changed nodes and their ancestors (all nodes are changed if None)
+    :return: frozen tree
+    """
+    if isinstance(tree, TreeNode):
+        return tree
+    if nodes is None:
+        nodes = {}
+    frozen = {}
+    stack = [(tree, False)]
+    while stack:
+        node, visited = stack.pop()
+        origin = None if origins is None or dirty is None or id(node) in dirty else origins.get(id(node))
+        if origin is not None and origin[0] is node:
+            frozen[id(node)] = origin[1]
+        elif not visited:
+            stack.append((node, True))
+            stack.extend((child, False) for child in node.children)
+        else:
+            children = tuple(frozen[id(child)] for child in node.children)
+            key = (node.operator, node.label, tuple(id(child) for child in children))
+            frozen_node = nodes.get(key)
+            if frozen_node is None:
+                frozen_node = TreeNode(node.operator, node.label, children)
+                nodes[key] = frozen_node
+            frozen[id(node)] = frozen_node
+            if origins is not None:
+                origins[id(node)] = (node, frozen_node)
+    return frozen[id(tree)]
+
+
+def thaw_tree(node, origins=None):
+    """ Conversion of a frozen tree into a new pm4py process tree (e.g. for the export)
+
+    :param node: frozen tree (process trees are copied)
+    :param origins: dictionary that is filled with id() of every new node and the node and its frozen node
+    :return: process tree
+    """
+    tree = ProcessTree(node.operator, None, None, node.label)
+    stack = [(node, tree)]
+    while stack:
+        frozen_node, part = stack.pop()
+        if origins is not None:
+            origins[id(part)] = (part, frozen_node)
+        children = []
+        for child in frozen_node.children:
+            new_child = ProcessTree(child.operator, part, None, child.label)
+            children.append(new_child)
+            stack.append((child, new_child))
+        part._set_children(children)
+    return tree
+
+
+def copy_process_tree(tree):
+    """ Copy of a process tree (a lot faster than copy.deepcopy) """
+    return thaw_tree(tree)
@@ -0,0 +1,225 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+
+import numpy
+from pm4py.objects.process_tree.obj import ProcessTree
+
+import conceptdrift
+from conceptdrift.source.columnar_log import convert_columnar_log
+from conceptdrift.source.spilled_log import SpilledLog, open_spilled_log
+
+""" CONTENT-ADDRESSED CACHE OF GENERATED EVENT LOGS """
+
+DEFAULT_MAX_BYTES = 10 * 2 ** 30
+ENTRY_NAME = 'entry.json'
+
+
+class LogCache:
+    """ Directory of cached results, one subdirectory per key, evicted by size in least recently used order
+
+    An entry is written into a temporary directory and renamed into place when it is complete, so readers never see
+    half written entries. Every hit touches the entry file, so its modification time is the time of the last use.
+
+    :param directory: directory of the cache (created if it does not exist)
+    :param max_bytes: maximum size of all entries in bytes (the least recently used entries are removed beyond it)
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = str(directory)
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get_path(self, key):
+        return os.path.join(self.directory, key)
+
+    def get_entry(self, key):
+        """ Directory of the entry of a key (None if the key is not cached), marked as used """
+        path = self.get_path(key)
+        try:
+            os.utime(os.path.join(path, ENTRY_NAME))
+        except FileNotFoundError:
+            return None
+        return path
+
+    def add_entry(self, key, write):
+        """ Adding an entry and evicting the least recently used entries beyond the maximum size
+
+        :param key: key of the entry
+        :param write: function writing the files of the entry into the directory it gets
+        :return: directory of the entry
+        """
+        temporary = self.get_path('.' + key + '-' + uuid.uuid4().hex)
+        os.makedirs(temporary)
+        try:
+            write(temporary)
+            size = sum(os.path.getsize(os.path.join(temporary, name)) for name in os.listdir(temporary))
+            with open(os.path.join(temporary, ENTRY_NAME), 'w') as file:
+                json.dump({'key': key, 'size': size, 'created': time.time()}, file)
+            os.rename(temporary, self.get_path(key))
+        except OSError:
+            # the key was added by another process in the meantime (or the entry could not be written)
+            shutil.rmtree(temporary, ignore_errors=True)
+        self.evict(key)
+        return self.get_entry(key)
+
+    def get_entries(self):
+        """ Key, size and time of the last use of every entry
+
+        :return: list of (key, size in bytes, time of last use)
+        """
+        entries = []
+        for key in os.listdir(self.directory):
+            if key.startswith('.'):
+                continue
+            try:
+                path = os.path.join(self.get_path(key), ENTRY_NAME)
+                with open(path) as file:
+                    size = json.load(file)['size']
+                entries.append((key, size, os.path.getmtime(path)))
+            except (OSError, ValueError, KeyError):
+                continue
+        return entries
+
+    def size(self):
+        return sum(size for key, size, used in self.get_entries())
+
+    def evict(self, keep=None):
+        """ Removing the least recently used entries until the cache fits into max_bytes
+
+        :param keep: key of an entry that is not removed (e.g. the one just added)
+        """
+        if self.max_bytes is None:
+            return
+        entries = sorted(self.get_entries(), key=lambda entry: entry[2])
+        total = sum(size for key, size, used in entries)
+        for key, size, used in entries:
+            if total <= self.max_bytes:
+                break
+            if key != keep:
+                shutil.rmtree(self.get_path(key), ignore_errors=True)
+                total = total - size
+
+    def clear(self):
+        for key, size, used in self.get_entries():
+            shutil.rmtree(self.get_path(key), ignore_errors=True)
+
+
+def get_log_cache(cache):
+    """ Log cache of a directory (log caches are returned unchanged)
+
+    :param cache: log cache or directory
+    :return: log cache
+    """
+    if isinstance(cache, LogCache):
+        return cache
+    return LogCache(cache)
+
+
+def get_canonical_value(value):
+    """ JSON representation of a parameter for the cache key (process trees in the notation of pm4py) """
+    if isinstance(value, ProcessTree):
+        return {'process tree': str(value)}
+    if isinstance(value, numpy.generic):
+        return value.item()
+    if isinstance(value, tuple):
+        return list(value)
+    raise TypeError("parameter of type " + type(value).__name__ + " cannot be cached")
+
+
+def get_cache_key(name, parameters, seed):
+    """ Hash of a generation function, its parameters, the seed and the version of the package
+
+    Only integer seeds make a result reproducible, so there is no key for other seeds (e.g. generators or None) and for
+    parameters without a canonical representation (e.g. functions).
+
+    :param name: name of the generation function
+    :param parameters: dictionary of the parameters (process trees, numbers, strings, lists and None)
+    :param seed: seed of the generation
+    :return: hexadecimal SHA-256 digest or None if the result cannot be cached
+    """
+    if isinstance(seed, bool) or not isinstance(seed, (int, numpy.integer)):
+        return None
+    try:
+        text = json.dumps({'function': name, 'parameters': parameters, 'seed': int(seed),
+                           'version': conceptdrift.__version__}, sort_keys=True, default=get_canonical_value)
+    except TypeError:
+        return None
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def store_log(cache, key, log):
+    """ Storing a columnar log as entry of a key (as raw columns, see SpilledLog) """
+
+    def write(directory):
+        spilled_log = SpilledLog(directory, log.labels, log.attributes)
+        spilled_log.append(log)
+        spilled_log.save()
+
+    return cache.add_entry(key, write)
+
+
+def load_log(cache, key):
+    """ Columnar log of the entry of a key, memory-mapped on the column files (None if the key is not cached) """
+    path = cache.get_entry(key)
+    if path is None:
+        return None
+    return open_spilled_log(path).get_columnar()
+
+
+def generate_cached_log(cache, function, parameters, rng, output='event_log'):
+    """ Log of a drift generator served from the cache or generated and added to it
+
+    :param cache: log cache or directory
+    :param function: drift generator (called with the parameters, rng and output='columnar' on a miss)
+    :param parameters: dictionary of the parameters of the drift generator without rng and output
+    :param rng: seed of the generation (other values bypass the cache)
+    :param output: type of the returned log ('event_log', 'columnar' or 'dataframe')
+    :return: log of the requested type
+    """
+    cache = get_log_cache(cache)
+    key = get_cache_key(function.__name__, parameters, rng)
+    if key is None:
+        return function(rng=rng, output=output, **parameters)
+    log = load_log(cache, key)
+    if log is None:
+        log = function(rng=rng, output='columnar', **parameters)
+        store_log(cache, key, log)
+    return convert_columnar_log(log, output)
+
+
+def restore_files(cache, key, directory):
+    """ Copying the files of the entry of a key into a directory
+
+    :param cache: log cache
+    :param key: key of the entry
+    :param directory: target directory
+    :return: True if the key was cached
+    """
+    path = cache.get_entry(key)
+    if path is None:
+        return False
+    os.makedirs(directory, exist_ok=True)
+    for name in os.listdir(path):
+        if name != ENTRY_NAME:
+            shutil.copyfile(os.path.join(path, name), os.path.join(directory, name))
+    return True
+
+
+def store_files(cache, key, directory, names):
+    """ Storing copies of files of a directory as entry of a key
+
+    :param cache: log cache
+    :param key: key of the entry
+    :param directory: directory of the files
+    :param names: names of the files
+    """
+
+    def write(entry_directory):
+        for name in names:
+            shutil.copyfile(os.path.join(directory, name), os.path.join(entry_directory, name))
+
+    return cache.add_entry(key, write)
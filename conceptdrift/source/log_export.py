@@ -0,0 +1,238 @@
+import numpy
+
+from conceptdrift.source.columnar_log import ColumnarLog, get_offsets, get_event_timestamps, \
+    convert_columnar_to_event_log
+
+""" EXPORT AND IMPORT OF EVENT LOGS """
+
+FILE_EXTENSIONS = {'xes': '.xes', 'parquet': '.parquet', 'arrow': '.arrow', 'feather': '.feather'}
+
+
+def export_columnar_log(log, filepath, format='xes'):
+    """ Export of a columnar log as XES, Parquet or Arrow IPC (Feather) file
+
+    Parquet and Arrow files use the columns case:concept:name, concept:name (both dictionary encoded),
+    time:timestamp and duration:seconds with one row per event, ordered by case. An empty trace has one row with its
+    case id and null values in the other columns. The log attributes (e.g. drift info) are stored in the metadata of
+    the file. Arrow files are written uncompressed so that they can be memory-mapped.
+
+    :param log: columnar log
+    :param filepath: path of the file (including the file extension)
+    :param format: file format ('xes', 'parquet', 'arrow' or 'feather')
+    """
+    if format == 'xes':
+        from pm4py.objects.log.exporter.xes import exporter as xes_exporter
+        xes_exporter.apply(convert_columnar_to_event_log(log), filepath)
+    elif format == 'parquet':
+        import pyarrow.parquet
+        pyarrow.parquet.write_table(convert_columnar_to_table(log), filepath)
+    elif format == 'arrow' or format == 'feather':
+        import pyarrow.feather
+        pyarrow.feather.write_feather(convert_columnar_to_table(log), filepath, compression='uncompressed')
+    else:
+        raise ValueError("unknown file format '" + str(format) + "'")
+
+
+def export_spilled_log(log, filepath, format='xes'):
+    """ Export of a spilled log chunk by chunk (only one chunk is read into memory at a time)
+
+    The files have the same columns as the files of export_columnar_log, with the case ids as plain strings. XES files
+    are written directly as text.
+
+    :param log: spilled log (see spilled_log.SpilledLog)
+    :param filepath: path of the file (including the file extension)
+    :param format: file format ('xes', 'parquet', 'arrow' or 'feather')
+    """
+    if format == 'xes':
+        write_spilled_xes(log, filepath)
+        return
+    if format == 'parquet':
+        import pyarrow.parquet
+        open_writer = pyarrow.parquet.ParquetWriter
+    elif format == 'arrow' or format == 'feather':
+        import pyarrow.ipc
+        open_writer = pyarrow.ipc.new_file
+    else:
+        raise ValueError("unknown file format '" + str(format) + "'")
+    metadata = {str(key): str(value) for key, value in log.attributes.items()}
+    writer = None
+    first_event = 0
+    for start, chunk in log.chunks():
+        table = convert_columnar_to_table(chunk, start, first_event).replace_schema_metadata(metadata)
+        first_event = first_event + chunk.num_events()
+        if writer is None:
+            writer = open_writer(filepath, table.schema)
+        writer.write_table(table)
+    if writer is None:
+        table = convert_columnar_to_table(log.get_columnar(), 0).replace_schema_metadata(metadata)
+        writer = open_writer(filepath, table.schema)
+        writer.write_table(table)
+    writer.close()
+
+
+def write_spilled_xes(log, filepath):
+    """ Writing of a spilled log as XES file (in the layout of the XES exporter of pm4py)
+
+    :param log: spilled log
+    :param filepath: path of the file
+    """
+    from xml.sax.saxutils import quoteattr
+
+    with open(filepath, 'w', encoding='utf-8') as file:
+        file.write('<?xml version="1.0" encoding="utf-8" ?>\n<log xes.version="1849-2016" '
+                   'xes.features="nested-attributes" xmlns="http://www.xes-standard.org/">\n')
+        for key, value in log.attributes.items():
+            file.write('\t<string key=' + quoteattr(str(key)) + ' value=' + quoteattr(str(value)) + ' />\n')
+        labels = ['\t\t\t<string key="concept:name" value=' + quoteattr(str(label)) + ' />\n' for label in log.labels]
+        first_event = 0
+        for start, chunk in log.chunks():
+            names = [labels[code] for code in chunk.activities.tolist()]
+            if chunk.timestamps is not None:
+                timestamps = numpy.datetime_as_string(chunk.timestamps.astype('datetime64[s]')).tolist()
+            else:
+                # the playout timestamps are numbered over the whole log, not per chunk
+                timestamps = [str(timestamp).replace(' ', 'T') for timestamp in
+                              get_event_timestamps(chunk, first_event, first_event + chunk.num_events())]
+            first_event = first_event + chunk.num_events()
+            durations = None if chunk.durations is None else chunk.durations.tolist()
+            offsets = chunk.offsets.tolist()
+            lines = []
+            for i in range(len(chunk)):
+                lines.append('\t<trace>\n\t\t<string key="concept:name" value="' + str(start + i) + '" />\n')
+                for k in range(offsets[i], offsets[i + 1]):
+                    lines.append('\t\t<event>\n' + names[k] + '\t\t\t<date key="time:timestamp" value="' +
+                                 timestamps[k] + '" />\n')
+                    if durations is not None:
+                        lines.append('\t\t\t<int key="duration:seconds" value="' + str(durations[k]) + '" />\n')
+                    lines.append('\t\t</event>\n')
+                lines.append('\t</trace>\n')
+            file.write(''.join(lines))
+        file.write('</log>\n')
+
+
+def convert_columnar_to_table(log, first_case=None, first_event=0):
+    """ Conversion of a columnar log into an Arrow table
+
+    Every empty trace gets one row with its case id and null values in all other columns, so the empty traces are kept
+    by the import (see convert_table_to_columnar).
+
+    :param log: columnar log
+    :param first_case: None for dictionary encoded case ids 0 to number of traces - 1, otherwise the case ids are plain
+    strings starting at first_case (e.g. for the chunks of a spilled log)
+    :param first_event: index of the first event in the whole log (numbers the timestamps of logs without timestamps)
+    :return: Arrow table with the log attributes as schema metadata
+    """
+    import pyarrow
+
+    trace_lengths = log.trace_lengths()
+    rows = numpy.maximum(trace_lengths, 1)
+    events = None
+    if len(log) > 0 and trace_lengths.min() == 0:
+        events = numpy.ones(int(rows.sum()), dtype=bool)
+        events[get_offsets(rows)[:-1][trace_lengths == 0]] = False
+    if first_case is None:
+        cases = pyarrow.DictionaryArray.from_arrays(
+            numpy.repeat(numpy.arange(len(log), dtype=numpy.int32), rows),
+            pyarrow.array([str(i) for i in range(len(log))], type=pyarrow.string()))
+    else:
+        cases = pyarrow.array(numpy.repeat(numpy.arange(first_case, first_case + len(log)), rows).astype(str),
+                              type=pyarrow.string())
+    if log.timestamps is None:
+        timestamps = numpy.array(get_event_timestamps(log, first_event, first_event + log.num_events()),
+                                 dtype='datetime64[s]')
+    else:
+        timestamps = log.timestamps.astype('datetime64[s]')
+    activities = pyarrow.DictionaryArray.from_arrays(get_event_column(log.activities.astype(numpy.int32), events),
+                                                     pyarrow.array(log.labels, type=pyarrow.string()))
+    columns = {'case:concept:name': cases, 'concept:name': activities,
+               'time:timestamp': get_event_column(timestamps, events, pyarrow.timestamp('s'))}
+    if log.durations is not None:
+        columns['duration:seconds'] = get_event_column(log.durations, events, pyarrow.int64())
+    metadata = {str(key): str(value) for key, value in log.attributes.items()}
+    return pyarrow.table(columns, metadata=metadata)
+
+
+def get_event_column(values, events, type=None):
+    """ Arrow array of the values of the events with null values in the rows of the empty traces
+
+    :param values: array with one value per event
+    :param events: boolean array that is True for the rows of events (None if there is no empty trace)
+    :param type: Arrow type of the array (derived from the values if None)
+    :return: Arrow array
+    """
+    import pyarrow
+
+    if events is None:
+        return pyarrow.array(values, type=type)
+    column = numpy.zeros(len(events), dtype=values.dtype)
+    column[events] = values
+    return pyarrow.array(column, mask=~events, type=type)
+
+
+def import_columnar_log(filepath, format=None):
+    """ Import of a columnar log from a Parquet or Arrow IPC (Feather) file written by export_columnar_log
+
+    Arrow files are memory-mapped, so the activity codes, timestamps and durations of the columnar log are views on
+    the file without copying.
+
+    :param filepath: path of the file
+    :param format: file format ('parquet', 'arrow' or 'feather'; derived from the file extension if None)
+    :return: columnar log with the attributes from the file metadata
+    """
+    import pyarrow
+
+    if format is None:
+        format = str(filepath).rsplit('.', 1)[-1]
+    if format == 'parquet':
+        import pyarrow.parquet
+        table = pyarrow.parquet.read_table(filepath, memory_map=True)
+    elif format == 'arrow' or format == 'feather':
+        import pyarrow.ipc
+        table = pyarrow.ipc.open_file(pyarrow.memory_map(str(filepath), 'r')).read_all()
+    else:
+        raise ValueError("unknown file format '" + str(format) + "'")
+    return convert_table_to_columnar(table)
+
+
+def convert_table_to_columnar(table):
+    """ Conversion of an Arrow table with one row per event (ordered by case) into a columnar log
+
+    Rows without activity are the rows of empty traces.
+
+    :param table: Arrow table
+    :return: columnar log
+    """
+    import pyarrow
+
+    cases = dictionary_column(table.column('case:concept:name'))
+    case_indices = cases.indices.to_numpy()
+    if table.column('concept:name').null_count > 0:
+        # the rows of the empty traces (see convert_columnar_to_table)
+        events = table.column('concept:name').is_valid()
+        case_indices = case_indices[events.to_numpy(zero_copy_only=False)]
+        table = table.filter(events)
+    activities = dictionary_column(table.column('concept:name'))
+    offsets = get_offsets(numpy.bincount(case_indices, minlength=len(cases.dictionary)))
+    timestamps = table.column('time:timestamp').combine_chunks().cast(pyarrow.timestamp('s')).to_numpy()
+    durations = None
+    if 'duration:seconds' in table.column_names:
+        durations = table.column('duration:seconds').combine_chunks().to_numpy()
+    metadata = table.schema.metadata or {}
+    attributes = {key.decode(): value.decode() for key, value in metadata.items() if not key.startswith(b'ARROW:')}
+    return ColumnarLog(offsets, activities.indices.to_numpy(), activities.dictionary.to_pylist(), timestamps, durations,
+                       attributes)
+
+
+def dictionary_column(column):
+    """ Dictionary encoded array of a table column (columns that are not dictionary encoded are encoded)
+
+    :param column: chunked Arrow array
+    :return: Arrow dictionary array
+    """
+    import pyarrow
+
+    if pyarrow.types.is_dictionary(column.type):
+        if column.num_chunks == 1:
+            return column.chunk(0)
+        column = column.cast(column.type.value_type)
+    return column.combine_chunks().dictionary_encode()
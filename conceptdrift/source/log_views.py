@@ -0,0 +1,193 @@
+import bisect
+import itertools
+
+from pm4py.objects.log.obj import EventLog
+
+from conceptdrift.source.columnar_log import ColumnarLog, combine_columnar_logs, get_traces, \
+    convert_columnar_to_event_log
+
+""" VIEWS ON EVENT LOGS """
+
+LOG_PROPERTIES = ('attributes', 'extensions', 'omni_present', 'classifiers', 'properties')
+
+
+class ChainedLog:
+    """ Event logs concatenated by reference
+
+    The traces of the segments are not copied: the chain only keeps the segments and the number of traces before
+    every segment, so concatenating k logs costs O(k) instead of copying all traces k times. Chains of event logs can be
+    iterated and indexed like an event log. The combined log is built by materialize on demand and only once; chains of
+    columnar logs are materialized into one columnar log. Like a pm4py event log, a chain has attributes, extensions,
+    omni_present, classifiers and properties, which are copied from the first log.
+
+    :param logs: list of event logs, columnar logs or views (chained logs are flattened into their segments)
+    """
+
+    def __init__(self, logs=()):
+        logs = list(logs)
+        self.segments = []
+        self.bounds = [0]
+        self.log = None
+        copy_log_properties(self, logs[0] if logs else None)
+        for log in logs:
+            self.append(log)
+
+    def append(self, log):
+        """ Adding a log to the end of the chain """
+        if isinstance(log, ChainedLog):
+            start = self.bounds[-1]
+            self.segments.extend(log.segments)
+            self.bounds.extend(start + bound for bound in log.bounds[1:])
+            self.log = None
+        elif len(log) > 0:
+            self.segments.append(log)
+            self.bounds.append(self.bounds[-1] + len(log))
+            self.log = None
+
+    def __len__(self):
+        return self.bounds[-1]
+
+    def __iter__(self):
+        return itertools.chain.from_iterable(self.segments)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return get_slice(self, i)
+        if i < 0:
+            i = i + len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError("trace index out of range")
+        k = bisect.bisect_right(self.bounds, i) - 1
+        return self.segments[k][i - self.bounds[k]]
+
+    def is_columnar(self):
+        return len(self.segments) > 0 and all(is_columnar_log(log) for log in self.segments)
+
+    def materialize(self):
+        """ Combined log of the chain (built once and reused until the chain changes)
+
+        :return: event log (columnar segments are converted), or columnar log if all segments are columnar logs
+        """
+        if self.log is None:
+            if self.is_columnar():
+                self.log = combine_columnar_logs([materialize_columnar(log) for log in self.segments])
+            else:
+                self.log = EventLog(**get_log_properties(self))
+                for log in self.segments:
+                    if is_columnar_log(log):
+                        # traces of columnar segments are converted, so the event log only holds pm4py traces
+                        log = convert_columnar_to_event_log(materialize_columnar(log))
+                    for trace in log:
+                        self.log.append(trace)
+        return self.log
+
+
+class LogView:
+    """ Traces start to stop - 1 of a log, without copying them
+
+    Views on views refer to the underlying log directly, so splitting a log into parts takes constant time per part.
+    The traces are only touched by the consumer of the view, e.g. by iterating it or by materialize. Like a pm4py event
+    log, a view has attributes, extensions, omni_present, classifiers and properties, which are copied from the log.
+
+    :param log: event log, columnar log or view
+    :param start: index of the first trace
+    :param stop: index after the last trace
+    """
+
+    def __init__(self, log, start, stop):
+        start = min(max(start, 0), len(log))
+        stop = min(max(stop, start), len(log))
+        copy_log_properties(self, log)
+        if isinstance(log, LogView):
+            start = start + log.start
+            stop = stop + log.start
+            log = log.log
+        self.log = log
+        self.start = start
+        self.stop = stop
+
+    def __len__(self):
+        return self.stop - self.start
+
+    def __iter__(self):
+        log = self.log
+        for i in range(self.start, self.stop):
+            yield log[i]
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return get_slice(self, i)
+        if i < 0:
+            i = i + len(self)
+        if i < 0 or i >= len(self):
+            raise IndexError("trace index out of range")
+        return self.log[self.start + i]
+
+    def is_columnar(self):
+        return is_columnar_log(self.log)
+
+    def materialize(self):
+        """ Traces of the view as event log, or as columnar log (sharing the columns) for a view on a columnar log """
+        if self.is_columnar():
+            return get_traces(materialize_columnar(self.log), self.start, self.stop)
+        log = EventLog(**get_log_properties(self))
+        for trace in self:
+            log.append(trace)
+        return log
+
+
+def copy_log_properties(view, log):
+    """ Copies of the pm4py log properties of a log (see LOG_PROPERTIES) as properties of a view on it
+
+    :param view: chained log or log view
+    :param log: event log, columnar log, view or None (logs without a property get an empty one)
+    """
+    for name in LOG_PROPERTIES:
+        setattr(view, name, dict(getattr(log, name, None) or {}))
+
+
+def get_log_properties(log):
+    """ Dictionary of the pm4py log properties of a view, e.g. as keyword arguments of EventLog """
+    return {name: getattr(log, name) for name in LOG_PROPERTIES}
+
+
+def get_slice(log, part):
+    """ View on a slice of a view (only slices with step 1)
+
+    :param log: chained log or log view
+    :param part: slice
+    :return: log view
+    """
+    start, stop, step = part.indices(len(log))
+    if step != 1:
+        raise ValueError("views only support slices with step 1")
+    return LogView(log, start, stop)
+
+
+def is_columnar_log(log):
+    """ Whether a log is a columnar log or a view on columnar logs """
+    if isinstance(log, (ChainedLog, LogView)):
+        return log.is_columnar()
+    return isinstance(log, ColumnarLog)
+
+
+def materialize_columnar(log):
+    """ Columnar log of a view on columnar logs, any other log unchanged (views on event logs are streamed)
+
+    :param log: event log, columnar log, chained log or log view
+    :return: log
+    """
+    if isinstance(log, (ChainedLog, LogView)) and log.is_columnar():
+        return log.materialize()
+    return log
+
+
+def materialize_log(log):
+    """ Event log or columnar log of a view (any other log unchanged)
+
+    :param log: event log, columnar log, chained log or log view
+    :return: event log or columnar log
+    """
+    if isinstance(log, (ChainedLog, LogView)):
+        return log.materialize()
+    return log
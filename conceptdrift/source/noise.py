@@ -1,28 +1,32 @@
-import copy
-
 from conceptdrift.source.evolution import evolve_tree_randomly_gs
 from conceptdrift.source.event_log_controller import length_of_log, include_noise_in_log, get_timestamp_log
 from conceptdrift.source.process_tree_controller import generate_tree
-from pm4py.objects.process_tree import semantics
+from conceptdrift.source.playout import generate_log, generate_columnar_log
+from conceptdrift.source.frozen_tree import copy_process_tree
+from conceptdrift.source.log_views import is_columnar_log
+from conceptdrift.source.random_streams import spawn_generators
 
 
-def add_noise(event_log, pro_noise=0.05, start_noise=0, end_noise=1, model=None):
+def add_noise(event_log, pro_noise=0.05, start_noise=0, end_noise=1, model=None, rng=None):
     """ Introduction of noise into an event log
 
-    :param event_log: event log into which noise is introduced
+    :param event_log: event log (or columnar log) into which noise is introduced
     :param pro_noise: proportion of noise traces occurring in the set sector of the event log
     :param start_noise: Start point of the noise as a proportion of the total number of traces
     :param end_noise: End point of the noise as a proportion of the total number of traces
     :param model: process tree for noise
+    :param rng: numpy.random.Generator or seed; the noise tree, the noise traces and their positions draw from own child
+    streams of it
     :return: event log with noise
     """
+    tree_rng, playout_rng, position_rng = spawn_generators(rng, 3)
     nu_traces = int(
         round(((length_of_log(event_log) * end_noise) - (
                 length_of_log(event_log) * start_noise)) * pro_noise + 0.0001))
     if model is not None:
-        drift_tree = copy.deepcopy(model)
-        drift_tree, a, b, c = evolve_tree_randomly_gs(drift_tree, 0.4)
-        log_noise = semantics.generate_log(drift_tree, nu_traces)
+        drift_tree = copy_process_tree(model)
+        drift_tree, a, b, c = evolve_tree_randomly_gs(drift_tree, 0.4, rng=tree_rng)
+        log_noise = generate_noise_log(drift_tree, nu_traces, event_log, playout_rng)
 
         data = "noise proportion: " + str(pro_noise) + "; start point: " + str(
             get_timestamp_log(event_log, len(event_log), start_noise)) + " (" + str(
@@ -32,13 +36,13 @@ def add_noise(event_log, pro_noise=0.05, start_noise=0, end_noise=1, model=None)
         model = generate_tree(
             {'mode': 8, 'min': 6, 'max': 10, 'sequence': 0.25, 'choice': 0.25, 'parallel': 0.25, 'loop': 0.2, 'or': 0,
              'silent': 0, 'duplicate': 0, 'lt_dependency': 0, 'infrequent': 0.25, 'no_models': 10, 'unfold': 10,
-             'max_repeat': 10})
-        log_noise = semantics.generate_log(model, nu_traces)
+             'max_repeat': 10}, tree_rng)
+        log_noise = generate_noise_log(model, nu_traces, event_log, playout_rng)
         data = "noise proportion: " + str(pro_noise) + "; start point: " + str(
             get_timestamp_log(event_log, len(event_log), start_noise)) + " (" + str(
             start_noise) + "); end point: " + str(get_timestamp_log(event_log, len(event_log), end_noise)) + " (" + str(
             end_noise) + "); noise type: random"
-    result = include_noise_in_log(event_log, log_noise, start_noise, end_noise)
+    result = include_noise_in_log(event_log, log_noise, start_noise, end_noise, position_rng)
     try:
         data_drift = event_log.attributes['drift info']
         result.attributes['drift info'] = data_drift
@@ -48,30 +52,68 @@ def add_noise(event_log, pro_noise=0.05, start_noise=0, end_noise=1, model=None)
     return result
 
 
-def add_noise_gs(event_log, tree, pro_noise, type_noise, start_noise, end_noise):
+def add_noise_gs(event_log, tree, pro_noise, type_noise, start_noise, end_noise, record=None, rng=None):
     """ Introduction of noise into an event log for text file
 
-    :param event_log: event log
+    :param event_log: event log (or columnar log)
     :param tree: process tree for noise
     :param pro_noise: proportion of noise in sector
     :param type_noise: type of noise (i.e. random or changed)
     :param start_noise: start point of noise
     :param end_noise: end point of noise
+    :param record: stage record (see profiling) to which the retries of the evolution of the noise tree are added
+    :param rng: numpy.random.Generator or seed; the noise tree, the noise traces and their positions draw from own child
+    streams of it
     :return: event log with noise
     """
-    nu_traces = int(
-        round(((length_of_log(event_log) * end_noise) - (
-                length_of_log(event_log) * start_noise)) * pro_noise + 0.0001))
+    nu_traces = get_number_of_noise_traces(length_of_log(event_log), pro_noise, start_noise, end_noise)
     if nu_traces == 0:
         return event_log, False
+    tree_rng, playout_rng, position_rng = spawn_generators(rng, 3)
+    log_noise = generate_noise_log(get_noise_tree(tree, type_noise, record, tree_rng), nu_traces, event_log, playout_rng)
+    return include_noise_in_log(event_log, log_noise, start_noise, end_noise, position_rng), True
+
+
+def get_number_of_noise_traces(nu_traces, pro_noise, start_noise, end_noise):
+    """ Number of noise traces in the noise sector of an event log
+
+    :param nu_traces: number of traces of the event log
+    :param pro_noise: proportion of noise in sector
+    :param start_noise: start point of noise
+    :param end_noise: end point of noise
+    :return: number of noise traces
+    """
+    return int(round(((nu_traces * end_noise) - (nu_traces * start_noise)) * pro_noise + 0.0001))
+
+
+def get_noise_tree(tree, type_noise, record=None, rng=None):
+    """ Process tree the noise traces are played out from
+
+    :param tree: process tree for noise
+    :param type_noise: type of noise (i.e. random or changed)
+    :param record: stage record (see profiling) to which the retries of the evolution are added
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: evolved copy of the tree for 'changed_model', a random tree otherwise
+    """
     if type_noise == 'changed_model':
-        drift_tree = copy.deepcopy(tree)
-        drift_tree, a, b, c = evolve_tree_randomly_gs(drift_tree, 0.4)
-        log_noise = semantics.generate_log(drift_tree, nu_traces)
-    else:
-        tree = generate_tree(
-            {'mode': 8, 'min': 6, 'max': 10, 'sequence': 0.25, 'choice': 0.25, 'parallel': 0.25, 'loop': 0.2, 'or': 0,
-             'silent': 0, 'duplicate': 0, 'lt_dependency': 0, 'infrequent': 0.25, 'no_models': 10, 'unfold': 10,
-             'max_repeat': 10})
-        log_noise = semantics.generate_log(tree, nu_traces)
-    return include_noise_in_log(event_log, log_noise, start_noise, end_noise), True
+        drift_tree = copy_process_tree(tree)
+        drift_tree, a, b, c = evolve_tree_randomly_gs(drift_tree, 0.4, record=record, rng=rng)
+        return drift_tree
+    return generate_tree(
+        {'mode': 8, 'min': 6, 'max': 10, 'sequence': 0.25, 'choice': 0.25, 'parallel': 0.25, 'loop': 0.2, 'or': 0,
+         'silent': 0, 'duplicate': 0, 'lt_dependency': 0, 'infrequent': 0.25, 'no_models': 10, 'unfold': 10,
+         'max_repeat': 10}, rng)
+
+
+def generate_noise_log(tree, nu_traces, event_log, rng=None):
+    """ Playout of the noise traces in the representation of the event log they are introduced into
+
+    :param tree: process tree for noise
+    :param nu_traces: number of noise traces
+    :param event_log: event log, columnar log or view (chained logs and log views of columnar logs count as columnar)
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: event log or columnar log with the noise traces
+    """
+    if is_columnar_log(event_log):
+        return generate_columnar_log(tree, nu_traces, rng=rng)
+    return generate_log(tree, nu_traces, rng=rng)
@@ -0,0 +1,358 @@
+import datetime
+import itertools
+import sys
+
+import numpy
+from pm4py.objects.log.obj import EventLog, Trace, Event
+from pm4py.objects.process_tree.obj import Operator
+
+from conceptdrift.source.columnar_log import ColumnarLog, get_offsets
+from conceptdrift.source.random_streams import get_generator, uniform_stream
+
+""" COMPILED PLAYOUT OF PROCESS TREES """
+
+LEAF = 0
+SEQUENCE = 1
+XOR = 2
+PARALLEL = 3
+LOOP = 4
+OR = 5
+
+OPERATOR_CODES = {None: LEAF, Operator.SEQUENCE: SEQUENCE, Operator.XOR: XOR, Operator.PARALLEL: PARALLEL,
+                  Operator.LOOP: LOOP, Operator.OR: OR}
+
+
+class CompiledTree:
+    """ Flat array-based program of a process tree
+
+    The nodes are numbered in breadth-first order, so the children of a node are the consecutive nodes
+    first_child[node] to first_child[node] + num_children[node] - 1. Loops are padded with silent children to
+    (do, redo, exit) like in the pm4py semantics. Leaves carry the id of their label in labels (interned strings, so all
+    logs of the versions of a tree share them), silent leaves -1.
+    The variant table of the tree is built on first use by the 'variants' playout mode and kept in variant_table.
+    """
+    __slots__ = ('operators', 'parents', 'first_child', 'num_children', 'label_ids', 'labels', 'variant_table')
+
+    def __init__(self, operators, parents, first_child, num_children, label_ids, labels):
+        self.operators = operators
+        self.parents = parents
+        self.first_child = first_child
+        self.num_children = num_children
+        self.label_ids = label_ids
+        self.labels = labels
+        self.variant_table = None
+
+    def __len__(self):
+        return len(self.operators)
+
+
+def compile_tree(tree):
+    """ Compilation of a process tree into a flat program for the playout
+
+    :param tree: process tree
+    :return: compiled process tree
+    """
+    operators = []
+    parents = []
+    first_child = []
+    num_children = []
+    label_ids = []
+    labels = []
+    label_index = {}
+    queue = [(tree, -1)]
+    node = 0
+    while node < len(queue):
+        part, parent = queue[node]
+        parents.append(parent)
+        children = [] if part is None else list(part.children)
+        operator = LEAF if part is None or len(children) == 0 else OPERATOR_CODES[part.operator]
+        if operator == LOOP:
+            while len(children) < 3:
+                children.append(None)
+        operators.append(operator)
+        first_child.append(len(queue))
+        num_children.append(len(children))
+        for child in children:
+            queue.append((child, node))
+        label = None if part is None or operator != LEAF else part.label
+        if label is None:
+            label_ids.append(-1)
+        else:
+            if label not in label_index:
+                label_index[label] = len(labels)
+                labels.append(sys.intern(label))
+            label_ids.append(label_index[label])
+        node = node + 1
+    return CompiledTree(numpy.array(operators, dtype=numpy.int8), numpy.array(parents, dtype=numpy.int32),
+                        numpy.array(first_child, dtype=numpy.int32), numpy.array(num_children, dtype=numpy.int32),
+                        numpy.array(label_ids, dtype=numpy.int32), labels)
+
+
+def get_compiled_tree(tree):
+    """ Compiled version of a process tree (compiled trees are returned unchanged)
+
+    :param tree: process tree or compiled process tree
+    :return: compiled process tree
+    """
+    if isinstance(tree, CompiledTree):
+        return tree
+    return compile_tree(tree)
+
+
+def play_out_label_ids(compiled, no_traces, rng=None):
+    """ Playout of a compiled process tree
+
+    Like pm4py's semantics, every step executes a node chosen uniformly at random from all enabled nodes, so the
+    resulting traces follow the same distribution as semantics.generate_log. An or node closes as soon as all of its
+    chosen children are closed.
+
+    :param compiled: compiled process tree
+    :param no_traces: number of traces
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: list of traces as lists of label ids
+    """
+    operators = compiled.operators.tolist()
+    parents = compiled.parents.tolist()
+    first_child = compiled.first_child.tolist()
+    num_children = compiled.num_children.tolist()
+    label_ids = compiled.label_ids.tolist()
+    rand = uniform_stream(get_generator(rng)).__next__
+    remaining = [0] * len(operators)
+    traces = []
+    for _ in range(no_traces):
+        trace = []
+        enabled = [0]
+        while enabled:
+            k = int(rand() * len(enabled))
+            node = enabled[k]
+            enabled[k] = enabled[-1]
+            enabled.pop()
+            operator = operators[node]
+            if operator == SEQUENCE or operator == LOOP:
+                enabled.append(first_child[node])
+                continue
+            elif operator == XOR:
+                enabled.append(first_child[node] + int(rand() * num_children[node]))
+                continue
+            elif operator == PARALLEL:
+                enabled.extend(range(first_child[node], first_child[node] + num_children[node]))
+                remaining[node] = num_children[node]
+                continue
+            elif operator == OR:
+                chosen = [child for child in range(first_child[node], first_child[node] + num_children[node])
+                          if rand() < 0.5]
+                if chosen:
+                    enabled.extend(chosen)
+                    remaining[node] = len(chosen)
+                    continue
+            elif label_ids[node] >= 0:
+                trace.append(label_ids[node])
+            # the node is closed, propagate to the parents
+            child = node
+            parent = parents[child]
+            while parent >= 0:
+                operator = operators[parent]
+                if operator == SEQUENCE:
+                    if child + 1 < first_child[parent] + num_children[parent]:
+                        enabled.append(child + 1)
+                        break
+                elif operator == LOOP:
+                    if child == first_child[parent]:
+                        enabled.append(child + 1 + int(rand() * 2))
+                        break
+                    elif child != first_child[parent] + num_children[parent] - 1:
+                        enabled.append(first_child[parent])
+                        break
+                elif operator == PARALLEL or operator == OR:
+                    remaining[parent] = remaining[parent] - 1
+                    if remaining[parent] > 0:
+                        break
+                child = parent
+                parent = parents[child]
+        traces.append(trace)
+    return traces
+
+
+def play_out_batch(compiled, no_traces, rng=None):
+    """ Batched playout of a compiled process tree
+
+    The tree is walked once for the whole batch: every node is executed for the array of traces reaching it, choices of
+    xor and loop nodes are drawn as vectors, and the branches of parallel nodes are merged by random interleavings of
+    all traces at once. Every interleaving of the branches is equally likely. The scheduler of pm4py (and of
+    play_out_label_ids) instead picks among all enabled nodes of the tree, which gives another distribution of the
+    trace variants of trees with parallel nodes (e.g. a total variation distance of 0.5 for +('a', ->('b', 'c', 'd'))).
+    Batch logs are therefore no substitute for pm4py logs where the variant distribution matters, e.g. as ground truth
+    for the evaluation of drift detection.
+
+    :param compiled: compiled process tree
+    :param no_traces: number of traces
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: array with the offsets of the traces (length no_traces + 1) and array with the label ids of all events
+    """
+    rng = get_generator(rng)
+    operators = compiled.operators.tolist()
+    first_child = compiled.first_child.tolist()
+    num_children = compiled.num_children.tolist()
+    label_ids = compiled.label_ids.tolist()
+    clock = numpy.zeros(no_traces, dtype=numpy.int64)
+
+    def walk(node, traces):
+        """ Execution of a node for the given traces, returns the events as chunks of (trace, label id, position) """
+        if len(traces) == 0:
+            return []
+        operator = operators[node]
+        children = list(range(first_child[node], first_child[node] + num_children[node]))
+        if operator == LEAF:
+            if label_ids[node] < 0:
+                return []
+            positions = clock[traces]
+            clock[traces] = positions + 1
+            return [(traces, numpy.full(len(traces), label_ids[node], dtype=numpy.int32), positions)]
+        elif operator == SEQUENCE:
+            chunks = []
+            for child in children:
+                chunks.extend(walk(child, traces))
+            return chunks
+        elif operator == XOR:
+            choices = rng.integers(0, len(children), size=len(traces))
+            chunks = []
+            for k, child in enumerate(children):
+                chunks.extend(walk(child, traces[choices == k]))
+            return chunks
+        elif operator == LOOP:
+            chunks = walk(children[0], traces)
+            active = traces
+            while len(active) > 0:
+                redo = rng.random(len(active)) < 0.5
+                chunks.extend(walk(children[2], active[~redo]))
+                active = active[redo]
+                chunks.extend(walk(children[1], active))
+                chunks.extend(walk(children[0], active))
+            return chunks
+        else:
+            if operator == PARALLEL:
+                chosen = [traces] * len(children)
+            else:
+                chosen = [traces[rng.random(len(traces)) < 0.5] for _ in children]
+            return interleave(traces, [(k, child, part) for k, (child, part) in enumerate(zip(children, chosen))])
+
+    def interleave(traces, branches):
+        """ Execution of parallel branches and random interleaving of their events per trace """
+        base = clock[traces]
+        branch_chunks = []
+        for k, child, part in branches:
+            clock[part] = 0
+            for chunk in walk(child, part):
+                branch_chunks.append(chunk + (numpy.full(len(chunk[0]), k, dtype=numpy.int64),))
+        clock[traces] = base
+        if not branch_chunks:
+            return []
+        owner, label, local, branch = (numpy.concatenate(column) for column in zip(*branch_chunks))
+        # random keys, sorted within every branch of a trace so that the order inside a branch is kept
+        keys = rng.random(len(owner))
+        by_key = numpy.lexsort((keys, branch, owner))
+        by_local = numpy.lexsort((local, branch, owner))
+        keys[by_local] = keys[by_key]
+        order = numpy.lexsort((keys, owner))
+        owner = owner[order]
+        label = label[order]
+        indices = numpy.arange(len(owner))
+        first = numpy.ones(len(owner), dtype=bool)
+        first[1:] = owner[1:] != owner[:-1]
+        positions = clock[owner] + indices - numpy.maximum.accumulate(numpy.where(first, indices, 0))
+        last = numpy.flatnonzero(numpy.append(first[1:], True))
+        clock[owner[last]] = positions[last] + 1
+        return [(owner, label, positions)]
+
+    chunks = walk(0, numpy.arange(no_traces))
+    if chunks:
+        owner, label, positions = (numpy.concatenate(column) for column in zip(*chunks))
+        order = numpy.lexsort((positions, owner))
+        events = label[order]
+        counts = numpy.bincount(owner, minlength=no_traces)
+    else:
+        events = numpy.zeros(0, dtype=numpy.int32)
+        counts = numpy.zeros(no_traces, dtype=numpy.int64)
+    offsets = numpy.zeros(no_traces + 1, dtype=numpy.int64)
+    offsets[1:] = numpy.cumsum(counts)
+    return offsets, events
+
+
+def convert_label_ids_to_log(traces, labels):
+    """ Conversion of traces of label ids into an event log like the one of semantics.generate_log
+
+    :param traces: list of traces as lists of label ids
+    :param labels: list of labels indexed by the label ids
+    :return: event log
+    """
+    log = EventLog()
+    curr_timestamp = 10000000
+    for i, ids in enumerate(traces):
+        trace = Trace()
+        trace.attributes['concept:name'] = str(i)
+        for label_id in ids:
+            trace.append(Event({'concept:name': labels[label_id],
+                                'time:timestamp': datetime.datetime.fromtimestamp(curr_timestamp)}))
+            curr_timestamp = curr_timestamp + 1
+        log.append(trace)
+    return log
+
+
+def generate_log(tree, no_traces=100, mode='trace', rng=None):
+    """ Generation of an event log from a process tree (drop-in replacement of semantics.generate_log)
+
+    :param tree: process tree or compiled process tree
+    :param no_traces: number of traces
+    :param mode: 'trace' plays out every trace, 'batch' plays out all traces in one vectorized walk of the tree,
+    'variants' draws the traces from the variant table of the tree
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: event log
+    """
+    compiled = get_compiled_tree(tree)
+    if mode == 'trace':
+        return convert_label_ids_to_log(play_out_label_ids(compiled, no_traces, rng), compiled.labels)
+    elif mode == 'batch':
+        offsets, events = play_out_batch(compiled, no_traces, rng)
+        events = events.tolist()
+        offsets = offsets.tolist()
+        traces = [events[offsets[i]:offsets[i + 1]] for i in range(no_traces)]
+        return convert_label_ids_to_log(traces, compiled.labels)
+    elif mode == 'variants':
+        from conceptdrift.source.variant_table import build_variant_table, generate_log_from_variant_table
+        rng = get_generator(rng)
+        if compiled.variant_table is None:
+            # own stream for a table estimated from samples, the draws of rng are not touched
+            compiled.variant_table = build_variant_table(compiled, rng=rng.spawn(1)[0])
+        return generate_log_from_variant_table(compiled.variant_table, no_traces, rng=rng)
+    else:
+        raise ValueError("unknown playout mode '" + str(mode) + "'")
+
+
+def generate_columnar_log(tree, no_traces=100, mode='trace', rng=None):
+    """ Generation of a columnar log from a process tree
+
+    :param tree: process tree or compiled process tree
+    :param no_traces: number of traces
+    :param mode: 'trace' plays out every trace, 'batch' plays out all traces in one vectorized walk of the tree,
+    'variants' draws the traces from the variant table of the tree
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: columnar log
+    """
+    compiled = get_compiled_tree(tree)
+    if mode == 'trace':
+        traces = play_out_label_ids(compiled, no_traces, rng)
+        offsets = get_offsets(numpy.array([len(trace) for trace in traces], dtype=numpy.int64))
+        activities = numpy.fromiter(itertools.chain.from_iterable(traces), dtype=numpy.int32, count=offsets[-1])
+        return ColumnarLog(offsets, activities, compiled.labels)
+    elif mode == 'batch':
+        offsets, activities = play_out_batch(compiled, no_traces, rng)
+        return ColumnarLog(offsets, activities, compiled.labels)
+    elif mode == 'variants':
+        from conceptdrift.source.variant_table import build_variant_table, generate_columnar_log_from_variant_table
+        rng = get_generator(rng)
+        if compiled.variant_table is None:
+            # own stream for a table estimated from samples, the draws of rng are not touched
+            compiled.variant_table = build_variant_table(compiled, rng=rng.spawn(1)[0])
+        return generate_columnar_log_from_variant_table(compiled.variant_table, no_traces, rng=rng)
+    else:
+        raise ValueError("unknown playout mode '" + str(mode) + "'")
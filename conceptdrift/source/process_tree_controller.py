@@ -2,17 +2,15 @@ from __future__ import annotations
 
 import copy
 import re
-from random import randint
 
-import pm4py
-from pm4py.objects.bpmn.obj import BPMN
 from pm4py.objects.process_tree.obj import ProcessTree, Operator
-from pm4py.visualization.process_tree import visualizer as pt_visualizer
-from pm4py.algo.simulation.tree_generator import algorithm as tree_gen
-from pm4py.objects.process_tree.importer import importer as ptml_importer
-from pm4py.objects.conversion.bpmn import converter as bpmn_converter
-from pm4py.objects.conversion.wf_net import converter as wf_net_converter
-from pm4py.objects.petri_net.importer import importer as pnml_importer
+
+from conceptdrift.source.change_journal import ChangeRecord, record_change
+from conceptdrift.source.random_streams import get_generator, draw_integer, seed_global_random
+from conceptdrift.source.tree_index import get_tree_index, get_changed_labels
+
+# The tree generator (scipy.stats), the visualizer (graphviz) and the model importers/converters are
+# expensive to import and only needed by a few functions, so they are imported on first use.
 
 """ GENERAL ALGORITHMS FOR PROCESS TREES """
 
@@ -24,12 +22,24 @@ def add_activity_as_parent(tree, added_activiy, added_operator):
     return tree_pa
 
 
-def generate_tree(parameters) -> ProcessTree:
+def generate_tree(parameters, rng=None) -> ProcessTree:
+    """ Generation of a random process tree with the tree generator of pm4py
+
+    The generator of pm4py draws from the global random states, so they are seeded from rng if it is given.
+
+    :param parameters: parameters of the tree generator
+    :param rng: numpy.random.Generator or seed (None keeps the global random states)
+    :return: randomly generated process tree
+    """
+    from pm4py.algo.simulation.tree_generator import algorithm as tree_gen
+    if rng is not None:
+        seed_global_random(get_generator(rng))
     tree_on = tree_gen.apply(parameters=parameters)
     return tree_on
 
 
 def visualise_tree(tree_on):
+    from pm4py.visualization.process_tree import visualizer as pt_visualizer
     gviz = pt_visualizer.apply(tree_on,
                                parameters={pt_visualizer.Variants.WO_DECORATION.value.Parameters.FORMAT: "png"})
     pt_visualizer.view(gviz)
@@ -80,61 +90,28 @@ def count_real_acs(leaves):
     return count
 
 
-def count_leaf_ran(leaves, leaf):
-    count = 0
-    for x in leaves:
-        if x._get_label() == leaf:
-            count = count + 1
-    return count
-
-
-def break_down_tree_fully(tree):
-    operators_list = []
-    all_tree_list_without_leaves = []
-    tree_dict = {}
-    if tree._get_children() == list():
-        tree_dict[0] = tree
-    else:
-        j = 0
-        operators_list.append(tree._get_operator())
-        all_tree_list_without_leaves.append(tree)
-        tree_list = []
-        children_tree = tree._get_children()
-        for x in children_tree:
-            tree_list.append(x)
-        for child in tree_list:
-            if child._get_children() == list():
-                tree_dict[j] = child._get_label()
-                j = j + 1
-            else:
-                operators_list.append(child._get_operator())
-                all_tree_list_without_leaves.append(child)
-                for ch_child in child._get_children():
-                    tree_list.append(ch_child)
-    return operators_list, all_tree_list_without_leaves, tree_dict
-
-
-def generate_specific_trees(str_clp='middle'):
+def generate_specific_trees(str_clp='middle', rng=None):
     """ Generation of a random process tree with different complexity
 
     :param str_clp: complexity of process tree ['simple','middle','complex']
+    :param rng: numpy.random.Generator or seed (see generate_tree)
     :return: randomly generated process tree
     """
     if str_clp == 'simple':
         parameters = {'mode': 10, 'min': 8, 'max': 12, 'sequence': 0.25, 'choice': 0.25, 'parallel': 0.25, 'loop': 0.2,
                       'or': 0, 'silent': 0, 'duplicate': 0, 'lt_dependency': 0, 'infrequent': 0.25, 'no_models': 10,
                       'unfold': 10, 'max_repeat': 10}
-        tree_ran = generate_tree(parameters)
+        tree_ran = generate_tree(parameters, rng)
     elif str_clp == 'middle':
         parameters = {'mode': 18, 'min': 14, 'max': 20, 'sequence': 0.25, 'choice': 0.3, 'parallel': 0.25, 'loop': 0.25,
                       'or': 0, 'silent': 0, 'duplicate': 0, 'lt_dependency': 0, 'infrequent': 0.25, 'no_models': 10,
                       'unfold': 10, 'max_repeat': 10}
-        tree_ran = generate_tree(parameters)
+        tree_ran = generate_tree(parameters, rng)
     else:
         parameters = {'mode': 25, 'min': 20, 'max': 30, 'sequence': 0.25, 'choice': 0.3, 'parallel': 0.25, 'loop': 0.3,
                       'or': 0, 'silent': 0, 'duplicate': 0, 'lt_dependency': 0, 'infrequent': 0.25, 'no_models': 10,
                       'unfold': 10, 'max_repeat': 10}
-        tree_ran = generate_tree(parameters)
+        tree_ran = generate_tree(parameters, rng)
     return tree_ran
 
 
@@ -180,62 +157,6 @@ def check_operator_multiple(trees, operator):
     return loc
 
 
-def get_position_in_children(children, child):
-    position = 0
-    for x in children:
-        if x == child:
-            break
-        else:
-            position = position + 1
-    return position
-
-
-def check_same_parent(part_one, part_two):
-    same_parent = False
-    for te in get_leaves_of_part_tree(part_two):
-        if te in get_leaves_of_part_tree(part_one):
-            same_parent = True
-            break
-    for te in get_leaves_of_part_tree(part_one):
-        if te in get_leaves_of_part_tree(part_two):
-            same_parent = True
-            break
-    return same_parent
-
-
-def check_parent_of(part_one, part_two):
-    same_parent = False
-    for te in get_leaves_of_part_tree(part_two):
-        if te in get_leaves_of_part_tree(part_one):
-            same_parent = True
-            break
-    if same_parent != True and (
-            part_two._get_operator() == get_type_operator("xor loop") and len(part_two.children) >= 3):
-        same_parent = True
-    return same_parent
-
-
-def check_num_leaves(tree_list, length, changed_acs, operator=None):
-    correct = False
-    for x in tree_list:
-        if check_tree_part(x, length, changed_acs, operator):
-            correct = True
-            break
-    return correct
-
-
-def check_tree_part(x, length, changed_acs, operator=None):
-    correct = False
-    if count_real_acs(get_leaves_of_part_tree(x)) == length and ((operator is None) or (
-            operator is not None and (operator != 'xor loop' or (operator == 'xor loop' and len(x.children) < 3)))):
-        correct = True
-        for ac in get_leaves_of_part_tree(x):
-            if ac in changed_acs:
-                correct = False
-                break
-    return correct
-
-
 def get_right_rand_ac(count, tree):
     leaves = tree._get_leaves()
     leaves_la = []
@@ -252,6 +173,11 @@ def import_process_model(str_cf):
     :param str_cf: filepath as string
     :return: process tree
     """
+    import pm4py
+    from pm4py.objects.process_tree.importer import importer as ptml_importer
+    from pm4py.objects.conversion.bpmn import converter as bpmn_converter
+    from pm4py.objects.conversion.wf_net import converter as wf_net_converter
+    from pm4py.objects.petri_net.importer import importer as pnml_importer
     if re.fullmatch('.*\.ptml', str_cf):
         return ptml_importer.apply(str_cf)
     elif re.fullmatch('.*\.bpmn', str_cf):
@@ -269,6 +195,9 @@ def change_process_model(model):
     :param model: process model (BPMN/ process tree)
     :return: process tree
     """
+    from pm4py.objects.bpmn.obj import BPMN
+    from pm4py.objects.conversion.bpmn import converter as bpmn_converter
+    from pm4py.objects.conversion.wf_net import converter as wf_net_converter
     if isinstance(model, ProcessTree):
         return model
     elif isinstance(model, BPMN):
@@ -354,6 +283,9 @@ def get_position_in_child_list(x, ac, operator):
 
 
 def check_condition_empty_trace_one(tree, tree_part):
+    if tree_part._get_parent() is None:
+        # the root leaf is the only activity of the tree and cannot be deleted
+        return False
     first_check=  ((tree._get_operator() != get_type_operator('xor') and tree._get_operator() != get_type_operator(
         'xor loop') and tree._get_operator() != get_type_operator('or')) or (
                     tree_part._get_parent()._get_operator() != get_type_operator(
@@ -393,33 +325,44 @@ def check_condition_empty_trace_two(tree, tree_part, operator):
 """ ALGORITHMS FOR RANDOM EVOLUTION """
 
 
-def swap_two_existing_activities_ran(tree, activity_one, activity_two):
-    leaves = tree._get_leaves()
-    first = True
-    second = True
-    for leaf in leaves:
-        if (leaf._get_label() == activity_one or (leaf._get_label() is None and activity_one == '*tau*')) and first:
-            leaf._set_label(activity_two)
-            first = False
-        elif (leaf._get_label() == activity_two or (leaf._get_label() is None and activity_two == '*tau*')) and second:
-            leaf._set_label(activity_one)
-            second = False
-
-
-def change_random_operator_num(tree, wish_operator, length, changed_acs):
-    operators_list, all_tree_operator_list, tree_dict = break_down_tree_fully(tree)
-    if check_num_leaves(all_tree_operator_list, length, changed_acs, wish_operator):
-        i = randint(0, len(operators_list) - 1)
-        while not check_tree_part(all_tree_operator_list[i], length, changed_acs, wish_operator):
-            i = randint(0, len(operators_list) - 1)
-        if check_condition_empty_trace_two(tree, all_tree_operator_list[i], wish_operator) and wish_operator != all_tree_operator_list[i]._get_operator() and (wish_operator != get_type_operator('xor loop') or (wish_operator == get_type_operator('xor loop') and 1 < len(all_tree_operator_list[i].children) < 4)):
-            leaves = get_leaves_of_part_tree(all_tree_operator_list[i])
-            for leaf in leaves:
-                if leaf._get_label() is None:
-                    continue
-                else:
-                    changed_acs.append(leaf)
-            all_tree_operator_list[i]._set_operator(wish_operator)
+def swap_two_existing_activities_ran(tree, activity_one, activity_two, index=None, journal=None):
+    index = get_tree_index(tree, index)
+    leaves_one = index.get_leaves_with_label(None if activity_one == '*tau*' else activity_one)
+    leaves_two = index.get_leaves_with_label(None if activity_two == '*tau*' else activity_two)
+    leaves = leaves_one[:1] + leaves_two[:1]
+    labels = [activity_two] * len(leaves_one[:1]) + [activity_one] * len(leaves_two[:1])
+    record_change(journal, ChangeRecord('activities swapped', tuple(index.get_path(leaf) for leaf in leaves),
+                                        tuple(leaf._get_label() for leaf in leaves), tuple(labels), moved=leaves))
+    if leaves_one:
+        index.set_label(leaves_one[0], activity_two)
+    if leaves_two:
+        index.set_label(leaves_two[0], activity_one)
+
+
+def copy_leaf(leaf):
+    """ Detached copy of a leaf (a deepcopy would copy the whole tree via the parent) """
+    return ProcessTree(None, None, None, leaf._get_label())
+
+
+def choose_candidate(candidates, rng=None):
+    """ Uniform choice of one of the candidates (None if there is no candidate) """
+    if not candidates:
+        return None
+    return candidates[draw_integer(rng, 0, len(candidates) - 1)]
+
+
+def change_random_operator_num(tree, wish_operator, length, changed_acs, index=None, journal=None, rng=None):
+    index = get_tree_index(tree, index)
+    rng = get_generator(rng)
+    changed_labels = get_changed_labels(changed_acs)
+    part = choose_candidate(index.get_candidates(length, changed_labels, wish_operator), rng)
+    if part is not None:
+        if check_condition_empty_trace_two(tree, part, wish_operator) and wish_operator != part._get_operator() and (wish_operator != get_type_operator('xor loop') or (wish_operator == get_type_operator('xor loop') and 1 < len(part.children) < 4)):
+            leaves = index.get_real_leaves(part)
+            changed_acs.extend(leaves)
+            record_change(journal, ChangeRecord('operator replaced', (index.get_path(part),), (part._get_operator(),),
+                                                (wish_operator,), moved=leaves))
+            index.set_operator(part, wish_operator)
             return True
         else:
             return False
@@ -427,31 +370,17 @@ def change_random_operator_num(tree, wish_operator, length, changed_acs):
         return False
 
 
-def delete_random_tree_part(tree, length, changed_acs):
-    operators_list, all_tree_operator_list, tree_dict = break_down_tree_fully(tree)
-    if check_num_leaves(all_tree_operator_list, length, changed_acs):
-        i = randint(1, len(operators_list) - 1)
-        while not check_tree_part(all_tree_operator_list[i], length, changed_acs):
-            i = randint(0, len(operators_list) - 1)
-        if check_condition_empty_trace_one(tree, all_tree_operator_list[i]):
-            leaves = get_leaves_of_part_tree(all_tree_operator_list[i])
-            for leaf in leaves:
-                if leaf._get_label() is None:
-                    continue
-                else:
-                    changed_acs.append(copy.deepcopy(leaf))
-            emp = ProcessTree(None, None, None, None)
-            parent = all_tree_operator_list[i]._get_parent()
-            children = parent.children
-            position = 0
-            for x in children:
-                if x == all_tree_operator_list[i]:
-                    break
-                else:
-                    position = position + 1
-            emp._set_parent(parent)
-            children[position] = emp
-            parent._set_children(children)
+def delete_random_tree_part(tree, length, changed_acs, index=None, journal=None, rng=None):
+    index = get_tree_index(tree, index)
+    rng = get_generator(rng)
+    changed_labels = get_changed_labels(changed_acs)
+    part = choose_candidate(index.get_candidates(length, changed_labels, with_root=False), rng)
+    if part is not None:
+        if check_condition_empty_trace_one(tree, part):
+            leaves = [copy_leaf(leaf) for leaf in index.get_real_leaves(part)]
+            changed_acs.extend(leaves)
+            record_change(journal, ChangeRecord('tree fragment deleted', (index.get_path(part),), deleted=leaves))
+            index.replace(part, ProcessTree(None, None, None, None))
             return True
         else:
             return False
@@ -459,383 +388,308 @@ def delete_random_tree_part(tree, length, changed_acs):
         return False
 
 
-def replace_activity_ran(tree, activity_old, activity_new, changed_acs):
-    leaves = tree._get_leaves()
+def replace_activity_ran(tree, activity_old, activity_new, changed_acs, index=None, journal=None):
+    index = get_tree_index(tree, index)
     worked = False
     if activity_old is not None:
-        for leaf in leaves:
-            if leaf._get_label() == activity_old:
-                changed_acs.append(copy.deepcopy(leaf))
-                leaf._set_label(activity_new)
-                changed_acs.append(leaf)
-                worked = True
-                break
+        leaves = index.get_leaves_with_label(activity_old)
+        if leaves:
+            old = copy_leaf(leaves[0])
+            changed_acs.append(old)
+            record_change(journal, ChangeRecord('activity replaced', (index.get_path(leaves[0]),), (activity_old,),
+                                                (activity_new,), added=[leaves[0]], deleted=[old]))
+            index.set_label(leaves[0], activity_new)
+            changed_acs.append(leaves[0])
+            worked = True
     return worked
 
 
-def delete_activity_ran(tree, activity, changed_acs):
-    leaves = tree._get_leaves()
+def delete_activity_ran(tree, activity, changed_acs, index=None, journal=None):
+    index = get_tree_index(tree, index)
     worked = False
-    for leaf in leaves:
-        if leaf._get_label() == activity and check_condition_empty_trace_one(tree, leaf):
-            changed_acs.append(copy.deepcopy(leaf))
-            leaf._set_label(None)
+    for leaf in index.get_leaves_with_label(activity):
+        if check_condition_empty_trace_one(tree, leaf):
+            old = copy_leaf(leaf)
+            changed_acs.append(old)
+            record_change(journal, ChangeRecord('activity deleted', (index.get_path(leaf),), (activity,), (None,),
+                                                deleted=[old]))
+            index.set_label(leaf, None)
             worked = True
             break
     return worked
 
 
-def add_random_activity(tree, ac, changed_acs):
-    operators_list, all_tree_operator_list, tree_dict = break_down_tree_fully(tree)
-    position = randint(0, len(operators_list) - 1)
-    while all_tree_operator_list[position]._get_operator() == get_type_operator('xor loop') and len(
-            all_tree_operator_list[position].children) >= 3:
-        position = randint(0, len(operators_list) - 1)
+def add_random_activity(tree, ac, changed_acs, index=None, journal=None, rng=None):
+    index = get_tree_index(tree, index)
+    rng = get_generator(rng)
+    parent = choose_candidate(index.get_catalog(get_changed_labels(changed_acs)).open_operators, rng)
+    if parent is None:
+        return False
     tree_ac = ProcessTree(None, None, None, ac)
-    children = all_tree_operator_list[position].children
-    children.append(tree_ac)
-    tree_ac._set_parent(all_tree_operator_list[position])
-    all_tree_operator_list[position]._set_children(children)
+    record_change(journal, ChangeRecord('activity added', (index.get_path(parent),), (), (ac,), added=[tree_ac]))
+    index.append_child(parent, tree_ac)
     changed_acs.append(tree_ac)
+    return True
 
 
-def swap_random_tree_part(tree, length, changed_acs):
-    operators_list, all_tree_operator_list, tree_dict = break_down_tree_fully(tree)
-    l = randint(1, length - 2)
+def swap_random_tree_part(tree, length, changed_acs, index=None, journal=None, rng=None):
+    index = get_tree_index(tree, index)
+    rng = get_generator(rng)
+    changed_labels = get_changed_labels(changed_acs)
+    l = draw_integer(rng, 1, length - 2)
     j = length - l
-    i_one = randint(0, len(operators_list) - 1)
-    i_two = randint(0, len(operators_list) - 1)
-    while i_one == i_two:
-        i_two = randint(0, len(operators_list) - 1)
-    if check_num_leaves(all_tree_operator_list, l, changed_acs) and check_num_leaves(all_tree_operator_list, j,
-                                                                                     changed_acs):
-        while not check_tree_part(all_tree_operator_list[i_one], l, changed_acs):
-            i_one = randint(0, len(operators_list) - 1)
-        while not check_tree_part(all_tree_operator_list[i_two], j, changed_acs):
-            i_two = randint(0, len(operators_list) - 1)
-        if check_same_parent(all_tree_operator_list[i_one], all_tree_operator_list[i_two]):
+    part_one = choose_candidate(index.get_candidates(l, changed_labels), rng)
+    part_two = choose_candidate(index.get_candidates(j, changed_labels), rng)
+    if part_one is not None and part_two is not None and part_one is not part_two:
+        if not index.get_labels(part_one).isdisjoint(index.get_labels(part_two)):
             return False
         else:
-            leaves_one = get_leaves_of_part_tree(all_tree_operator_list[i_one])
-            leaves_two = get_leaves_of_part_tree(all_tree_operator_list[i_two])
-            for leaf in leaves_one:
-                if leaf._get_label() is None:
-                    continue
-                else:
-                    changed_acs.append(leaf)
-            for leaf in leaves_two:
-                if leaf._get_label() is None:
-                    continue
-                else:
-                    changed_acs.append(leaf)
-            parent_one = all_tree_operator_list[i_one]._get_parent()
-            parent_two = all_tree_operator_list[i_two]._get_parent()
-            children_one = parent_one.children
-            children_two = parent_two.children
-            position_one = get_position_in_children(children_one, all_tree_operator_list[i_one])
-            position_two = get_position_in_children(children_two, all_tree_operator_list[i_two])
-            all_tree_operator_list[i_one]._set_parent(parent_two)
-            children_two[position_two] = all_tree_operator_list[i_one]
-            parent_two._set_children(children_two)
-            all_tree_operator_list[i_two]._set_parent(parent_one)
-            children_one[position_one] = all_tree_operator_list[i_two]
-            parent_one._set_children(children_one)
+            leaves = index.get_real_leaves(part_one) + index.get_real_leaves(part_two)
+            changed_acs.extend(leaves)
+            record_change(journal, ChangeRecord('tree fragments swapped',
+                                                (index.get_path(part_one), index.get_path(part_two)), moved=leaves))
+            index.swap(part_one, part_two)
             return True
     else:
         return False
 
 
-def swap_random_ac_with_tree_part(tree, length, ac, changed_acs):
-    operators_list, all_tree_operator_list, tree_dict = break_down_tree_fully(tree)
-    if check_num_leaves(all_tree_operator_list, length - 1, changed_acs):
-        i = randint(1, len(operators_list) - 1)
-        while not check_tree_part(all_tree_operator_list[i], length - 1, changed_acs):
-            i = randint(0, len(operators_list) - 1)
-        if ac in get_leaves_of_part_tree(all_tree_operator_list[i]) or (
-                ac._get_parent() == all_tree_operator_list[i]._get_parent()
-                and (ac._get_parent()._get_operator() != get_type_operator('seq')
-                     or ac._get_parent()._get_operator() != get_type_operator('xor loop'))):
+def swap_random_ac_with_tree_part(tree, length, ac, changed_acs, index=None, journal=None, rng=None):
+    index = get_tree_index(tree, index)
+    rng = get_generator(rng)
+    changed_labels = get_changed_labels(changed_acs)
+    part = choose_candidate(index.get_candidates(length - 1, changed_labels, with_root=False), rng)
+    if part is not None:
+        parent = index.get_parent(ac)
+        if ac._get_label() in index.get_labels(part) or (
+                parent is index.get_parent(part)
+                and (parent._get_operator() != get_type_operator('seq')
+                     or parent._get_operator() != get_type_operator('xor loop'))):
             return False
         else:
-            changed_acs.append(ac)
-            leaves = get_leaves_of_part_tree(all_tree_operator_list[i])
-            for leaf in leaves:
-                if leaf._get_label() is None:
-                    continue
-                else:
-                    changed_acs.append(leaf)
-            parent_one = ac._get_parent()
-            parent_two = all_tree_operator_list[i]._get_parent()
-            children_one = parent_one.children
-            children_two = parent_two.children
-            position_one = get_position_in_children(children_one, ac)
-            position_two = get_position_in_children(children_two, all_tree_operator_list[i])
-            ac._set_parent(parent_two)
-            children_two[position_two] = ac
-            parent_two._set_children(children_two)
-            all_tree_operator_list[i]._set_parent(parent_one)
-            children_one[position_one] = all_tree_operator_list[i]
-            parent_one._set_children(children_one)
+            leaves = [ac] + index.get_real_leaves(part)
+            changed_acs.extend(leaves)
+            record_change(journal, ChangeRecord('activity with tree fragment swapped',
+                                                (index.get_path(ac), index.get_path(part)), moved=leaves))
+            index.swap(ac, part)
             return True
     else:
         return False
 
 
-def swap_random_ops(tree, length, changed_acs):
-    operators_list, all_tree_operator_list, tree_dict = break_down_tree_fully(tree)
-    l = randint(1, length - 2)
+def swap_random_ops(tree, length, changed_acs, index=None, journal=None, rng=None):
+    index = get_tree_index(tree, index)
+    rng = get_generator(rng)
+    changed_labels = get_changed_labels(changed_acs)
+    l = draw_integer(rng, 1, length - 2)
     j = length - l
-    i_one = randint(0, len(operators_list) - 1)
-    i_two = randint(0, len(operators_list) - 1)
-    while i_one == i_two:
-        i_two = randint(0, len(operators_list) - 1)
-    if check_num_leaves(all_tree_operator_list, l, changed_acs) and check_num_leaves(all_tree_operator_list, j,
-                                                                                     changed_acs):
-        while not check_tree_part(all_tree_operator_list[i_one], l, changed_acs):
-            i_one = randint(0, len(operators_list) - 1)
-        while not check_tree_part(all_tree_operator_list[i_two], j, changed_acs):
-            i_two = randint(0, len(operators_list) - 1)
-        if all_tree_operator_list[i_one]._get_operator() == all_tree_operator_list[i_two]._get_operator() or ((all_tree_operator_list[i_one]._get_operator() == get_type_operator('xor loop')
-                                                                                                               and len(all_tree_operator_list[i_two].children) > 3)
-                                                                                                              or (all_tree_operator_list[i_two]._get_operator() == get_type_operator(
-                                                                                                                  'xor loop') and len(
-                                                                                                                  all_tree_operator_list[i_one].children) > 3)) \
-                or not check_condition_empty_trace_two(tree, all_tree_operator_list[i_one], all_tree_operator_list[i_two]._get_operator()) \
-                or not check_condition_empty_trace_two(tree, all_tree_operator_list[i_two], all_tree_operator_list[i_one]._get_operator()):
+    part_one = choose_candidate(index.get_candidates(l, changed_labels), rng)
+    part_two = choose_candidate(index.get_candidates(j, changed_labels), rng)
+    if part_one is not None and part_two is not None and part_one is not part_two:
+        if part_one._get_operator() == part_two._get_operator() or ((part_one._get_operator() == get_type_operator('xor loop')
+                                                                     and len(part_two.children) > 3)
+                                                                    or (part_two._get_operator() == get_type_operator(
+                                                                        'xor loop') and len(part_one.children) > 3)) \
+                or not check_condition_empty_trace_two(tree, part_one, part_two._get_operator()) \
+                or not check_condition_empty_trace_two(tree, part_two, part_one._get_operator()):
             return False
         else:
-            leaves_one = get_leaves_of_part_tree(all_tree_operator_list[i_one])
-            leaves_two = get_leaves_of_part_tree(all_tree_operator_list[i_two])
-            for leaf in leaves_one:
-                if leaf._get_label() is None:
-                    continue
-                else:
-                    changed_acs.append(leaf)
-            for leaf in leaves_two:
-                if leaf not in changed_acs:
-                    if leaf._get_label() is None:
-                        continue
-                    else:
-                        changed_acs.append(leaf)
-            operator_one = all_tree_operator_list[i_one]._get_operator()
-            operator_two = all_tree_operator_list[i_two]._get_operator()
-            all_tree_operator_list[i_one]._set_operator(operator_two)
-            all_tree_operator_list[i_two]._set_operator(operator_one)
+            leaves = index.get_real_leaves(part_one)
+            labels_one = {leaf._get_label() for leaf in leaves}
+            for leaf in index.get_real_leaves(part_two):
+                if leaf._get_label() not in changed_labels and leaf._get_label() not in labels_one:
+                    leaves.append(leaf)
+            changed_acs.extend(leaves)
+            operator_one = part_one._get_operator()
+            operator_two = part_two._get_operator()
+            record_change(journal, ChangeRecord('operators swapped',
+                                                (index.get_path(part_one), index.get_path(part_two)),
+                                                (operator_one, operator_two), (operator_two, operator_one),
+                                                moved=leaves))
+            index.set_operator(part_one, operator_two)
+            index.set_operator(part_two, operator_one)
             return True
     else:
         return False
 
 
-def move_random_tree_fragment(tree, length, changed_acs):
-    operators_list, all_tree_operator_list, tree_dict = break_down_tree_fully(tree)
-    if check_num_leaves(all_tree_operator_list, length, changed_acs):
-        i = randint(1, len(operators_list) - 1)
-        while not check_tree_part(all_tree_operator_list[i], length, changed_acs):
-            i = randint(1, len(operators_list) - 1)
-        y = randint(0, len(operators_list) - 1)
-        while y == i or all_tree_operator_list[i].parent == all_tree_operator_list[y]:
-            y = randint(0, len(operators_list) - 1)
-        if check_parent_of(all_tree_operator_list[i], all_tree_operator_list[y]) or not check_condition_empty_trace_one(tree,
-                                                                                                                        all_tree_operator_list[
-                                                                                                               i]):
+def move_random_tree_fragment(tree, length, changed_acs, index=None, journal=None, rng=None):
+    index = get_tree_index(tree, index)
+    rng = get_generator(rng)
+    changed_labels = get_changed_labels(changed_acs)
+    part = choose_candidate(index.get_candidates(length, changed_labels, with_root=False), rng)
+    all_tree_operator_list = index.get_catalog(changed_labels).operators
+    if part is not None and len(all_tree_operator_list) > 2:
+        # all operator nodes except the fragment and its parent are targets, so the rejection ends after a few draws
+        target = part
+        while target is part or index.get_parent(part) is target:
+            target = all_tree_operator_list[draw_integer(rng, 0, len(all_tree_operator_list) - 1)]
+        if not index.get_labels(part).isdisjoint(index.get_labels(target)) or (
+                target._get_operator() == get_type_operator("xor loop") and len(target.children) >= 3) \
+                or not check_condition_empty_trace_one(tree, part):
             return False
         else:
-            leaves = get_leaves_of_part_tree(all_tree_operator_list[i])
-            for leaf in leaves:
-                if leaf._get_label() is None:
-                    continue
-                else:
-                    changed_acs.append(leaf)
-            parent = all_tree_operator_list[i].parent
-            parent_children = parent.children
-            position = get_position_in_children(parent_children, all_tree_operator_list[i])
-            emp_tree = ProcessTree(None, None, None, None)
-            emp_tree._set_parent(parent)
-            parent_children[position] = emp_tree
-            parent._set_children(parent_children)
-            children = all_tree_operator_list[y].children
-            children.append(all_tree_operator_list[i])
-            all_tree_operator_list[i]._set_parent(all_tree_operator_list[y])
+            leaves = index.get_real_leaves(part)
+            changed_acs.extend(leaves)
+            record_change(journal, ChangeRecord('tree fragment moved', (index.get_path(part), index.get_path(target)),
+                                                moved=leaves))
+            index.replace(part, ProcessTree(None, None, None, None))
+            index.append_child(target, part)
             return True
     else:
         return False
 
 
-def add_random_op_ac(tree, ac, op, length, changed_acs):
-    operators_list, all_tree_operator_list, tree_dict = break_down_tree_fully(tree)
-    if check_num_leaves(all_tree_operator_list, length - 1, changed_acs):
-        i = randint(1, len(operators_list) - 1)
-        while not check_tree_part(all_tree_operator_list[i], length - 1, changed_acs):
-            i = randint(0, len(operators_list) - 1)
-        leaves = get_leaves_of_part_tree(all_tree_operator_list[i])
-        for leaf in leaves:
-            if leaf._get_label() is None:
-                continue
-            else:
-                changed_acs.append(leaf)
-        parent = all_tree_operator_list[i]._get_parent()
+def add_random_op_ac(tree, ac, op, length, changed_acs, index=None, journal=None, rng=None):
+    index = get_tree_index(tree, index)
+    rng = get_generator(rng)
+    changed_labels = get_changed_labels(changed_acs)
+    part = choose_candidate(index.get_candidates(length - 1, changed_labels, with_root=False), rng)
+    if part is not None:
+        leaves = index.get_real_leaves(part)
+        changed_acs.extend(leaves)
         tree_ac = ProcessTree(None, None, None, ac)
         tree_op = ProcessTree(get_type_operator(op), None, None, None)
-        combine_three_trees(tree_op, tree_ac, all_tree_operator_list[i])
-        children = parent.children
-        position = 0
-        for x in children:
-            if x == all_tree_operator_list[i]:
-                break
-            else:
-                position = position + 1
-        children[position] = tree_op
-        tree_op._set_parent(parent)
-        parent._set_children(children)
+        record_change(journal, ChangeRecord('activity and operator added', (index.get_path(part),), (),
+                                            (get_type_operator(op), ac), added=[tree_ac], moved=leaves))
+        tree_op._set_children([tree_ac])
+        tree_ac._set_parent(tree_op)
+        index.replace(part, tree_op)
+        index.append_child(tree_op, part)
         changed_acs.append(tree_ac)
         return True
     else:
         return False
 
 
-def randomize_tree_one(tree_one, happen, changed_acs, count):
-    i = randint(0, 1)
-    leaves = tree_one._get_leaves()
+def randomize_tree_one(tree_one, changed_acs, count, index=None, journal=None, rng=None):
+    index = get_tree_index(tree_one, index)
+    rng = get_generator(rng)
+    i = draw_integer(rng, 0, 1)
     worked = True
     if i == 0:
-        ran = randint(0, len(leaves) - 1)
-        while leaves[ran]._get_label() is None or leaves[ran] in changed_acs:
-            ran = randint(0, len(leaves) - 1)
-        happen = happen + "activity deleted; "
-        worked = delete_activity_ran(tree_one, leaves[ran]._get_label(), changed_acs)
+        leaf = choose_candidate(index.get_catalog(get_changed_labels(changed_acs)).unchanged_real_leaves, rng)
+        worked = leaf is not None and delete_activity_ran(tree_one, leaf._get_label(), changed_acs, index, journal)
     elif i == 1:
-        happen = happen + "activity added; "
-        count = get_right_rand_ac(count, tree_one)
-        add_random_activity(tree_one, 'Random activity ' + str(count), changed_acs)
+        count = index.get_right_rand_ac(count)
+        worked = add_random_activity(tree_one, 'Random activity ' + str(count), changed_acs, index, journal, rng)
         count = count + 1
-    return happen, worked, count
+    return worked, count
 
 
-def randomize_tree_two(tree_one, happen, changed_acs, count):
+def randomize_tree_two(tree_one, changed_acs, count, index=None, journal=None, rng=None):
+    index = get_tree_index(tree_one, index)
+    rng = get_generator(rng)
     length = 2
-    i = randint(0, 4)
-    leaves = tree_one._get_leaves()
+    i = draw_integer(rng, 0, 4)
+    leaves = index.get_tree_leaves()
     worked = True
     if i == 2:
-        i = randint(0, 4)
+        i = draw_integer(rng, 0, 4)
     if i == 0:
-        if len(leaves) > 2:
-            ran_one = randint(0, len(leaves) - 1)
-            ran_two = randint(0, len(leaves) - 1)
-            while ran_one == ran_two or leaves[ran_one] in changed_acs or leaves[
-                ran_two] in changed_acs or (
-                    leaves[ran_one]._get_label() is None or leaves[ran_two]._get_label() is None):
-                ran_one = randint(0, len(leaves) - 1)
-                ran_two = randint(0, len(leaves) - 1)
-            if leaves[ran_one]._get_parent() == leaves[ran_two]._get_parent() and (
-                    leaves[ran_one]._get_parent()._get_operator() != get_type_operator('xor loop') or leaves[
-                ran_one]._get_parent()._get_operator() != get_type_operator('seq')) or leaves[ran_one]._get_label() == \
-                    leaves[ran_two]._get_label() \
-                    or count_leaf_ran(tree_one._get_leaves(), leaves[ran_one]._get_label()) > 1 < count_leaf_ran(
-                tree_one._get_leaves(), leaves[ran_two]._get_label()):
+        candidates = index.get_catalog(get_changed_labels(changed_acs)).unchanged_real_leaves
+        if len(leaves) > 2 and len(candidates) < 2:
+            worked = False
+        elif len(leaves) > 2:
+            ran_one = draw_integer(rng, 0, len(candidates) - 1)
+            ran_two = draw_integer(rng, 0, len(candidates) - 2)
+            if ran_two >= ran_one:
+                ran_two = ran_two + 1
+            leaf_one = candidates[ran_one]
+            leaf_two = candidates[ran_two]
+            if index.get_parent(leaf_one) is index.get_parent(leaf_two) and (
+                    index.get_parent(leaf_one)._get_operator() != get_type_operator('xor loop') or index.get_parent(
+                leaf_one)._get_operator() != get_type_operator('seq')) or leaf_one._get_label() == \
+                    leaf_two._get_label() \
+                    or index.count_label(leaf_one._get_label()) > 1 < index.count_label(leaf_two._get_label()):
                 worked = False
             else:
-                changed_acs.append(leaves[ran_one])
-                changed_acs.append(leaves[ran_two])
-                happen = happen + "activities swapped; "
-                swap_two_existing_activities_ran(tree_one, leaves[ran_one]._get_label(), leaves[ran_two]._get_label())
+                changed_acs.append(leaf_one)
+                changed_acs.append(leaf_two)
+                swap_two_existing_activities_ran(tree_one, leaf_one._get_label(), leaf_two._get_label(), index, journal)
     elif i == 1:
         opera_list = ['seq', 'xor', 'xor loop', 'and']
-        ran_op = randint(0, len(opera_list) - 1)
-        happen = happen + "operator replaced; "
-        worked = change_random_operator_num(tree_one, get_type_operator(opera_list[ran_op]), length, changed_acs)
+        ran_op = draw_integer(rng, 0, len(opera_list) - 1)
+        worked = change_random_operator_num(tree_one, get_type_operator(opera_list[ran_op]), length, changed_acs,
+                                            index, journal, rng)
     elif i == 2:
-        happen = happen + "tree fragment deleted; "
-        worked = delete_random_tree_part(tree_one, length, changed_acs)
+        worked = delete_random_tree_part(tree_one, length, changed_acs, index, journal, rng)
     elif i == 3:
-        happen = happen + "tree fragment moved; "
-        worked = move_random_tree_fragment(tree_one, length, changed_acs)
+        worked = move_random_tree_fragment(tree_one, length, changed_acs, index, journal, rng)
     elif i == 4:
-        ran = randint(0, len(leaves) - 1)
-        while leaves[ran] in changed_acs:
-            ran = randint(0, len(leaves) - 1)
-        happen = happen + "activity replaced; "
-        count = get_right_rand_ac(count, tree_one)
-        worked = replace_activity_ran(tree_one, leaves[ran]._get_label(), 'Random activity ' + str(count), changed_acs)
+        leaf = choose_candidate(index.get_catalog(get_changed_labels(changed_acs)).unchanged_leaves, rng)
+        count = index.get_right_rand_ac(count)
+        worked = leaf is not None and replace_activity_ran(tree_one, leaf._get_label(),
+                                                           'Random activity ' + str(count), changed_acs, index, journal)
         count = count + 1
-    return happen, worked, count
+    return worked, count
 
 
-def randomize_tree_three(tree_one, happen, length, changed_acs, count):
-    i = randint(0, 4)
+def randomize_tree_three(tree_one, length, changed_acs, count, index=None, journal=None, rng=None):
+    index = get_tree_index(tree_one, index)
+    rng = get_generator(rng)
+    i = draw_integer(rng, 0, 4)
     worked = True
     if i == 1:
-        i = randint(0, 4)
+        i = draw_integer(rng, 0, 4)
     if i == 0:
         opera_list = ['seq', 'xor', 'xor loop', 'and']
-        ran_op = randint(0, len(opera_list) - 1)
-        happen = happen + "operator replaced; "
-        worked = change_random_operator_num(tree_one, get_type_operator(opera_list[ran_op]), length, changed_acs)
+        ran_op = draw_integer(rng, 0, len(opera_list) - 1)
+        worked = change_random_operator_num(tree_one, get_type_operator(opera_list[ran_op]), length, changed_acs,
+                                            index, journal, rng)
     elif i == 1:
-        happen = happen + "tree fragment deleted; "
-        worked = delete_random_tree_part(tree_one, length, changed_acs)
+        worked = delete_random_tree_part(tree_one, length, changed_acs, index, journal, rng)
     elif i == 2:
-        happen = happen + "activity and operator added; "
         opera_list = ['seq', 'xor', 'xor loop', 'and']
-        ran_op = randint(0, len(opera_list) - 1)
-        count = get_right_rand_ac(count, tree_one)
+        ran_op = draw_integer(rng, 0, len(opera_list) - 1)
+        count = index.get_right_rand_ac(count)
         worked = add_random_op_ac(tree_one, 'Random activity ' + str(count), opera_list[ran_op], length,
-                                          changed_acs)
+                                  changed_acs, index, journal, rng)
         if worked:
             count = count + 1
     elif i == 3:
-        leaves = tree_one._get_leaves()
-        ran_do = randint(0, len(leaves) - 1)
-        while leaves[ran_do]._get_label() is None or leaves[ran_do] in changed_acs:
-            ran_do = randint(0, len(leaves) - 1)
-        happen = happen + "activity with tree fragment swapped; "
-        worked = swap_random_ac_with_tree_part(tree_one, length, leaves[ran_do], changed_acs)
+        leaf = choose_candidate(index.get_catalog(get_changed_labels(changed_acs)).unchanged_real_leaves, rng)
+        worked = leaf is not None and swap_random_ac_with_tree_part(tree_one, length, leaf, changed_acs, index, journal,
+                                                                    rng)
     elif i == 4:
-        happen = happen + "tree fragment moved; "
-        worked = move_random_tree_fragment(tree_one, length, changed_acs)
-    return happen, worked, count
+        worked = move_random_tree_fragment(tree_one, length, changed_acs, index, journal, rng)
+    return worked, count
 
 
-def randomize_tree_more(tree_one, happen, length, changed_acs, count):
-    i = randint(0, 6)
+def randomize_tree_more(tree_one, length, changed_acs, count, index=None, journal=None, rng=None):
+    index = get_tree_index(tree_one, index)
+    rng = get_generator(rng)
+    i = draw_integer(rng, 0, 6)
     worked = True
     if i == 1:
-        i = randint(0, 6)
+        i = draw_integer(rng, 0, 6)
     if i == 0:
         opera_list = ['seq', 'xor', 'xor loop', 'and']
-        ran_op = randint(0, len(opera_list) - 1)
-        happen = happen + "operator replaced; "
-        worked = change_random_operator_num(tree_one, get_type_operator(opera_list[ran_op]), length, changed_acs)
+        ran_op = draw_integer(rng, 0, len(opera_list) - 1)
+        worked = change_random_operator_num(tree_one, get_type_operator(opera_list[ran_op]), length, changed_acs,
+                                            index, journal, rng)
     elif i == 1:
-        happen = happen + "tree fragment deleted; "
-        worked = delete_random_tree_part(tree_one, length, changed_acs)
+        worked = delete_random_tree_part(tree_one, length, changed_acs, index, journal, rng)
     elif i == 2:
-        happen = happen + "activity and operator added; "
         opera_list = ['seq', 'xor', 'xor loop', 'and']
-        ran_op = randint(0, len(opera_list) - 1)
-        count = get_right_rand_ac(count, tree_one)
+        ran_op = draw_integer(rng, 0, len(opera_list) - 1)
+        count = index.get_right_rand_ac(count)
         worked = add_random_op_ac(tree_one, 'Random activity ' + str(count), opera_list[ran_op], length,
-                                          changed_acs)
+                                  changed_acs, index, journal, rng)
         if worked:
             count = count + 1
     elif i == 3:
-        leaves = tree_one._get_leaves()
-        ran_do = randint(0, len(leaves) - 1)
-        while leaves[ran_do]._get_label() is None or leaves[ran_do]._get_label() in changed_acs:
-            ran_do = randint(0, len(leaves) - 1)
-        happen = happen + "activity with tree fragment swapped; "
-        worked = swap_random_ac_with_tree_part(tree_one, length, leaves[ran_do], changed_acs)
+        leaf = choose_candidate(index.get_catalog(get_changed_labels(changed_acs)).unchanged_real_leaves, rng)
+        worked = leaf is not None and swap_random_ac_with_tree_part(tree_one, length, leaf, changed_acs, index, journal,
+                                                                    rng)
     elif i == 4:
-        happen = happen + "tree fragments swapped; "
-        worked = swap_random_tree_part(tree_one, length, changed_acs)
+        worked = swap_random_tree_part(tree_one, length, changed_acs, index, journal, rng)
         if not worked:
-            worked = swap_random_tree_part(tree_one, length, changed_acs)
+            worked = swap_random_tree_part(tree_one, length, changed_acs, index, journal, rng)
     elif i == 5:
-        happen = happen + "operators swapped; "
-        worked = swap_random_ops(tree_one, length, changed_acs)
+        worked = swap_random_ops(tree_one, length, changed_acs, index, journal, rng)
         if not worked:
-            worked = swap_random_ops(tree_one, length, changed_acs)
+            worked = swap_random_ops(tree_one, length, changed_acs, index, journal, rng)
     elif i == 6:
-        happen = happen + "tree fragment moved; "
-        worked = move_random_tree_fragment(tree_one, length, changed_acs)
-    return happen, worked, count
+        worked = move_random_tree_fragment(tree_one, length, changed_acs, index, journal, rng)
+    return worked, count
@@ -0,0 +1,106 @@
+import time
+
+""" PROFILING OF THE STAGES OF THE LOG GENERATION """
+
+STAGES = ['evolution', 'playout', 'noise', 'durations', 'export']
+
+
+class StageRecord:
+    """ Wall time, number of traces and events and number of retries of one stage of the generation of a log
+
+    A record is used as context manager around the stage: the wall time is measured from entering to leaving it.
+
+    :param name: name of the stage (e.g. one of STAGES)
+    """
+    __slots__ = ('name', 'seconds', 'traces', 'events', 'retries', 'start')
+
+    def __init__(self, name):
+        self.name = name
+        self.seconds = 0.0
+        self.traces = None
+        self.events = None
+        self.retries = 0
+        self.start = None
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.seconds = self.seconds + time.perf_counter() - self.start
+        return False
+
+    def set_log(self, log):
+        """ Recording of the number of traces and events of the log produced by the stage """
+        self.traces = len(log)
+        if hasattr(log, 'num_events'):
+            self.events = log.num_events()
+        else:
+            self.events = sum(len(trace) for trace in log)
+
+    def add_retries(self, retries):
+        self.retries = self.retries + retries
+
+    def to_dict(self):
+        return {'stage': self.name, 'seconds': self.seconds, 'traces': self.traces, 'events': self.events,
+                'retries': self.retries}
+
+
+class NullStage:
+    """ Stage record of a disabled profile that records nothing """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def set_log(self, log):
+        pass
+
+    def add_retries(self, retries):
+        pass
+
+
+NULL_STAGE = NullStage()
+
+
+class LogProfile:
+    """ Stage records of the generation of one log """
+
+    def __init__(self):
+        self.stages = []
+
+    def stage(self, name):
+        """ New stage record (see StageRecord) """
+        record = StageRecord(name)
+        self.stages.append(record)
+        return record
+
+    def get_seconds(self, name):
+        """ Wall time of all stages with a name (None if there is no such stage) """
+        records = [record for record in self.stages if record.name == name]
+        if not records:
+            return None
+        return sum(record.seconds for record in records)
+
+    def get_retries(self, name):
+        return sum(record.retries for record in self.stages if record.name == name)
+
+    def to_list(self):
+        return [record.to_dict() for record in self.stages]
+
+
+def profile_stage(profile, name):
+    """ Stage record for a stage of a profiled generation
+
+    Without profile the shared NULL_STAGE is returned, so that disabled profiling only costs this call.
+
+    :param profile: log profile or None
+    :param name: name of the stage
+    :return: stage record to be used as context manager
+    """
+    if profile is None:
+        return NULL_STAGE
+    return profile.stage(name)
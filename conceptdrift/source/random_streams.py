@@ -0,0 +1,74 @@
+import itertools
+import random
+
+import numpy
+
+""" RANDOM NUMBER STREAMS """
+
+UNIFORM_BATCH = 4096
+
+
+def get_generator(rng=None):
+    """ NumPy generator for a seed, a seed sequence or a generator
+
+    Without rng, a generator is seeded from the global NumPy random state, so code that seeds numpy.random before
+    calling a function still gets the same results.
+
+    :param rng: numpy.random.Generator (returned unchanged), integer seed, numpy.random.SeedSequence or None
+    :return: numpy.random.Generator
+    """
+    if isinstance(rng, numpy.random.Generator):
+        return rng
+    if rng is None:
+        return numpy.random.default_rng(numpy.random.randint(0, 2 ** 63 - 1, dtype=numpy.int64))
+    return numpy.random.default_rng(rng)
+
+
+def spawn_generators(rng, number):
+    """ Independent child streams of a generator (e.g. one per log, segment or stage)
+
+    The children only depend on the seed of the parent and the order of the spawns, not on the numbers drawn from the
+    parent, so the same work gets the same stream whether it runs sequentially or in parallel.
+
+    :param rng: numpy.random.Generator, integer seed, numpy.random.SeedSequence or None
+    :param number: number of child streams
+    :return: list of numpy.random.Generator
+    """
+    return get_generator(rng).spawn(number)
+
+
+def draw_integer(rng, low, high):
+    """ Integer between low and high (both included) like random.randint
+
+    :param rng: numpy.random.Generator, seed or None (see get_generator)
+    :param low: lowest integer
+    :param high: highest integer
+    :return: integer
+    """
+    return int(get_generator(rng).integers(low, high + 1))
+
+
+def uniform_stream(rng, batch=UNIFORM_BATCH):
+    """ Endless stream of uniform numbers in [0, 1) drawn from a generator in batches
+
+    Meant for loops drawing one number per step: next on the stream costs about as much as random.random, while every
+    batch is a single draw of the generator.
+
+    :param rng: numpy.random.Generator
+    :param batch: number of values drawn at once
+    :return: iterator of floats
+    """
+    # chain and iter(callable, sentinel) run in C, so next costs no Python frame per number
+    return itertools.chain.from_iterable(iter(lambda: rng.random(batch).tolist(), None))
+
+
+def seed_global_random(rng):
+    """ Seeding of the global random and numpy.random states from a generator
+
+    Only used before calling code of pm4py that draws from the global states (e.g. its tree generator).
+
+    :param rng: numpy.random.Generator
+    """
+    seed = int(rng.integers(0, 2 ** 32))
+    random.seed(seed)
+    numpy.random.seed(seed)
@@ -0,0 +1,260 @@
+import json
+import os
+
+import numpy
+
+from conceptdrift.drifts.schedule import generate_log_from_schedule
+from conceptdrift.source.columnar_log import ColumnarLog, replace_traces_at_positions
+from conceptdrift.source.playout import get_compiled_tree, generate_columnar_log
+from conceptdrift.source.random_streams import get_generator
+
+""" OUT-OF-CORE GENERATION OF EVENT LOGS """
+
+CHUNK_SIZE = 100000
+COLUMNS = {'offsets': numpy.int64, 'activities': numpy.int32, 'timestamps': numpy.int64, 'durations': numpy.int64}
+
+
+class SpilledLog:
+    """ Columnar log whose columns are spilled chunk by chunk into files of a directory
+
+    The columns are written as raw NumPy arrays (offsets.bin, activities.bin, timestamps.bin and durations.bin) and
+    read back memory-mapped, so only the chunk that is currently written or read has to fit into memory. All chunks
+    share one list of labels, which has to contain all activities of the log before the first chunk is added. The
+    labels, the log attributes and the trace bounds of the chunks are kept in log.json.
+
+    :param directory: directory of the column files (created if it does not exist)
+    :param labels: list of activity labels indexed by the activity codes of all chunks
+    :param attributes: log attributes (e.g. drift info)
+    """
+
+    def __init__(self, directory, labels, attributes=None):
+        self.directory = str(directory)
+        self.labels = list(labels)
+        self.attributes = {} if attributes is None else attributes
+        self.chunk_bounds = [0]
+        self.nu_events = 0
+        self.has_times = None
+        os.makedirs(self.directory, exist_ok=True)
+        for name in COLUMNS:
+            open(self.get_path(name), 'wb').close()
+        self.write_column('offsets', numpy.zeros(1, dtype=numpy.int64))
+
+    def get_path(self, name):
+        return os.path.join(self.directory, name + '.bin')
+
+    def write_column(self, name, values):
+        with open(self.get_path(name), 'ab') as file:
+            numpy.ascontiguousarray(values, dtype=COLUMNS[name]).tofile(file)
+
+    def read_column(self, name, length):
+        if length == 0:
+            return numpy.zeros(0, dtype=COLUMNS[name])
+        return numpy.memmap(self.get_path(name), dtype=COLUMNS[name], mode='r', shape=(length,))
+
+    def append(self, chunk):
+        """ Adding a chunk of traces to the end of the log
+
+        :param chunk: columnar log with activity codes into the labels of the spilled log
+        """
+        has_times = chunk.timestamps is not None and chunk.durations is not None
+        if self.has_times is None:
+            self.has_times = has_times
+        elif self.has_times != has_times:
+            raise ValueError("either all or no chunks of a spilled log have timestamps and durations")
+        self.write_column('offsets', chunk.offsets[1:] + self.nu_events)
+        self.write_column('activities', chunk.activities)
+        if has_times:
+            self.write_column('timestamps', chunk.timestamps.astype('datetime64[s]').view(numpy.int64))
+            self.write_column('durations', chunk.durations)
+        self.chunk_bounds.append(self.chunk_bounds[-1] + len(chunk))
+        self.nu_events = self.nu_events + chunk.num_events()
+
+    def __len__(self):
+        return self.chunk_bounds[-1]
+
+    def num_events(self):
+        return self.nu_events
+
+    def save(self):
+        """ Writing of the labels, attributes and chunk bounds into log.json """
+        with open(os.path.join(self.directory, 'log.json'), 'w') as file:
+            json.dump({'labels': self.labels, 'attributes': {str(key): str(value) for key, value in
+                                                              self.attributes.items()},
+                       'chunk_bounds': self.chunk_bounds, 'nu_events': self.nu_events,
+                       'has_times': bool(self.has_times)}, file)
+
+    def get_columnar(self):
+        """ Whole log as columnar log on the memory-mapped column files (nothing is read into memory)
+
+        :return: columnar log
+        """
+        timestamps = None
+        durations = None
+        if self.has_times:
+            timestamps = self.read_column('timestamps', self.nu_events).view('datetime64[s]')
+            durations = self.read_column('durations', self.nu_events)
+        return ColumnarLog(self.read_column('offsets', len(self) + 1), self.read_column('activities', self.nu_events),
+                           self.labels, timestamps, durations, self.attributes)
+
+    def read_chunk(self, name, start, stop):
+        """ Elements start to stop - 1 of a column file read into memory """
+        dtype = numpy.dtype(COLUMNS[name])
+        return numpy.fromfile(self.get_path(name), dtype=dtype, count=stop - start, offset=start * dtype.itemsize)
+
+    def chunks(self):
+        """ Chunks of the log one after another
+
+        The chunks are read from the files (not memory-mapped), so the pages of the previous chunks do not stay in
+        memory.
+
+        :return: generator of the index of the first trace and the columnar log of every chunk
+        """
+        for start, stop in zip(self.chunk_bounds[:-1], self.chunk_bounds[1:]):
+            offsets = self.read_chunk('offsets', start, stop + 1)
+            first = int(offsets[0])
+            last = int(offsets[-1])
+            timestamps = None
+            durations = None
+            if self.has_times:
+                timestamps = self.read_chunk('timestamps', first, last).view('datetime64[s]')
+                durations = self.read_chunk('durations', first, last)
+            yield start, ColumnarLog(offsets - first, self.read_chunk('activities', first, last), self.labels,
+                                     timestamps, durations)
+
+
+def open_spilled_log(directory):
+    """ Opening of a spilled log written before (see SpilledLog.save)
+
+    :param directory: directory of the spilled log
+    :return: spilled log
+    """
+    log = SpilledLog.__new__(SpilledLog)
+    with open(os.path.join(str(directory), 'log.json')) as file:
+        info = json.load(file)
+    log.directory = str(directory)
+    log.labels = info['labels']
+    log.attributes = info['attributes']
+    log.chunk_bounds = info['chunk_bounds']
+    log.nu_events = info['nu_events']
+    log.has_times = info['has_times']
+    return log
+
+
+class TimingState:
+    """ State of the drawing of durations and times that is carried from one chunk of a log to the next
+
+    :param nu_activities: number of different activities of the log
+    """
+
+    def __init__(self, nu_activities):
+        self.means = numpy.full(nu_activities, -1, dtype=numpy.int64)
+        self.last_start = 0
+        self.last_duration = None
+
+
+def draw_chunk_durations_and_times(activities, trace_lengths, state, min_duration, max_duration, rng=None):
+    """ Drawing of the durations and start times of the events of one chunk (like draw_durations_and_times)
+
+    The mean durations of the activities and the start and duration of the last non-empty trace are taken from the
+    previous chunks and updated in the state, so the chunks of a log get the same kind of times as a log drawn at once.
+
+    :param activities: array with the activity code of every event of the chunk in log order
+    :param trace_lengths: array with the number of events of every trace of the chunk
+    :param state: timing state of the log
+    :param min_duration: minimum for the duration of one activity in seconds
+    :param max_duration: maximum for the duration of one activity in seconds
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: array with the duration of every event and array with its start in seconds after the start of the log
+    """
+    rng = get_generator(rng)
+    nu_events = len(activities)
+    first_occurrence = numpy.full(len(state.means), nu_events, dtype=numpy.int64)
+    numpy.minimum.at(first_occurrence, activities, numpy.arange(nu_events))
+    new = numpy.flatnonzero((first_occurrence < nu_events) & (state.means < 0))
+    new = new[numpy.argsort(first_occurrence[new], kind='stable')]
+    state.means[new] = rng.integers(min_duration, max_duration + 1, size=len(new))
+    event_means = state.means[activities]
+    durations = rng.exponential(event_means).astype(numpy.int64)
+    durations[first_occurrence[new]] = state.means[new]
+    ends = numpy.cumsum(trace_lengths)
+    starts = ends - trace_lengths
+    total_means = numpy.concatenate(([0], numpy.cumsum(event_means)))
+    trace_of_event = numpy.repeat(numpy.arange(len(trace_lengths)), trace_lengths)
+    offsets = total_means[:-1] - total_means[starts][trace_of_event]
+    full = numpy.flatnonzero(trace_lengths > 0)
+    trace_starts = numpy.zeros(len(trace_lengths), dtype=numpy.int64)
+    if len(full) > 0:
+        last = ends[full] - 1
+        trace_durations = offsets[last] + durations[last]
+        if state.last_duration is None:
+            previous = trace_durations[:-1]
+            first_start = 0
+        else:
+            previous = numpy.concatenate(([state.last_duration], trace_durations[:-1]))
+            first_start = state.last_start
+        gaps = rng.integers(numpy.minimum(previous, min_duration), numpy.maximum(previous, min_duration) + 1)
+        if state.last_duration is None:
+            trace_starts[full] = first_start + numpy.concatenate(([0], numpy.cumsum(gaps)))
+        else:
+            trace_starts[full] = first_start + numpy.cumsum(gaps)
+        state.last_start = int(trace_starts[full[-1]])
+        state.last_duration = int(trace_durations[-1])
+    return durations, trace_starts[trace_of_event] + offsets
+
+
+def generate_spilled_log(schedule, trees, directory, chunk_size=CHUNK_SIZE, playout_mode='trace', noise_tree=None,
+                         noise_positions=None, datestamp=None, min_duration=1, max_duration=14000, rng=None):
+    """ Out-of-core generation of a log following a schedule of model versions
+
+    The log is generated in chunks of chunk_size traces: the traces of a chunk are played out (see
+    generate_log_from_schedule), the noise traces at the noise positions of the chunk are put in, the durations and
+    timestamps of the chunk are drawn and the chunk is spilled into the directory. The memory needed does not depend
+    on the number of traces beyond the schedule itself. Every chunk draws from its own child streams of rng for the
+    playout, the noise traces and the durations.
+
+    :param schedule: array with the version of every trace (index into trees)
+    :param trees: list of the process trees (or compiled or frozen trees) of the versions
+    :param directory: directory of the spilled log
+    :param chunk_size: number of traces per chunk
+    :param playout_mode: playout of the traces ('trace', 'batch' or 'variants')
+    :param noise_tree: process tree the noise traces are played out from (no noise if None)
+    :param noise_positions: sorted array with the positions of the noise traces in the log
+    :param datestamp: starting time of the first trace (no durations and timestamps if None)
+    :param min_duration: minimum for the duration of one activity in seconds
+    :param max_duration: maximum for the duration of one activity in seconds
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: spilled log
+    """
+    rng = get_generator(rng)
+    trees = [get_compiled_tree(tree) for tree in trees]
+    if noise_tree is not None:
+        noise_tree = get_compiled_tree(noise_tree)
+        noise_positions = numpy.asarray(noise_positions, dtype=numpy.int64)
+    label_index = {}
+    for tree in trees + ([] if noise_tree is None else [noise_tree]):
+        for label in tree.labels:
+            label_index.setdefault(label, len(label_index))
+    log = SpilledLog(directory, list(label_index))
+    state = TimingState(len(label_index))
+    schedule = numpy.asarray(schedule)
+    for start in range(0, len(schedule), chunk_size):
+        stop = min(start + chunk_size, len(schedule))
+        playout_rng, noise_rng, duration_rng = rng.spawn(3)
+        chunk = generate_log_from_schedule(schedule[start:stop], trees, playout_mode, playout_rng)
+        if noise_tree is not None:
+            positions = noise_positions[numpy.searchsorted(noise_positions, start):
+                                        numpy.searchsorted(noise_positions, stop)] - start
+            noise = generate_columnar_log(noise_tree, len(positions), playout_mode, noise_rng)
+            chunk = replace_traces_at_positions(chunk, noise, positions)
+        mapping = numpy.array([label_index[label] for label in chunk.labels], dtype=numpy.int32)
+        if len(mapping) > 0:
+            chunk.activities = mapping[chunk.activities]
+        chunk.labels = log.labels
+        if datestamp is not None:
+            durations, seconds = draw_chunk_durations_and_times(chunk.activities, chunk.trace_lengths(), state,
+                                                                min_duration, max_duration, duration_rng)
+            chunk.durations = durations
+            chunk.timestamps = numpy.datetime64(datestamp.replace(tzinfo=None), 's') + seconds.astype('timedelta64[s]')
+        log.append(chunk)
+    log.save()
+    return log
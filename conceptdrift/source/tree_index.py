@@ -0,0 +1,377 @@
+from pm4py.objects.process_tree.obj import Operator, ProcessTree
+
+""" INDEX OF A PROCESS TREE FOR THE RANDOM EVOLUTION """
+
+OPERATORS = [Operator.SEQUENCE, Operator.XOR, Operator.PARALLEL, Operator.LOOP, Operator.OR]
+
+
+class ProcessTreeIndex:
+    """ Index of a process tree that is built once per evolution and kept up to date by the changes
+
+    The index keeps the parent and the position in the child list of every node, the number of real activities of
+    every subtree, the leaves of the subtrees (computed on demand and cached until the subtree changes), the leaves
+    per label and the candidate catalog of the current round. Nodes are identified by id(), since the equality of
+    process trees is structural. All structural changes of the tree during the evolution have to be done by the
+    methods of the index. If dirty is a set, the changed nodes and their ancestors are added to it.
+
+    :param tree: process tree
+    """
+
+    def __init__(self, tree):
+        self.tree = tree
+        self.parents = {}
+        self.positions = {}
+        self.real_acs = {}
+        self.leaf_lists = {}
+        self.label_leaves = {}
+        self.catalog = None
+        self.catalog_changed_labels = None
+        self.dirty = None
+        self.register(tree, None, 0)
+
+    def __getstate__(self):
+        # the dictionaries are keyed by id(), so an unpickled index is built again from its tree
+        return {'tree': self.tree, 'catalog_changed_labels': self.catalog_changed_labels}
+
+    def __setstate__(self, state):
+        self.__init__(state['tree'])
+        if state['catalog_changed_labels'] is not None:
+            self.get_catalog(state['catalog_changed_labels'])
+
+    def copy(self):
+        """ Copy of the tree together with its index and current catalog, without computing the index again
+
+        The copies of the nodes keep the order of the lists of the index, so changing the copy with the same random
+        decisions gives the same result as changing a newly indexed copy of the tree.
+
+        :return: index of the copied tree (the copied tree is its attribute tree)
+        """
+        tree = ProcessTree(self.tree._get_operator(), None, None, self.tree._get_label())
+        copies = {id(self.tree): tree}
+        parents = {id(tree): None}
+        positions = {id(tree): 0}
+        real_acs = {id(tree): self.real_acs[id(self.tree)]}
+        stack = [(self.tree, tree)]
+        while stack:
+            node, part = stack.pop()
+            children = []
+            for i, child in enumerate(node.children):
+                new_child = ProcessTree(child._get_operator(), part, None, child._get_label())
+                copies[id(child)] = new_child
+                parents[id(new_child)] = part
+                positions[id(new_child)] = i
+                real_acs[id(new_child)] = self.real_acs[id(child)]
+                children.append(new_child)
+                if child.children:
+                    stack.append((child, new_child))
+            part._set_children(children)
+        index = ProcessTreeIndex.__new__(ProcessTreeIndex)
+        index.tree = tree
+        index.parents = parents
+        index.positions = positions
+        index.real_acs = real_acs
+        index.leaf_lists = {}
+        index.label_leaves = {label: [copies[id(leaf)] for leaf in leaves]
+                              for label, leaves in self.label_leaves.items()}
+        index.catalog = None if self.catalog is None else self.catalog.copy(copies)
+        index.catalog_changed_labels = None if self.catalog is None else set(self.catalog_changed_labels)
+        index.dirty = None
+        return index
+
+    def register(self, node, parent, position):
+        """ Adding a subtree to the index
+
+        :param node: root of the subtree
+        :param parent: parent of the subtree
+        :param position: position of the subtree in the children of the parent
+        :return: number of real activities of the subtree
+        """
+        self.parents[id(node)] = parent
+        self.positions[id(node)] = position
+        if len(node.children) == 0:
+            label = node._get_label()
+            self.label_leaves.setdefault(label, []).append(node)
+            count = 0 if label is None else 1
+        else:
+            count = 0
+            for i, child in enumerate(node.children):
+                count = count + self.register(child, node, i)
+        self.real_acs[id(node)] = count
+        return count
+
+    def unregister(self, node):
+        """ Removing a subtree from the index
+
+        :param node: root of the subtree
+        """
+        del self.parents[id(node)]
+        del self.positions[id(node)]
+        del self.real_acs[id(node)]
+        self.leaf_lists.pop(id(node), None)
+        if len(node.children) == 0:
+            leaves = self.label_leaves[node._get_label()]
+            leaves.remove(node)
+            if not leaves:
+                del self.label_leaves[node._get_label()]
+        else:
+            for child in node.children:
+                self.unregister(child)
+
+    def update_ancestors(self, node, delta):
+        """ Update of the number of real activities and the leaf caches of a node and all its ancestors
+
+        :param node: node
+        :param delta: change of the number of real activities
+        """
+        self.catalog = None
+        while node is not None:
+            self.real_acs[id(node)] = self.real_acs[id(node)] + delta
+            self.leaf_lists.pop(id(node), None)
+            if self.dirty is not None:
+                self.dirty.add(id(node))
+            node = self.parents[id(node)]
+
+    def set_label(self, leaf, label):
+        """ Change of the label of a leaf (None for a silent activity) """
+        old = leaf._get_label()
+        leaves = self.label_leaves[old]
+        leaves.remove(leaf)
+        if not leaves:
+            del self.label_leaves[old]
+        self.label_leaves.setdefault(label, []).append(leaf)
+        leaf._set_label(label)
+        self.update_ancestors(leaf, (label is not None) - (old is not None))
+
+    def set_operator(self, node, operator):
+        """ Change of the operator of a node """
+        self.catalog = None
+        node._set_operator(operator)
+        if self.dirty is not None:
+            while node is not None:
+                self.dirty.add(id(node))
+                node = self.parents[id(node)]
+
+    def replace(self, old, new):
+        """ Replacement of a subtree by another subtree that is not part of the tree
+
+        :param old: subtree in the tree (not the root)
+        :param new: new subtree
+        """
+        parent = self.parents[id(old)]
+        position = self.positions[id(old)]
+        count = self.real_acs[id(old)]
+        self.unregister(old)
+        children = parent.children
+        children[position] = new
+        new._set_parent(parent)
+        parent._set_children(children)
+        self.update_ancestors(parent, self.register(new, parent, position) - count)
+
+    def append_child(self, parent, child):
+        """ Adding a subtree that is not part of the tree as the last child of a node """
+        children = parent.children
+        children.append(child)
+        child._set_parent(parent)
+        parent._set_children(children)
+        self.update_ancestors(parent, self.register(child, parent, len(children) - 1))
+
+    def swap(self, one, two):
+        """ Swapping of two disjoint subtrees (neither is part of the other) """
+        parent_one = self.parents[id(one)]
+        parent_two = self.parents[id(two)]
+        position_one = self.positions[id(one)]
+        position_two = self.positions[id(two)]
+        children_one = parent_one.children
+        children_two = parent_two.children
+        one._set_parent(parent_two)
+        children_two[position_two] = one
+        parent_two._set_children(children_two)
+        two._set_parent(parent_one)
+        children_one[position_one] = two
+        parent_one._set_children(children_one)
+        self.parents[id(one)] = parent_two
+        self.positions[id(one)] = position_two
+        self.parents[id(two)] = parent_one
+        self.positions[id(two)] = position_one
+        delta = self.real_acs[id(two)] - self.real_acs[id(one)]
+        self.update_ancestors(parent_one, delta)
+        self.update_ancestors(parent_two, -delta)
+
+    def get_parent(self, node):
+        return self.parents[id(node)]
+
+    def get_real_acs(self, node):
+        return self.real_acs[id(node)]
+
+    def get_path(self, node):
+        """ Positions in the child lists on the way from the root to a node """
+        path = []
+        while self.parents[id(node)] is not None:
+            path.append(self.positions[id(node)])
+            node = self.parents[id(node)]
+        return tuple(reversed(path))
+
+    def get_node(self, path):
+        """ Node at a path (see get_path) """
+        node = self.tree
+        for position in path:
+            node = node.children[position]
+        return node
+
+    def get_leaves(self, node):
+        """ Leaves of the subtree below a node (like get_leaves_of_part_tree, empty for a leaf)
+
+        :param node: node of the tree
+        :return: list of leaves
+        """
+        leaves = self.leaf_lists.get(id(node))
+        if leaves is None:
+            leaves = []
+            stack = list(reversed(node.children))
+            while stack:
+                child = stack.pop()
+                if len(child.children) == 0:
+                    leaves.append(child)
+                else:
+                    stack.extend(reversed(child.children))
+            self.leaf_lists[id(node)] = leaves
+        return leaves
+
+    def get_real_leaves(self, node):
+        """ Leaves of the subtree below a node that are no silent activities """
+        return [leaf for leaf in self.get_leaves(node) if leaf._get_label() is not None]
+
+    def get_labels(self, node):
+        """ Set of the labels of the leaves below a node (None for silent activities) """
+        return {leaf._get_label() for leaf in self.get_leaves(node)}
+
+    def get_tree_leaves(self):
+        """ All leaves of the tree """
+        if len(self.tree.children) == 0:
+            return [self.tree]
+        return self.get_leaves(self.tree)
+
+    def count_label(self, label):
+        """ Number of leaves with a label """
+        return len(self.label_leaves.get(label, ()))
+
+    def get_leaves_with_label(self, label):
+        """ Leaves with a label in the order of the tree (independent of the order of the changes so far) """
+        leaves = list(self.label_leaves.get(label, ()))
+        if len(leaves) > 1:
+            leaves.sort(key=self.get_path)
+        return leaves
+
+    def get_right_rand_ac(self, count):
+        """ Smallest number from count on for which no activity 'Random activity <number>' exists """
+        while "Random activity " + str(count) in self.label_leaves:
+            count = count + 1
+        return count
+
+    def get_catalog(self, changed_labels):
+        """ Candidate catalog for the given changed activities (built once and reused until the tree changes)
+
+        :param changed_labels: labels of the changed activities
+        :return: candidate catalog
+        """
+        if self.catalog is None or self.catalog_changed_labels != changed_labels:
+            self.catalog = CandidateCatalog(self, changed_labels)
+            self.catalog_changed_labels = set(changed_labels)
+        return self.catalog
+
+    def get_candidates(self, length, changed_labels, operator=None, with_root=True):
+        """ Operator nodes whose subtrees have length real activities and contain no changed activity
+
+        :param length: number of real activities
+        :param changed_labels: labels of the changed activities
+        :param operator: operator the subtree is to be changed to ('xor loop' needs less than three children)
+        :param with_root: False if the root must not be a candidate
+        :return: list of candidates (empty if there is none)
+        """
+        catalog = self.get_catalog(changed_labels)
+        candidates = []
+        for operator_type in OPERATORS:
+            for node in catalog.subtrees.get((length, operator_type, True), ()):
+                if operator != 'xor loop' or len(node.children) < 3:
+                    if with_root or node is not self.tree:
+                        candidates.append(node)
+        return candidates
+
+
+class CandidateCatalog:
+    """ Catalog of the candidates for the changes of one evolution round
+
+    The operator nodes are grouped by the number of real activities of their subtree, their operator and whether their
+    subtree contains no changed activity yet, so the candidates of a change are found without scanning the tree. All
+    lists are in the order of the tree, so the candidates and thus the random changes only depend on the tree and the
+    random stream, not on the changes that led to the tree.
+
+    :param index: index of the process tree
+    :param changed_labels: labels of the changed activities
+    """
+
+    def __init__(self, index, changed_labels):
+        self.subtrees = {}
+        self.unchanged_leaves = []
+        self.unchanged_real_leaves = []
+        self.operators = []
+        self.open_operators = []
+        unchanged = {}
+        stack = [(index.tree, False)]
+        while stack:
+            node, visited = stack.pop()
+            if len(node.children) == 0:
+                label = node._get_label()
+                unchanged[id(node)] = label not in changed_labels
+                if unchanged[id(node)]:
+                    self.unchanged_leaves.append(node)
+                    if label is not None:
+                        self.unchanged_real_leaves.append(node)
+            elif not visited:
+                self.operators.append(node)
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(node.children))
+            else:
+                unchanged[id(node)] = all(unchanged[id(child)] for child in node.children)
+                key = (index.real_acs[id(node)], node._get_operator(), unchanged[id(node)])
+                self.subtrees.setdefault(key, []).append(node)
+                if node._get_operator() != Operator.LOOP or len(node.children) < 3:
+                    self.open_operators.append(node)
+
+    def copy(self, copies):
+        """ Catalog of a copied tree
+
+        :param copies: dictionary from id() of every node of the tree to its copy
+        :return: catalog with the copies of the candidates in the same order
+        """
+        catalog = CandidateCatalog.__new__(CandidateCatalog)
+        catalog.subtrees = {key: [copies[id(node)] for node in nodes] for key, nodes in self.subtrees.items()}
+        catalog.unchanged_leaves = [copies[id(leaf)] for leaf in self.unchanged_leaves]
+        catalog.unchanged_real_leaves = [copies[id(leaf)] for leaf in self.unchanged_real_leaves]
+        catalog.operators = [copies[id(node)] for node in self.operators]
+        catalog.open_operators = [copies[id(node)] for node in self.open_operators]
+        return catalog
+
+
+def get_tree_index(tree, index=None):
+    """ Index of a process tree (built if no index is passed)
+
+    :param tree: process tree
+    :param index: index of the tree or None
+    :return: index of the tree
+    """
+    if index is None:
+        return ProcessTreeIndex(tree)
+    return index
+
+
+def get_changed_labels(changed_acs):
+    """ Labels of the changed activities
+
+    Process trees compare leaves by their label, so a leaf is contained in changed_acs exactly if its label is one of
+    these labels.
+
+    :param changed_acs: list of changed activities (leaves)
+    :return: set of labels
+    """
+    return {leaf._get_label() for leaf in changed_acs}
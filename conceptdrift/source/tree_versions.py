@@ -0,0 +1,85 @@
+from conceptdrift.source.change_journal import apply_change
+from conceptdrift.source.evolution import evolve_tree_randomly_gs
+from conceptdrift.source.frozen_tree import freeze_tree, thaw_tree, copy_process_tree
+from conceptdrift.source.process_tree_controller import copy_leaf
+from conceptdrift.source.tree_index import ProcessTreeIndex
+
+""" STRUCTURALLY SHARED VERSIONS OF PROCESS TREES """
+
+
+def replay_journal(tree, journal):
+    """ Replay of the recorded changes of an evolution on a copy of the base tree (without the random search)
+
+    :param tree: process tree or frozen tree the journal was recorded on
+    :param journal: list of change records (e.g. from evolve_tree_randomly_gs)
+    :return: new process tree equal to the evolved tree
+    """
+    tree = copy_process_tree(tree)
+    index = ProcessTreeIndex(tree)
+    for record in journal:
+        apply_change(index, record)
+    return tree
+
+
+class TreeVersions:
+    """ Versions of a process tree that share all unchanged subtrees
+
+    The versions are kept as frozen trees. The last evolved version stays thawed together with its index, so a chain
+    of evolutions (e.g. for an incremental drift) changes the same process tree and only copies the paths to the
+    changed nodes into the new frozen version. The changes of every evolution are kept in journals, together with the
+    version they were applied to in bases.
+
+    :param tree: initial version (process tree or frozen tree)
+    """
+
+    def __init__(self, tree):
+        self.nodes = {}
+        self.versions = [freeze_tree(tree, self.nodes)]
+        self.bases = [None]
+        self.journals = [[]]
+        self.working_tree = None
+        self.working_version = None
+        self.index = None
+        self.origins = None
+
+    def __len__(self):
+        return len(self.versions)
+
+    def __getitem__(self, version):
+        return self.versions[version]
+
+    def checkout(self, version):
+        """ Thawing of a version into the process tree that is changed by the next evolution """
+        version = version % len(self.versions)
+        if self.working_version != version:
+            self.origins = {}
+            self.working_tree = thaw_tree(self.versions[version], self.origins)
+            self.index = ProcessTreeIndex(self.working_tree)
+            self.working_version = version
+        return self.working_tree
+
+    def evolve(self, change_proportion, version=-1, record=None, rng=None):
+        """ Random evolution of a version into a new version
+
+        :param change_proportion: proportion of the activities to be affected by the evolution
+        :param version: number of the version to be evolved (the last version by default)
+        :param record: stage record (see profiling) to which the retries of the evolution are added
+        :param rng: numpy.random.Generator or seed for the evolution (see random_streams.get_generator)
+        :return: number of the new version, deleted activities, added activities and moved activities
+        """
+        tree = self.checkout(version)
+        journal = []
+        self.index.dirty = set()
+        tree, deleted_acs, added_acs, moved_acs = evolve_tree_randomly_gs(tree, change_proportion, self.index, journal,
+                                                                             record, rng)
+        self.versions.append(freeze_tree(tree, self.nodes, self.origins, self.index.dirty))
+        self.index.dirty = None
+        self.bases.append(self.working_version)
+        self.journals.append(journal)
+        self.working_version = len(self.versions) - 1
+        return self.working_version, [copy_leaf(leaf) for leaf in deleted_acs], \
+            [copy_leaf(leaf) for leaf in added_acs], [copy_leaf(leaf) for leaf in moved_acs]
+
+    def get_process_tree(self, version=-1):
+        """ Version as a new pm4py process tree """
+        return thaw_tree(self.versions[version])
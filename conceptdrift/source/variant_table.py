@@ -0,0 +1,274 @@
+import warnings
+from collections import Counter
+
+import numpy
+
+from conceptdrift.source.columnar_log import ColumnarLog, get_offsets, gather_segments
+from conceptdrift.source.playout import SEQUENCE, XOR, PARALLEL, LOOP, OR, get_compiled_tree, play_out_label_ids, \
+    convert_label_ids_to_log
+from conceptdrift.source.random_streams import get_generator
+
+""" VARIANT TABLE SAMPLING """
+
+MAX_LOST_PROBABILITY = 0.01
+
+
+class VariantTable:
+    """ Distribution of the trace variants of a process tree with an alias table for sampling
+
+    :param variants: list of variants as tuples of label ids
+    :param probabilities: probability of every variant
+    :param labels: list of labels indexed by the label ids
+    :param exact: True if the distribution was enumerated completely, False if loops were cut off or it was estimated
+    by sampling
+    :param lost_probability: probability of the traces cut off by the bounded unfolding of loops
+    """
+
+    def __init__(self, variants, probabilities, labels, exact, lost_probability=0.0):
+        self.variants = variants
+        self.probabilities = probabilities
+        self.labels = labels
+        self.exact = exact
+        self.lost_probability = lost_probability
+        self.alias_probabilities, self.alias_indices = build_alias_table(probabilities)
+        self.variant_offsets = get_offsets(numpy.array([len(variant) for variant in variants], dtype=numpy.int64))
+        self.variant_activities = numpy.array([label_id for variant in variants for label_id in variant],
+                                              dtype=numpy.int32)
+
+    def __len__(self):
+        return len(self.variants)
+
+
+class EnumerationBudgetExceeded(Exception):
+    pass
+
+
+def build_variant_table(tree, max_unfold=10, max_variants=100000, num_samples=100000,
+                        max_lost_probability=MAX_LOST_PROBABILITY, max_entries=200000, rng=None):
+    """ Building of the variant distribution of a process tree
+
+    The distribution is enumerated exactly over all scheduling decisions of the playout. Loops are unfolded up to
+    max_unfold repetitions per trace and the probabilities are renormalized; such a table is not exact. If the cut
+    traces have more than max_lost_probability (with a warning), or the enumeration needs more than max_variants
+    variants or states or more than max_entries stored suffixes, the distribution is estimated from num_samples played
+    out traces instead. An estimated table only contains the variants seen in the samples, so rare variants are missing.
+
+    Trees with loops and parallel nodes (e.g. most 'middle' and 'complex' trees) usually exceed the budgets and get
+    an estimated table.
+
+    :param tree: process tree or compiled process tree
+    :param max_unfold: maximum number of loop repetitions per trace in the enumeration
+    :param max_variants: maximum number of variants (and enumeration states) before falling back to estimation
+    :param num_samples: number of traces for the estimation
+    :param max_lost_probability: maximum probability of the traces cut off by max_unfold
+    :param max_entries: maximum number of suffixes stored by the enumeration (bounds its memory)
+    :param rng: numpy.random.Generator or seed for the estimation (see random_streams.get_generator)
+    :return: variant table
+    """
+    compiled = get_compiled_tree(tree)
+    try:
+        distribution = enumerate_variants(compiled, max_unfold, max_variants, max_entries)
+    except (EnumerationBudgetExceeded, RecursionError):
+        return estimate_variant_table(compiled, num_samples, rng)
+    variants = list(distribution)
+    probabilities = numpy.array([distribution[variant] for variant in variants], dtype=numpy.float64)
+    total = probabilities.sum()
+    lost_probability = max(1.0 - total, 0.0)
+    if lost_probability > max_lost_probability:
+        warnings.warn("unfolding the loops " + str(max_unfold) + " times cuts off traces with a probability of " +
+                      format(lost_probability, '.3f') + ", the variant table is estimated from samples instead")
+        return estimate_variant_table(compiled, num_samples, rng)
+    # rounding errors of the sums must not mark a complete enumeration as cut
+    return VariantTable(variants, probabilities / total, compiled.labels, lost_probability < 1e-9, lost_probability)
+
+
+def estimate_variant_table(tree, num_samples=100000, rng=None):
+    """ Estimation of the variant distribution of a process tree from played out traces
+
+    :param tree: process tree or compiled process tree
+    :param num_samples: number of played out traces
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: variant table
+    """
+    compiled = get_compiled_tree(tree)
+    counts = Counter(tuple(trace) for trace in play_out_label_ids(compiled, num_samples, rng))
+    variants = list(counts)
+    probabilities = numpy.array([counts[variant] for variant in variants], dtype=numpy.float64) / num_samples
+    return VariantTable(variants, probabilities, compiled.labels, False)
+
+
+def enumerate_variants(compiled, max_unfold=10, max_variants=100000, max_entries=200000):
+    """ Exact enumeration of the variant distribution of a compiled process tree
+
+    A state of the playout consists of the enabled nodes, the number of open children of the open parallel and or
+    nodes and the number of loop repetitions so far. The distribution of the remaining trace only depends on the
+    state, so it is computed once per state.
+
+    :param compiled: compiled process tree
+    :param max_unfold: maximum number of loop repetitions per trace
+    :param max_variants: maximum number of variants and states
+    :param max_entries: maximum number of suffixes stored over all states
+    :return: dictionary from variants (tuples of label ids) to probabilities (not normalized if loops were cut)
+    """
+    operators = compiled.operators.tolist()
+    parents = compiled.parents.tolist()
+    first_child = compiled.first_child.tolist()
+    num_children = compiled.num_children.tolist()
+    label_ids = compiled.label_ids.tolist()
+    memo = {}
+    stored = [0]
+
+    def enable(enabled, nodes):
+        return tuple(sorted(enabled + tuple(nodes)))
+
+    def set_remaining(remaining, node, count):
+        items = dict(remaining)
+        if count > 0:
+            items[node] = count
+        else:
+            items.pop(node, None)
+        return tuple(sorted(items.items()))
+
+    def close(node, enabled, remaining, repetitions):
+        child = node
+        parent = parents[child]
+        while parent >= 0:
+            operator = operators[parent]
+            if operator == SEQUENCE:
+                if child + 1 < first_child[parent] + num_children[parent]:
+                    return [(1.0, enable(enabled, [child + 1]), remaining, repetitions)]
+            elif operator == LOOP:
+                if child == first_child[parent]:
+                    outcomes = [(0.5, enable(enabled, [child + 2]), remaining, repetitions)]
+                    if repetitions < max_unfold:
+                        outcomes.append((0.5, enable(enabled, [child + 1]), remaining, repetitions + 1))
+                    return outcomes
+                elif child != first_child[parent] + num_children[parent] - 1:
+                    return [(1.0, enable(enabled, [first_child[parent]]), remaining, repetitions)]
+            elif operator == PARALLEL or operator == OR:
+                count = dict(remaining)[parent] - 1
+                remaining = set_remaining(remaining, parent, count)
+                if count > 0:
+                    return [(1.0, enabled, remaining, repetitions)]
+            child = parent
+            parent = parents[child]
+        return [(1.0, enabled, remaining, repetitions)]
+
+    def suffixes(state):
+        if state in memo:
+            return memo[state]
+        enabled, remaining, repetitions = state
+        result = {}
+        if len(enabled) == 0:
+            result[()] = 1.0
+        for i, node in enumerate(enabled):
+            rest = enabled[:i] + enabled[i + 1:]
+            operator = operators[node]
+            children = range(first_child[node], first_child[node] + num_children[node])
+            label = None
+            if operator == SEQUENCE or operator == LOOP:
+                outcomes = [(1.0, enable(rest, [first_child[node]]), remaining, repetitions)]
+            elif operator == XOR:
+                outcomes = [(1.0 / len(children), enable(rest, [child]), remaining, repetitions) for child in children]
+            elif operator == PARALLEL:
+                outcomes = [(1.0, enable(rest, children), set_remaining(remaining, node, len(children)), repetitions)]
+            elif operator == OR:
+                outcomes = []
+                for mask in range(1, 2 ** len(children)):
+                    chosen = [child for j, child in enumerate(children) if mask >> j & 1]
+                    outcomes.append((0.5 ** len(children), enable(rest, chosen),
+                                     set_remaining(remaining, node, len(chosen)), repetitions))
+                outcomes.extend((p * 0.5 ** len(children), e, r, n) for p, e, r, n in
+                                close(node, rest, remaining, repetitions))
+            else:
+                if label_ids[node] >= 0:
+                    label = label_ids[node]
+                outcomes = close(node, rest, remaining, repetitions)
+            for probability, next_enabled, next_remaining, next_repetitions in outcomes:
+                probability = probability / len(enabled)
+                for suffix, suffix_probability in suffixes((next_enabled, next_remaining, next_repetitions)).items():
+                    variant = suffix if label is None else (label,) + suffix
+                    result[variant] = result.get(variant, 0.0) + probability * suffix_probability
+            if len(result) > max_variants:
+                raise EnumerationBudgetExceeded()
+        memo[state] = result
+        stored[0] = stored[0] + len(result)
+        if len(memo) > max_variants or stored[0] > max_entries:
+            raise EnumerationBudgetExceeded()
+        return result
+
+    return suffixes(((0,), (), 0))
+
+
+def build_alias_table(probabilities):
+    """ Building of an alias table (Vose's method) for sampling from a discrete distribution in constant time
+
+    :param probabilities: array of probabilities
+    :return: array with the probability of keeping a column and array with the alias of every column
+    """
+    size = len(probabilities)
+    scaled = numpy.asarray(probabilities, dtype=numpy.float64) * size
+    alias_probabilities = numpy.ones(size, dtype=numpy.float64)
+    alias_indices = numpy.arange(size, dtype=numpy.int64)
+    small = [i for i in range(size) if scaled[i] < 1.0]
+    large = [i for i in range(size) if scaled[i] >= 1.0]
+    while small and large:
+        less = small.pop()
+        more = large.pop()
+        alias_probabilities[less] = scaled[less]
+        alias_indices[less] = more
+        scaled[more] = scaled[more] + scaled[less] - 1.0
+        if scaled[more] < 1.0:
+            small.append(more)
+        else:
+            large.append(more)
+    return alias_probabilities, alias_indices
+
+
+def sample_variant_indices(table, no_traces, method='alias', rng=None):
+    """ Drawing of the variants of no_traces traces from a variant table
+
+    :param table: variant table
+    :param no_traces: number of traces
+    :param method: 'alias' for independent draws from the alias table, 'multinomial' for drawing the number of traces
+    per variant with a single multinomial draw (the traces are shuffled afterwards)
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: array with the index of the variant of every trace
+    """
+    rng = get_generator(rng)
+    if method == 'alias':
+        columns = rng.integers(0, len(table), size=no_traces)
+        keep = rng.random(no_traces) < table.alias_probabilities[columns]
+        return numpy.where(keep, columns, table.alias_indices[columns])
+    elif method == 'multinomial':
+        counts = rng.multinomial(no_traces, table.probabilities)
+        return rng.permutation(numpy.repeat(numpy.arange(len(table)), counts))
+    else:
+        raise ValueError("unknown sampling method '" + str(method) + "'")
+
+
+def generate_log_from_variant_table(table, no_traces, method='alias', rng=None):
+    """ Generation of an event log by sampling the traces from a variant table
+
+    :param table: variant table
+    :param no_traces: number of traces
+    :param method: sampling method ('alias' or 'multinomial')
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: event log
+    """
+    variants = table.variants
+    traces = [variants[i] for i in sample_variant_indices(table, no_traces, method, rng).tolist()]
+    return convert_label_ids_to_log(traces, table.labels)
+
+
+def generate_columnar_log_from_variant_table(table, no_traces, method='alias', rng=None):
+    """ Generation of a columnar log by sampling the traces from a variant table
+
+    :param table: variant table
+    :param no_traces: number of traces
+    :param method: sampling method ('alias' or 'multinomial')
+    :param rng: numpy.random.Generator or seed (see random_streams.get_generator)
+    :return: columnar log
+    """
+    offsets, positions = gather_segments(table.variant_offsets, sample_variant_indices(table, no_traces, method, rng))
+    return ColumnarLog(offsets, table.variant_activities[positions], table.labels)
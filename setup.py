@@ -1,13 +1,23 @@
+import os
+import re
+
 from setuptools import setup
 
+# the version is defined once in conceptdrift/__init__.py (it keys the log cache and the manifests)
+with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'conceptdrift', '__init__.py')) as file:
+    VERSION = re.search(r"^__version__ = '([^']+)'", file.read(), re.M).group(1)
+
 setup(
     name='cdlg-package',
-    version='0.0.2',
+    version=VERSION,
     packages=['conceptdrift', 'conceptdrift.drifts', 'conceptdrift.source'],
     install_requires=[
         'pm4py>=2.2.13.1',
         'graphviz>=0.17'
     ],
+    extras_require={
+        'arrow': ['pyarrow>=4.0']
+    },
     url='',
     license='GPL 3.0',
     author='Justus Grimm',
@@ -0,0 +1,136 @@
+import datetime
+
+import numpy
+import pytest
+from pm4py.objects.log.obj import EventLog, Trace, Event
+from pm4py.objects.process_tree.utils.generic import parse
+
+from conceptdrift.source.columnar_log import ColumnarLog, CompactTrace, CompactEvent, get_offsets, get_traces, \
+    take_traces, combine_columnar_logs, replace_traces_of_columnar_log, add_duration_to_columnar_log, \
+    convert_event_log_to_columnar, convert_columnar_to_event_log, convert_columnar_log
+from conceptdrift.source.playout import get_compiled_tree
+
+
+def make_event_log(traces):
+    log = EventLog(attributes={'drift info': 'sudden'})
+    timestamp = datetime.datetime(2020, 1, 1)
+    for i, names in enumerate(traces):
+        trace = Trace()
+        trace.attributes['concept:name'] = str(i)
+        for name in names:
+            timestamp = timestamp + datetime.timedelta(minutes=1)
+            trace.append(Event({'concept:name': name, 'time:timestamp': timestamp, 'duration:seconds': 60}))
+        log.append(trace)
+    return log
+
+
+def get_traces_of(log):
+    return [[(event['concept:name'], event['time:timestamp'], event['duration:seconds']) for event in trace]
+            for trace in log]
+
+
+def make_columnar_log(traces, labels=('a', 'b', 'c')):
+    labels = list(labels)
+    offsets = get_offsets(numpy.array([len(trace) for trace in traces], dtype=numpy.int64))
+    activities = numpy.array([labels.index(name) for trace in traces for name in trace], dtype=numpy.int32)
+    return ColumnarLog(offsets, activities, labels)
+
+
+def get_names(log):
+    return [[event['concept:name'] for event in trace] for trace in log]
+
+
+def test_event_log_round_trip():
+    log = make_event_log([['a', 'b'], [], ['c', 'a', 'c']])
+    columnar_log = convert_event_log_to_columnar(log)
+    assert len(columnar_log) == 3 and columnar_log.num_events() == 5
+    assert columnar_log.trace_lengths().tolist() == [2, 0, 3]
+    converted = convert_columnar_to_event_log(columnar_log)
+    assert get_traces_of(converted) == get_traces_of(log)
+    assert [trace.attributes['concept:name'] for trace in converted] == ['0', '1', '2']
+    assert converted.attributes == {'drift info': 'sudden'}
+
+
+def test_dataframe_conversion():
+    columnar_log = convert_event_log_to_columnar(make_event_log([['a', 'b'], [], ['c']]))
+    dataframe = convert_columnar_log(columnar_log, 'dataframe')
+    assert dataframe['case:concept:name'].tolist() == ['0', '0', '2']
+    assert dataframe['concept:name'].tolist() == ['a', 'b', 'c']
+    assert dataframe['duration:seconds'].tolist() == [60, 60, 60]
+    assert dataframe.attrs == {'drift info': 'sudden'}
+    assert convert_columnar_log(columnar_log, 'columnar') is columnar_log
+    with pytest.raises(ValueError):
+        convert_columnar_log(columnar_log, 'unknown')
+
+
+def test_selecting_traces():
+    log = make_columnar_log([['a'], ['b', 'c'], [], ['c', 'c', 'a']])
+    assert get_names(get_traces(log, 1, 3)) == [['b', 'c'], []]
+    assert get_names(get_traces(log, 3, 10)) == [['c', 'c', 'a']]
+    assert get_names(take_traces(log, numpy.array([3, 0, 3]))) == [['c', 'c', 'a'], ['a'], ['c', 'c', 'a']]
+
+
+def test_combining_logs_with_other_labels():
+    one = make_columnar_log([['a', 'b']])
+    two = make_columnar_log([['d'], ['a']], labels=('d', 'a'))
+    combined = combine_columnar_logs([one, two])
+    assert get_names(combined) == [['a', 'b'], ['d'], ['a']]
+    assert combined.labels[:3] == ['a', 'b', 'c'] and 'd' in combined.labels
+
+
+def test_replacing_traces():
+    log = make_columnar_log([['a']] * 4)
+    replaced = replace_traces_of_columnar_log(log, make_columnar_log([['b'], ['c']]), 0.5)
+    assert get_names(replaced) == [['a'], ['a'], ['b'], ['c']]
+
+
+def test_durations_and_timestamps():
+    log = make_columnar_log([['a', 'b'], [], ['a', 'c', 'a']])
+    add_duration_to_columnar_log(log, datetime.datetime(2020, 1, 1), 10, 100, rng=0)
+    assert len(log.durations) == len(log.timestamps) == 5
+    assert log.timestamps[0] == numpy.datetime64('2020-01-01T00:00:00')
+    # the first occurrences of the activities last their mean durations, the events of a trace are ordered
+    assert 10 <= log.durations[0] <= 100 and 10 <= log.durations[1] <= 100
+    assert log.timestamps[1] > log.timestamps[0] and log.timestamps[2] > log.timestamps[0]
+    assert log.timestamps[3] > log.timestamps[2] and log.timestamps[4] > log.timestamps[3]
+
+
+def test_compact_traces_read_like_pm4py_traces():
+    log = convert_event_log_to_columnar(make_event_log([['a', 'b'], [], ['c']]))
+    trace = log[0]
+    assert isinstance(trace, CompactTrace) and len(trace) == 2 and len(log[1]) == 0
+    assert trace.attributes == {'concept:name': '0'}
+    assert log[-1][-1]['concept:name'] == 'c' and log[-1].attributes['concept:name'] == '2'
+    event = trace[1]
+    assert isinstance(event, CompactEvent)
+    assert event['concept:name'] == 'b'
+    assert event['time:timestamp'] == datetime.datetime(2020, 1, 1, 0, 2)
+    assert event['duration:seconds'] == 60
+    assert event.keys() == ['concept:name', 'time:timestamp', 'duration:seconds'] and 'duration:seconds' in event
+    assert event.get('org:resource') is None
+    with pytest.raises(KeyError):
+        event['org:resource']
+    with pytest.raises(IndexError):
+        trace[2]
+    with pytest.raises(IndexError):
+        log[3]
+
+
+def test_compact_events_without_durations():
+    log = make_columnar_log([['a', 'b']])
+    event = log[0][0]
+    assert 'duration:seconds' not in event and event.get('duration:seconds', 0) == 0
+    # logs from the playout get the consecutive timestamps of pm4py's playout
+    assert log[0][1]['time:timestamp'] - event['time:timestamp'] == datetime.timedelta(seconds=1)
+
+
+def test_compact_objects_have_no_dict():
+    log = make_columnar_log([['a']])
+    assert not hasattr(log, '__dict__') and not hasattr(log[0], '__dict__') and not hasattr(log[0][0], '__dict__')
+
+
+def test_versions_share_interned_labels():
+    one = get_compiled_tree(parse("->('activity a','activity b')"))
+    two = get_compiled_tree(parse("X('activity b','activity a')"))
+    assert one.labels[0] is two.labels[1]
+    assert one.labels[1] is two.labels[0]
@@ -0,0 +1,78 @@
+import warnings
+
+from pm4py.objects.process_tree.utils.generic import parse
+
+from conceptdrift.source.evolution import MAX_ATTEMPTS, evolve_tree_randomly_gs, evolve_tree_versions
+from conceptdrift.source.frozen_tree import copy_process_tree
+from conceptdrift.source.process_tree_controller import randomize_tree_one
+from conceptdrift.source.profiling import StageRecord
+from conceptdrift.source.random_streams import spawn_generators
+from conceptdrift.source.tree_index import ProcessTreeIndex
+
+
+def evolve(tree, evolution_stage, seed):
+    record = StageRecord('evolution')
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        result = evolve_tree_randomly_gs(parse(tree), evolution_stage, record=record, rng=seed)
+    return result, record
+
+
+def test_infeasible_evolution_stops():
+    # the loop of two activities has no feasible change left for some seeds once one change is made
+    for seed in range(20):
+        (tree, deleted_acs, added_acs, moved_acs), record = evolve("*('a','b')", 1.0, seed)
+        assert record.retries <= MAX_ATTEMPTS * 2
+
+
+def test_infeasible_evolution_warns():
+    record = StageRecord('evolution')
+    stopped = False
+    for seed in range(20):
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            evolve_tree_randomly_gs(parse("*('a','b')"), 1.0, record=record, rng=seed)
+        stopped = stopped or any("no further change is feasible" in str(warning.message) for warning in caught)
+    assert stopped
+
+
+def test_single_leaf_tree():
+    (tree, deleted_acs, added_acs, moved_acs), record = evolve("'a'", 1.0, 0)
+    assert tree.label == 'a'
+    assert deleted_acs == [] and added_acs == [] and moved_acs == []
+
+
+def test_randomize_tree_returns_result_and_count():
+    tree = parse("->('a',X('b','c'),+('d','e'))")
+    journal = []
+    worked, count = randomize_tree_one(tree, [], 1, journal=journal, rng=3)
+    assert isinstance(worked, bool)
+    assert count >= 1
+    assert len(journal) == (1 if worked else 0)
+
+
+def test_versions_match_evolving_copies():
+    tree = parse("->('a',X('b','c'),+('d',*('e','f'),'g'),O('h','i'),'j')")
+    change_proportions = [0.2, 0.5, 0.3] * 5
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        versions = evolve_tree_versions(tree, change_proportions, seed=7)
+        streams = spawn_generators(7, len(change_proportions))
+        copies = [evolve_tree_randomly_gs(copy_process_tree(tree), change_proportion, rng=stream)
+                  for change_proportion, stream in zip(change_proportions, streams)]
+    assert [str(version[0]) for version in versions] == [str(copy[0]) for copy in copies]
+    assert str(tree) == "->( 'a', X( 'b', 'c' ), +( 'd', *( 'e', 'f' ), 'g' ), O( 'h', 'i' ), 'j' )"
+
+
+def test_index_copy_is_independent():
+    base = ProcessTreeIndex(parse("->('a',X('b','c'),'d')"))
+    base.get_catalog(set())
+    index = base.copy()
+    assert str(index.tree) == str(base.tree)
+    assert index.get_real_acs(index.tree) == 4
+    assert all(index.get_parent(node) is not None for node in index.get_catalog(set()).operators[1:])
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        evolve_tree_randomly_gs(index.tree, 1.0, index=index, rng=0)
+    assert str(base.tree) == "->( 'a', X( 'b', 'c' ), 'd' )"
+    assert base.get_real_acs(base.tree) == 4
@@ -0,0 +1,13 @@
+import filecmp
+import os
+
+from conceptdrift.generate_collection_of_logs import generate_logs
+
+
+def test_resume_with_more_logs(tmp_path):
+    generate_logs(2, 50, filepath=str(tmp_path / 'extended'), seed=7)
+    generate_logs(3, 50, filepath=str(tmp_path / 'extended'), seed=7, resume=True)
+    generate_logs(3, 50, filepath=str(tmp_path / 'complete'), seed=7)
+    for name in ['event_log_2.xes', 'event_log_0.txt', 'event_log_1.txt', 'event_log_2.txt', 'gold_standard.csv']:
+        assert filecmp.cmp(os.path.join(str(tmp_path / 'extended'), 'gold_standard', name),
+                           os.path.join(str(tmp_path / 'complete'), 'gold_standard', name), shallow=False)
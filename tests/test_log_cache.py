@@ -0,0 +1,117 @@
+import filecmp
+import os
+
+import numpy
+from pm4py.objects.process_tree.utils.generic import parse
+
+from conceptdrift.drifts.sudden import generate_log_with_sudden_drift
+from conceptdrift import generate_collection_of_logs
+from conceptdrift.generate_collection_of_logs import generate_logs
+from conceptdrift.source.log_cache import ENTRY_NAME, LogCache, generate_cached_log, get_cache_key
+
+
+def get_names(log):
+    return [[event['concept:name'] for event in trace] for trace in log]
+
+
+def test_cache_keys():
+    parameters = {'num_traces': 100, 'model_one': parse("->('a','b')"), 'drift_area': (0.2, 0.8)}
+    key = get_cache_key('generate', parameters, 3)
+    assert key == get_cache_key('generate', dict(parameters, model_one=parse("->('a','b')")), numpy.int64(3))
+    assert key != get_cache_key('generate', parameters, 4)
+    assert key != get_cache_key('generate', dict(parameters, num_traces=101), 3)
+    assert key != get_cache_key('other', parameters, 3)
+    # only integer seeds and parameters with a canonical representation can be cached
+    assert get_cache_key('generate', parameters, None) is None
+    assert get_cache_key('generate', parameters, numpy.random.default_rng(3)) is None
+    assert get_cache_key('generate', parameters, True) is None
+    assert get_cache_key('generate', dict(parameters, function=len), 3) is None
+
+
+def test_cache_hit_skips_generation(tmp_path):
+    calls = []
+
+    def generate(num_traces, rng, output):
+        calls.append(rng)
+        return generate_log_with_sudden_drift(num_traces, model_one=parse("->('a',X('b','c'))"), rng=rng,
+                                              output=output)
+
+    one = generate_cached_log(tmp_path, generate, {'num_traces': 20}, 5, 'columnar')
+    two = generate_cached_log(tmp_path, generate, {'num_traces': 20}, 5, 'event_log')
+    assert calls == [5]
+    assert get_names(two) == get_names(one)
+    assert two.attributes == one.attributes
+    generate_cached_log(tmp_path, generate, {'num_traces': 20}, 6, 'columnar')
+    generate_cached_log(tmp_path, generate, {'num_traces': 20}, None, 'columnar')
+    assert calls == [5, 6, None] and len(LogCache(tmp_path).get_entries()) == 2
+
+
+def test_cached_drift_log_matches_generated(tmp_path):
+    model = parse("->('a',X('b','c'),+('d','e'))")
+    log = generate_log_with_sudden_drift(50, model_one=model, rng=2)
+    for _ in range(2):
+        cached = generate_log_with_sudden_drift(50, model_one=model, rng=2, cache=str(tmp_path))
+        assert get_names(cached) == get_names(log)
+        assert [[event['time:timestamp'] for event in trace] for trace in cached] == \
+            [[event['time:timestamp'] for event in trace] for trace in log]
+        assert cached.attributes == log.attributes
+
+
+def add_entry(cache, key, size=1000):
+    def write(directory):
+        with open(os.path.join(directory, 'data.bin'), 'wb') as file:
+            file.write(b'0' * size)
+
+    return cache.add_entry(key, write)
+
+
+def set_last_use(cache, key, seconds):
+    os.utime(os.path.join(cache.get_path(key), ENTRY_NAME), (seconds, seconds))
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = LogCache(tmp_path, max_bytes=2500)
+    add_entry(cache, 'a')
+    add_entry(cache, 'b')
+    set_last_use(cache, 'a', 1000)
+    set_last_use(cache, 'b', 2000)
+    assert cache.get_entry('a') is not None
+    # reading a made b the least recently used entry
+    assert add_entry(cache, 'c') == cache.get_path('c')
+    assert sorted(key for key, size, used in cache.get_entries()) == ['a', 'c']
+    assert cache.size() == 2000
+    assert cache.get_entry('b') is None
+
+
+def test_entry_larger_than_cache_is_kept(tmp_path):
+    cache = LogCache(tmp_path, max_bytes=500)
+    add_entry(cache, 'a')
+    assert add_entry(cache, 'b') is not None
+    assert [key for key, size, used in cache.get_entries()] == ['b']
+
+
+def test_existing_entry_is_not_replaced(tmp_path):
+    cache = LogCache(tmp_path)
+    add_entry(cache, 'a', 1000)
+    assert add_entry(cache, 'a', 10) == cache.get_path('a')
+    assert cache.size() == 1000
+    assert [name for name in os.listdir(tmp_path) if name.startswith('.')] == []
+    cache.clear()
+    assert cache.get_entries() == []
+
+
+def test_collection_restored_from_cache(tmp_path, monkeypatch):
+    generate_logs(2, 30, filepath=str(tmp_path / 'one'), seed=4, cache=str(tmp_path / 'cache'))
+    assert len(LogCache(tmp_path / 'cache').get_entries()) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("the collection was generated again")
+
+    monkeypatch.setattr(generate_collection_of_logs, 'generate_single_log', fail)
+    generate_logs(2, 30, filepath=str(tmp_path / 'two'), seed=4, cache=str(tmp_path / 'cache'))
+    names = sorted(os.listdir(str(tmp_path / 'one' / 'gold_standard')))
+    assert names == sorted(os.listdir(str(tmp_path / 'two' / 'gold_standard')))
+    assert 'event_log_1.xes' in names
+    for name in names:
+        assert filecmp.cmp(str(tmp_path / 'one' / 'gold_standard' / name),
+                           str(tmp_path / 'two' / 'gold_standard' / name), shallow=False)
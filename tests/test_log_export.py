@@ -0,0 +1,81 @@
+import numpy
+import pytest
+
+from conceptdrift.generate_collection_of_logs import generate_logs
+from conceptdrift.source.columnar_log import ColumnarLog, get_offsets
+from conceptdrift.source.log_export import export_columnar_log, export_spilled_log, import_columnar_log
+from conceptdrift.source.spilled_log import SpilledLog
+
+pyarrow = pytest.importorskip('pyarrow')
+
+
+def make_log(trace_lengths):
+    offsets = get_offsets(numpy.array(trace_lengths, dtype=numpy.int64))
+    nu_events = int(offsets[-1])
+    activities = (numpy.arange(nu_events) % 3).astype(numpy.int32)
+    timestamps = (numpy.datetime64('2020-01-01T00:00:00') + numpy.arange(nu_events) * 60).astype('datetime64[s]')
+    durations = numpy.arange(nu_events, dtype=numpy.int64) + 1
+    return ColumnarLog(offsets, activities, ['a', 'b', 'c'], timestamps, durations, {'drift info': 'sudden'})
+
+
+def assert_same_log(log, imported):
+    assert imported.offsets.tolist() == log.offsets.tolist()
+    assert [imported.labels[code] for code in imported.activities.tolist()] == \
+        [log.labels[code] for code in log.activities.tolist()]
+    assert imported.timestamps.tolist() == log.timestamps.tolist()
+    assert imported.durations.tolist() == log.durations.tolist()
+    assert imported.attributes == log.attributes
+
+
+@pytest.mark.parametrize('format', ['parquet', 'arrow'])
+@pytest.mark.parametrize('trace_lengths', [[2, 3, 1], [0, 2, 0, 0, 3, 0], [0, 0]])
+def test_round_trip(tmp_path, format, trace_lengths):
+    log = make_log(trace_lengths)
+    filepath = tmp_path / ('log.' + format)
+    export_columnar_log(log, filepath, format)
+    assert_same_log(log, import_columnar_log(filepath))
+
+
+@pytest.mark.parametrize('format', ['parquet', 'arrow'])
+def test_spilled_round_trip(tmp_path, format):
+    log = make_log([0, 2, 1, 0, 0, 3, 1, 0])
+    spilled_log = SpilledLog(tmp_path / 'spilled', log.labels, log.attributes)
+    for start, stop in [(0, 3), (3, 5), (5, 8)]:
+        offsets = log.offsets[start:stop + 1]
+        first, last = int(offsets[0]), int(offsets[-1])
+        spilled_log.append(ColumnarLog(offsets - first, log.activities[first:last], log.labels,
+                                       log.timestamps[first:last], log.durations[first:last]))
+    spilled_log.save()
+    filepath = tmp_path / ('log.' + format)
+    export_spilled_log(spilled_log, filepath, format)
+    assert_same_log(log, import_columnar_log(filepath))
+
+
+def test_arrow_import_is_memory_mapped(tmp_path):
+    log = make_log([2, 3, 1])
+    export_columnar_log(log, tmp_path / 'log.arrow', 'arrow')
+    imported = import_columnar_log(tmp_path / 'log.arrow')
+    assert not imported.activities.flags.owndata and not imported.timestamps.flags.owndata
+
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        export_columnar_log(make_log([1]), tmp_path / 'log.csv', 'csv')
+    with pytest.raises(ValueError):
+        import_columnar_log(tmp_path / 'log.csv')
+
+
+def test_collection_in_parquet_matches_xes(tmp_path):
+    from pm4py.objects.log.importer.xes import importer as xes_importer
+
+    generate_logs(2, 30, filepath=str(tmp_path / 'parquet'), seed=3, format='parquet')
+    generate_logs(2, 30, filepath=str(tmp_path / 'xes'), seed=3)
+    for i in range(2):
+        log = import_columnar_log(str(tmp_path / 'parquet' / 'gold_standard' / ('event_log_' + str(i) + '.parquet')))
+        xes_log = xes_importer.apply(str(tmp_path / 'xes' / 'gold_standard' / ('event_log_' + str(i) + '.xes')),
+                                     parameters={'show_progress_bar': False})
+        assert log.attributes['drift info'] == xes_log.attributes['drift info']
+        assert [[event['concept:name'] for event in trace] for trace in log] == \
+            [[event['concept:name'] for event in trace] for trace in xes_log]
+        assert [[event['time:timestamp'] for event in trace] for trace in log] == \
+            [[event['time:timestamp'].replace(tzinfo=None) for event in trace] for trace in xes_log]
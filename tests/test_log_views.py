@@ -0,0 +1,111 @@
+from pm4py.objects.log.obj import EventLog
+from pm4py.objects.process_tree.utils.generic import parse
+
+from conceptdrift.source.columnar_log import ColumnarLog, convert_columnar_to_event_log
+from conceptdrift.source.event_log_controller import combine_two_logs, generate_two_parts_of_event_log, \
+    generate_several_parts_of_event_log, replace_traces_of_log, get_part_of_log
+from conceptdrift.source.log_views import ChainedLog, LogView
+from conceptdrift.source.playout import generate_columnar_log
+
+TREE = parse("->('a',X('b','c'),*('d','e'))")
+
+
+def get_names(log):
+    return [[event['concept:name'] for event in trace] for trace in log]
+
+
+def test_chained_log_indexing():
+    logs = [convert_columnar_to_event_log(generate_columnar_log(TREE, size, rng=size)) for size in (3, 0, 5, 2)]
+    chain = ChainedLog(logs)
+    traces = [trace for log in logs for trace in log]
+    assert len(chain) == 10
+    assert list(chain) == traces
+    assert [chain[i] for i in range(10)] == traces
+    assert chain[-1] is traces[-1]
+    assert list(chain[2:7]) == traces[2:7]
+
+
+def test_chained_log_flattens_chains():
+    one = convert_columnar_to_event_log(generate_columnar_log(TREE, 4, rng=1))
+    two = convert_columnar_to_event_log(generate_columnar_log(TREE, 3, rng=2))
+    chain = ChainedLog([ChainedLog([one, two]), one])
+    assert len(chain.segments) == 3
+    assert len(chain) == 11
+
+
+def test_combine_two_logs_returns_event_log():
+    one = convert_columnar_to_event_log(generate_columnar_log(TREE, 4, rng=1))
+    two = convert_columnar_to_event_log(generate_columnar_log(TREE, 3, rng=2))
+    one.attributes['drift info'] = 'info'
+    combined = combine_two_logs(one, two)
+    assert isinstance(combined, EventLog)
+    assert get_names(combined) == get_names(one) + get_names(two)
+    assert combined.attributes == {'drift info': 'info'}
+
+
+def test_combine_two_columnar_logs():
+    one = generate_columnar_log(TREE, 4, rng=1)
+    two = generate_columnar_log(TREE, 3, rng=2)
+    combined = combine_two_logs(one, two)
+    assert isinstance(combined, ColumnarLog)
+    assert get_names(combined) == get_names(one) + get_names(two)
+
+
+def test_mixed_chain_materializes_pm4py_traces():
+    one = generate_columnar_log(TREE, 4, rng=1)
+    two = convert_columnar_to_event_log(generate_columnar_log(TREE, 3, rng=2))
+    combined = ChainedLog([one, LogView(two, 0, 3)]).materialize()
+    assert isinstance(combined, EventLog)
+    assert all(type(trace) is type(two[0]) for trace in combined)
+    assert get_names(combined) == get_names(one) + get_names(two)
+
+
+def test_log_view_indexing():
+    log = convert_columnar_to_event_log(generate_columnar_log(TREE, 10, rng=1))
+    view = LogView(log, 2, 8)
+    assert len(view) == 6
+    assert list(view) == list(log)[2:8]
+    assert view[0] is log[2]
+    assert view[-1] is log[7]
+    assert list(view[1:3]) == list(log)[3:5]
+    assert view[1:3].log is log
+    assert len(LogView(log, 8, 20)) == 2
+
+
+def test_log_view_properties():
+    log = convert_columnar_to_event_log(generate_columnar_log(TREE, 10, rng=1))
+    log.attributes['drift info'] = 'info'
+    view = LogView(log, 0, 5)
+    view.attributes['part'] = 1
+    assert log.attributes == {'drift info': 'info'}
+    assert view.materialize().attributes == {'drift info': 'info', 'part': 1}
+
+
+def test_log_view_of_columnar_log():
+    log = generate_columnar_log(TREE, 10, rng=1)
+    part = LogView(log, 3, 6).materialize()
+    assert isinstance(part, ColumnarLog)
+    assert get_names(part) == get_names(log)[3:6]
+
+
+def test_split_helpers_return_event_logs():
+    log = convert_columnar_to_event_log(generate_columnar_log(TREE, 10, rng=1))
+    new = convert_columnar_to_event_log(generate_columnar_log(TREE, 3, rng=2))
+    one, two = generate_two_parts_of_event_log(log, 4)
+    parts = generate_several_parts_of_event_log(log, 3)
+    replaced = replace_traces_of_log(log, new, 0.5)
+    part = get_part_of_log(log, 0.3)
+    for result in [one, two, replaced, part] + parts:
+        assert isinstance(result, EventLog)
+    assert get_names(one) + get_names(two) == get_names(log)
+    assert sum((get_names(part) for part in parts), []) == get_names(log)
+    assert get_names(replaced) == get_names(log)[:5] + get_names(new) + get_names(log)[8:]
+    assert get_names(part) == get_names(log)[:3]
+
+
+def test_split_helpers_on_columnar_logs():
+    log = generate_columnar_log(TREE, 10, rng=1)
+    new = generate_columnar_log(TREE, 3, rng=2)
+    assert isinstance(get_part_of_log(log, 0.3), ColumnarLog)
+    assert get_names(replace_traces_of_log(log, new, 0.5)) == get_names(log)[:5] + get_names(new) + \
+        get_names(log)[8:]
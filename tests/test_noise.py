@@ -0,0 +1,34 @@
+import datetime
+
+from pm4py.objects.process_tree.utils.generic import parse
+
+from conceptdrift.source.columnar_log import ColumnarLog
+from conceptdrift.source.event_log_controller import add_duration_to_log
+from conceptdrift.source.log_views import ChainedLog, LogView
+from conceptdrift.source.noise import add_noise
+from conceptdrift.source.playout import generate_columnar_log
+
+
+def get_columnar_log(num_traces, seed):
+    log = generate_columnar_log(parse("->('a',X('b','c'),'d')"), num_traces, rng=seed)
+    add_duration_to_log(log, datetime.datetime(2020, 8, 3, 8), 1, 100, seed)
+    return log
+
+
+def test_noise_on_columnar_log():
+    log = add_noise(get_columnar_log(100, 1), 0.1, rng=3)
+    assert isinstance(log, ColumnarLog)
+    assert len(log) == 100
+    assert 'noise info' in log.attributes
+
+
+def test_noise_on_chained_columnar_logs():
+    log = add_noise(ChainedLog([get_columnar_log(50, 1), get_columnar_log(50, 2)]), 0.1, rng=3)
+    assert isinstance(log, ColumnarLog)
+    assert len(log) == 100
+
+
+def test_noise_on_view_of_columnar_log():
+    log = add_noise(LogView(get_columnar_log(100, 1), 0, 50), 0.1, rng=3)
+    assert isinstance(log, ColumnarLog)
+    assert len(log) == 50
@@ -0,0 +1,89 @@
+import random
+from collections import Counter
+
+import pytest
+from pm4py.objects.process_tree import semantics
+from pm4py.objects.process_tree.utils.generic import parse
+
+from conceptdrift.source.playout import generate_log, generate_columnar_log
+
+TREES = ["->('a',X('b','c'),+('d','e'))", "+('a',->('b','c','d'))", "*('a',X('b',tau))", "O('a','b',->('c','d'))",
+         "->(X('a',+('b','c')),*(+('d','e'),'f'))"]
+
+
+def get_variants(log):
+    return Counter(tuple(event['concept:name'] for event in trace) for trace in log)
+
+
+@pytest.mark.parametrize('tree', TREES)
+def test_playout_follows_pm4py(tree):
+    # trees with loops have a long tail of rare variants, so only the frequent variants and the lengths are compared
+    random.seed(0)
+    expected = get_variants(semantics.generate_log(parse(tree), no_traces=10000))
+    variants = get_variants(generate_log(parse(tree), 10000, rng=0))
+    for variant, count in expected.items():
+        if count >= 100:
+            assert abs(variants[variant] - count) / 10000 < 0.015
+    assert sum(len(variant) * count for variant, count in variants.items()) / \
+        sum(len(variant) * count for variant, count in expected.items()) == pytest.approx(1, abs=0.03)
+
+
+def test_log_layout():
+    log = generate_log(parse("->('a','b')"), 3, rng=0)
+    assert [trace.attributes['concept:name'] for trace in log] == ['0', '1', '2']
+    assert [event['concept:name'] for trace in log for event in trace] == ['a', 'b'] * 3
+    timestamps = [event['time:timestamp'] for trace in log for event in trace]
+    assert timestamps == sorted(timestamps) and len(set(timestamps)) == 6
+
+
+def test_playout_is_reproducible():
+    tree = parse(TREES[4])
+    assert get_variants(generate_log(tree, 200, rng=3)) == get_variants(generate_log(tree, 200, rng=3))
+    log = generate_columnar_log(tree, 200, rng=3)
+    assert [tuple(event['concept:name'] for event in trace) for trace in log] == \
+        [tuple(event['concept:name'] for event in trace) for trace in generate_log(tree, 200, rng=3)]
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        generate_log(parse("'a'"), 1, mode='unknown')
+
+
+def get_batch_variants(tree, no_traces, rng=0):
+    log = generate_columnar_log(parse(tree), no_traces, mode='batch', rng=rng)
+    assert len(log) == no_traces and log.offsets[0] == 0 and log.num_events() == len(log.activities)
+    return Counter(tuple(log.labels[code] for code in log.activities[log.offsets[i]:log.offsets[i + 1]].tolist())
+                   for i in range(no_traces))
+
+
+def test_batch_choices_are_uniform():
+    variants = get_batch_variants("->('a',X('b','c','d'))", 9000)
+    assert set(variants) == {('a', 'b'), ('a', 'c'), ('a', 'd')}
+    assert all(abs(count / 9000 - 1 / 3) < 0.02 for count in variants.values())
+
+
+def test_batch_interleavings_are_uniform():
+    # the branches keep their order and every interleaving of them is equally likely
+    variants = get_batch_variants("+('a',->('b','c'))", 9000)
+    assert set(variants) == {('a', 'b', 'c'), ('b', 'a', 'c'), ('b', 'c', 'a')}
+    assert all(abs(count / 9000 - 1 / 3) < 0.02 for count in variants.values())
+
+
+def test_batch_loop_repetitions():
+    variants = get_batch_variants("*('a','b')", 10000)
+    assert all(variant == ('a',) + ('b', 'a') * (len(variant) // 2) for variant in variants)
+    assert abs(variants[('a',)] / 10000 - 0.5) < 0.02
+    assert abs(variants[('a', 'b', 'a')] / 10000 - 0.25) < 0.02
+
+
+def test_batch_log_matches_columnar_log():
+    tree = parse(TREES[4])
+    log = generate_log(tree, 300, mode='batch', rng=5)
+    columnar_log = generate_columnar_log(tree, 300, mode='batch', rng=5)
+    assert [tuple(event['concept:name'] for event in trace) for trace in log] == \
+        [tuple(event['concept:name'] for event in trace) for trace in columnar_log]
+
+
+def test_batch_of_silent_tree():
+    variants = get_batch_variants("X(tau,'a')", 1000)
+    assert set(variants) == {(), ('a',)}
@@ -0,0 +1,68 @@
+import csv
+import json
+import time
+
+from pm4py.objects.process_tree.utils.generic import parse
+
+from conceptdrift.generate_collection_of_logs import generate_logs
+from conceptdrift.source.playout import generate_columnar_log, generate_log
+from conceptdrift.source.profiling import STAGES, LogProfile, NULL_STAGE, StageRecord, profile_stage
+
+
+def test_stage_record_measures_time_and_log():
+    record = StageRecord('playout')
+    with record:
+        time.sleep(0.01)
+    with record:
+        record.set_log(generate_log(parse("->('a','b')"), 3, rng=0))
+    assert record.seconds >= 0.01
+    assert record.traces == 3 and record.events == 6
+    record.set_log(generate_columnar_log(parse("'a'"), 4, rng=0))
+    assert record.traces == 4 and record.events == 4
+    record.add_retries(2)
+    assert record.to_dict() == {'stage': 'playout', 'seconds': record.seconds, 'traces': 4, 'events': 4, 'retries': 2}
+
+
+def test_log_profile_sums_stages():
+    profile = LogProfile()
+    for name in ['evolution', 'playout', 'evolution']:
+        with profile_stage(profile, name) as record:
+            record.add_retries(1)
+    assert [record['stage'] for record in profile.to_list()] == ['evolution', 'playout', 'evolution']
+    assert profile.get_seconds('evolution') == profile.stages[0].seconds + profile.stages[2].seconds
+    assert profile.get_seconds('noise') is None
+    assert profile.get_retries('evolution') == 2
+
+
+def test_disabled_profile_records_nothing():
+    with profile_stage(None, 'playout') as record:
+        record.set_log([])
+        record.add_retries(1)
+    assert record is NULL_STAGE
+
+
+def test_profile_columns_and_json(tmp_path):
+    generate_logs(2, 30, filepath=str(tmp_path / 'csv'), seed=1, profile='csv')
+    with open(str(tmp_path / 'csv' / 'gold_standard' / 'gold_standard.csv')) as file:
+        rows = list(csv.reader(file))
+    assert rows[0][-len(STAGES) - 1:] == ["Time " + stage.capitalize() + " [s]" for stage in STAGES] + \
+        ["Evolution Retries"]
+    assert all(float(rows[i][-len(STAGES) - 1]) >= 0 for i in (1, 2))
+    # profiling does not change the generated logs
+    generate_logs(2, 30, filepath=str(tmp_path / 'plain'), seed=1)
+    with open(str(tmp_path / 'plain' / 'gold_standard' / 'gold_standard.csv')) as file:
+        assert [row[:-len(STAGES) - 1] for row in rows] == list(csv.reader(file))
+    generate_logs(2, 30, filepath=str(tmp_path / 'json'), seed=1, profile='json')
+    with open(str(tmp_path / 'json' / 'gold_standard' / 'profile.json')) as file:
+        profiles = json.load(file)
+    assert sorted(profiles) == ['event_log_0', 'event_log_1']
+    assert {record['stage'] for record in profiles['event_log_0']} <= set(STAGES)
+    assert {'evolution', 'playout', 'export'} <= {record['stage'] for record in profiles['event_log_0']}
+
+
+def test_profile_function_gets_records(tmp_path):
+    records = []
+    generate_logs(2, 30, filepath=str(tmp_path), seed=1, profile=lambda i, record: records.append((i, record)))
+    assert {i for i, record in records} == {0, 1}
+    playouts = [record for i, record in records if record.name == 'playout']
+    assert playouts and all(record.traces is not None for record in playouts)
@@ -0,0 +1,84 @@
+import itertools
+
+import numpy
+import pytest
+from pm4py.objects.process_tree.utils.generic import parse
+
+from conceptdrift.drifts.schedule import get_mixing_probabilities, compile_mixing_schedule, compile_gradual_schedule, \
+    compile_sudden_schedule, compile_recurring_schedule, compile_incremental_schedule, generate_log_from_schedule
+
+
+@pytest.mark.parametrize('distribution_type', ['linear', 'exponential', 'sigmoid'])
+def test_mixing_probabilities_rise_symmetrically(distribution_type):
+    probabilities = get_mixing_probabilities(distribution_type, 1000)
+    assert numpy.all(numpy.diff(probabilities) >= 0)
+    assert probabilities[0] < 0.05 and probabilities[-1] > 0.95
+    # half of the drift traces are expected to come from each model, like in the original block schedules
+    assert probabilities.mean() == pytest.approx(0.5)
+
+
+def test_mixing_probabilities_of_function():
+    probabilities = get_mixing_probabilities(lambda x: x ** 2, 4)
+    assert probabilities.tolist() == pytest.approx([0.015625, 0.140625, 0.390625, 0.765625])
+
+
+def test_unknown_mixing_schedule():
+    with pytest.raises(ValueError):
+        get_mixing_probabilities('quadratic', 10)
+
+
+def test_exponential_mixing_share():
+    versions = compile_mixing_schedule('exponential', 100000, rng=1)
+    assert versions.mean() == pytest.approx(0.5, abs=0.01)
+    assert versions[:10000].mean() < 0.05
+    assert versions[-10000:].mean() > 0.95
+
+
+def test_gradual_schedule():
+    schedule = compile_gradual_schedule(1000, 0.2, 0.7, 'exponential', rng=1)
+    assert len(schedule) == 1000
+    assert not schedule[:200].any()
+    assert schedule[700:].all()
+    assert numpy.array_equal(schedule, compile_gradual_schedule(1000, 0.2, 0.7, 'exponential', rng=1))
+
+
+def get_runs(schedule):
+    return [(version, len(list(run))) for version, run in itertools.groupby(schedule.tolist())]
+
+
+def test_sudden_schedule():
+    assert get_runs(compile_sudden_schedule(1000, 0.3)) == [(0, 300), (1, 700)]
+    assert get_runs(compile_sudden_schedule(10, 1)) == [(0, 10)]
+
+
+@pytest.mark.parametrize('start_point, end_point, num_of_seasonal_changes, pro_first_version, runs', [
+    (0.2, 0.8, 3, 0.5, [(0, 200), (1, 150), (0, 150), (1, 150), (0, 150), (1, 200)]),
+    (0, 0.6, 4, 0.3, [(0, 60), (1, 210), (0, 60), (1, 210), (0, 60), (1, 400)]),
+    (0.3, 1, 2, 0.5, [(0, 300), (1, 175), (0, 350), (1, 175)])])
+def test_recurring_schedule(start_point, end_point, num_of_seasonal_changes, pro_first_version, runs):
+    schedule = compile_recurring_schedule(1000, start_point, end_point, num_of_seasonal_changes, pro_first_version)
+    assert get_runs(schedule) == runs
+
+
+def test_incremental_schedule():
+    assert get_runs(compile_incremental_schedule([3, 0, 2, 4])) == [(0, 3), (2, 2), (3, 4)]
+
+
+def test_log_follows_schedule():
+    schedule = numpy.array([0, 2, 2, 1, 0, 1, 2, 0])
+    log = generate_log_from_schedule(schedule, [parse("'a'"), parse("->('b','b')"), parse("'c'")], rng=4)
+    assert [[event['concept:name'] for event in trace] for trace in log] == \
+        [{0: ['a'], 1: ['b', 'b'], 2: ['c']}[version] for version in schedule.tolist()]
+
+
+@pytest.mark.parametrize('playout_mode', ['trace', 'batch', 'variants'])
+def test_log_from_schedule_is_reproducible(playout_mode):
+    schedule = compile_gradual_schedule(300, 0.2, 0.8, rng=1)
+    trees = [parse("->('a',X('b','c'))"), parse("->('a',+('b','d'))")]
+    one = generate_log_from_schedule(schedule, trees, playout_mode, rng=9)
+    two = generate_log_from_schedule(schedule, trees, playout_mode, rng=9)
+    assert one.offsets.tolist() == two.offsets.tolist()
+    assert [one.labels[code] for code in one.activities.tolist()] == \
+        [two.labels[code] for code in two.activities.tolist()]
+    assert all(('d' in [event['concept:name'] for event in trace]) == (version == 1)
+               for trace, version in zip(one, schedule.tolist()))
@@ -0,0 +1,93 @@
+import datetime
+
+import numpy
+import pytest
+from pm4py.objects.log.importer.xes import importer as xes_importer
+from pm4py.objects.process_tree.utils.generic import parse
+
+from conceptdrift.source.columnar_log import ColumnarLog, get_offsets
+from conceptdrift.source.log_export import export_columnar_log, export_spilled_log
+from conceptdrift.source.spilled_log import SpilledLog, generate_spilled_log, open_spilled_log
+
+TREES = [parse("->('a',X('b',tau))"), parse("->('c',*('d',tau))")]
+
+
+def get_names(log):
+    return [[event['concept:name'] for event in trace] for trace in log]
+
+
+def generate(directory, datestamp=datetime.datetime(2020, 1, 1), **parameters):
+    schedule = numpy.repeat([0, 1, 0], [25, 30, 15])
+    return schedule, generate_spilled_log(schedule, TREES, directory, chunk_size=16, datestamp=datestamp, rng=2,
+                                          **parameters)
+
+
+def test_log_follows_schedule(tmp_path):
+    schedule, log = generate(tmp_path)
+    assert len(log) == 70 and log.chunk_bounds == [0, 16, 32, 48, 64, 70]
+    names = get_names(log.get_columnar())
+    assert all(trace[0] == ('a' if version == 0 else 'c') for trace, version in zip(names, schedule.tolist()))
+
+
+def test_chunks_make_up_the_log(tmp_path):
+    schedule, log = generate(tmp_path)
+    whole = open_spilled_log(tmp_path).get_columnar()
+    assert whole.attributes == log.attributes and whole.labels == log.labels
+    names = []
+    for start, chunk in log.chunks():
+        assert start == len(names)
+        names.extend(get_names(chunk))
+    assert names == get_names(whole)
+    assert whole.num_events() == log.num_events() == len(whole.activities)
+
+
+def test_times_continue_over_chunks(tmp_path):
+    schedule, log = generate(tmp_path)
+    whole = log.get_columnar()
+    assert numpy.all(whole.durations >= 0)
+    starts = whole.timestamps[whole.offsets[:-1][whole.trace_lengths() > 0]]
+    assert starts[0] == numpy.datetime64('2020-01-01T00:00:00') and numpy.all(numpy.diff(starts) > 0)
+
+
+def test_noise_traces_at_positions(tmp_path):
+    schedule, log = generate(tmp_path, noise_tree=parse("'n'"), noise_positions=numpy.array([3, 15, 16, 40, 69]))
+    names = get_names(log.get_columnar())
+    assert [i for i, trace in enumerate(names) if trace == ['n']] == [3, 15, 16, 40, 69]
+
+
+def test_chunks_without_times_are_rejected(tmp_path):
+    log = SpilledLog(tmp_path, ['a'])
+    offsets = get_offsets(numpy.array([1]))
+    log.append(ColumnarLog(offsets, numpy.zeros(1, dtype=numpy.int32), ['a']))
+    with pytest.raises(ValueError):
+        log.append(ColumnarLog(offsets, numpy.zeros(1, dtype=numpy.int32), ['a'],
+                               numpy.array(['2020-01-01'], dtype='datetime64[s]'), numpy.ones(1, dtype=numpy.int64)))
+
+
+@pytest.mark.parametrize('datestamp', [datetime.datetime(2020, 1, 1), None])
+def test_spilled_xes_matches_pm4py_export(tmp_path, datestamp):
+    schedule, log = generate(tmp_path / 'spilled', datestamp)
+    log.attributes['drift info'] = 'sudden'
+    export_spilled_log(log, str(tmp_path / 'spilled.xes'))
+    export_columnar_log(log.get_columnar(), str(tmp_path / 'columnar.xes'))
+    parameters = {'show_progress_bar': False}
+    spilled = xes_importer.apply(str(tmp_path / 'spilled.xes'), parameters=parameters)
+    columnar = xes_importer.apply(str(tmp_path / 'columnar.xes'), parameters=parameters)
+    assert spilled.attributes['drift info'] == columnar.attributes['drift info'] == 'sudden'
+    assert [trace.attributes['concept:name'] for trace in spilled] == [str(i) for i in range(70)]
+    assert [[dict(event) for event in trace] for trace in spilled] == \
+        [[dict(event) for event in trace] for trace in columnar]
+
+
+@pytest.mark.parametrize('format', ['parquet', 'arrow'])
+def test_table_export_without_times(tmp_path, format):
+    pytest.importorskip('pyarrow')
+    from conceptdrift.source.log_export import import_columnar_log
+
+    schedule, log = generate(tmp_path / 'spilled', None)
+    export_spilled_log(log, str(tmp_path / ('spilled.' + format)), format)
+    export_columnar_log(log.get_columnar(), str(tmp_path / ('columnar.' + format)), format)
+    spilled = import_columnar_log(str(tmp_path / ('spilled.' + format)))
+    columnar = import_columnar_log(str(tmp_path / ('columnar.' + format)))
+    assert get_names(spilled) == get_names(columnar)
+    assert spilled.timestamps.tolist() == columnar.timestamps.tolist()
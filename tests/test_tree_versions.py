@@ -0,0 +1,44 @@
+import warnings
+
+from pm4py.objects.process_tree.utils.generic import parse
+
+from conceptdrift.source.evolution import evolve_tree_randomly_gs
+from conceptdrift.source.frozen_tree import copy_process_tree
+from conceptdrift.source.process_tree_controller import generate_specific_trees
+from conceptdrift.source.tree_index import ProcessTreeIndex
+from conceptdrift.source.tree_versions import TreeVersions, replay_journal
+
+
+def test_chain_matches_evolving_copies():
+    # the changes of a chain depend only on the evolved tree and the seed, not on the changes before
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for chain in range(50):
+            tree = generate_specific_trees('middle', rng=chain)
+            versions = TreeVersions(tree)
+            copy = copy_process_tree(tree)
+            for step in range(4):
+                versions.evolve(0.2, rng=1000 * chain + step)
+                copy = evolve_tree_randomly_gs(copy_process_tree(copy), 0.2, rng=1000 * chain + step)[0]
+                assert str(versions.get_process_tree()) == str(copy)
+
+
+def test_journal_replays_version():
+    tree = generate_specific_trees('simple', rng=3)
+    versions = TreeVersions(tree)
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        versions.evolve(0.3, rng=1)
+        versions.evolve(0.3, rng=2)
+    replayed = replay_journal(versions[1], versions.journals[2])
+    assert str(replayed) == str(versions.get_process_tree(2))
+    assert str(versions.get_process_tree(0)) == str(tree)
+
+
+def test_leaves_with_label_in_tree_order():
+    tree = parse("->('a',X('b','a'),'a')")
+    index = ProcessTreeIndex(tree)
+    first = tree.children[0]
+    index.set_label(first, 'c')
+    index.set_label(first, 'a')
+    assert [index.get_path(leaf) for leaf in index.get_leaves_with_label('a')] == [(0,), (1, 1), (2,)]
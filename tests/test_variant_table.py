@@ -0,0 +1,71 @@
+import warnings
+from collections import Counter
+
+import numpy
+import pytest
+from pm4py.objects.process_tree.utils.generic import parse
+
+from conceptdrift.source.playout import get_compiled_tree, play_out_label_ids
+from conceptdrift.source.variant_table import build_variant_table, sample_variant_indices, \
+    generate_columnar_log_from_variant_table
+
+
+def get_distribution(table):
+    return {tuple(table.labels[i] for i in variant): probability
+            for variant, probability in zip(table.variants, table.probabilities.tolist())}
+
+
+def test_exact_table_of_loop_free_tree():
+    table = build_variant_table(parse("->('a',X('b','c'),+('d','e'))"))
+    assert table.exact and table.lost_probability == 0
+    assert get_distribution(table) == pytest.approx({('a', 'b', 'd', 'e'): 0.25, ('a', 'b', 'e', 'd'): 0.25,
+                                                     ('a', 'c', 'd', 'e'): 0.25, ('a', 'c', 'e', 'd'): 0.25})
+
+
+def test_exact_table_follows_playout():
+    tree = parse("+('a',->('b','c','d'))")
+    table = build_variant_table(tree)
+    compiled = get_compiled_tree(tree)
+    counts = Counter(tuple(compiled.labels[i] for i in trace) for trace in play_out_label_ids(compiled, 20000, 1))
+    distribution = get_distribution(table)
+    assert set(counts) == set(distribution)
+    assert sum(abs(counts[variant] / 20000 - distribution[variant]) for variant in distribution) / 2 < 0.02
+
+
+def test_cut_loops_are_not_exact():
+    table = build_variant_table(parse("*('a','b')"))
+    assert not table.exact
+    assert 0 < table.lost_probability < 0.01
+    assert table.probabilities.sum() == pytest.approx(1)
+
+
+def test_large_cut_falls_back_to_estimation():
+    with pytest.warns(UserWarning):
+        table = build_variant_table(parse("*('a','b')"), max_unfold=2, num_samples=1000, rng=1)
+    assert not table.exact
+    assert table.lost_probability == 0
+    # the estimation also contains traces with more than two repetitions
+    assert max(len(variant) for variant in table.variants) > 5
+
+
+def test_budget_falls_back_to_estimation():
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        table = build_variant_table(parse("+('a','b','c','d')"), max_variants=5, num_samples=1000, rng=1)
+    assert not table.exact
+    assert table.probabilities.sum() == pytest.approx(1)
+
+
+@pytest.mark.parametrize('method', ['alias', 'multinomial'])
+def test_sampling_follows_table(method):
+    table = build_variant_table(parse("->('a',X('b','c','d'),X('e',->('f','g')))"))
+    indices = sample_variant_indices(table, 60000, method, rng=1)
+    frequencies = numpy.bincount(indices, minlength=len(table)) / 60000
+    assert frequencies == pytest.approx(table.probabilities, abs=0.01)
+
+
+def test_columnar_log_from_table():
+    table = build_variant_table(parse("->('a',X('b','c'))"))
+    log = generate_columnar_log_from_variant_table(table, 100, rng=1)
+    assert len(log) == 100
+    assert {tuple(event['concept:name'] for event in trace) for trace in log} == {('a', 'b'), ('a', 'c')}